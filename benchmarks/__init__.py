@@ -0,0 +1,73 @@
+"""
+Пакет нагрузочных замеров (бенчмарков).
+
+Запуск: python -m benchmarks.<имя_модуля>
+Замеры выполняются на тестовой БД (test_<NAME_DB>), которая создается и удаляется автоматически.
+"""
+import os
+import time
+from contextlib import contextmanager
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from typing import (Any,
+                    Callable,
+                    Iterator,
+                    TypeVar)
+import django
+
+T = TypeVar('T')
+
+
+@contextmanager
+def django_test_db() -> Iterator[None]:
+    """
+    Настройка Django и создание тестовой БД на время замера
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fms.settings')
+    django.setup()
+    # pylint: disable=import-outside-toplevel
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    from django.db import connection
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(func: Callable[[], T]) -> tuple[T, float]:
+    """
+    Выполняет функцию и возвращает результат и время выполнения в секундах
+    """
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def create_transactions(rows: int) -> Any:
+    """
+    Создание пользователя и rows его расходов (по одной в минуту, 40 категорий)
+    """
+    # pylint: disable=import-outside-toplevel
+    from fin_transactions.models import Transaction
+    from users.models import User
+
+    user = User.objects.create(first_name='Bench', last_name='User', email='bench@example.com')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    Transaction.objects.bulk_create(
+        Transaction(user=user, amount=f'{(i % 500) + 1}.25', transaction_type=Transaction.EXPENSE,
+                    category=f'Category {i % 40}', date_transaction=start + timedelta(minutes=i))
+        for i in range(rows))
+    return user
+
+
+def report(name: str, rows: int, seconds: float) -> None:
+    """
+    Печать результата замера
+    """
+    print(f'{name:<40} {rows:>9} rows {seconds:>9.3f} s {rows / seconds:>12.1f} rows/s')
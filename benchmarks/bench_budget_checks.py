@@ -0,0 +1,68 @@
+"""
+Замер очереди проверок лимитов бюджета при серии транзакций: прежняя схема (проверка
+на каждую транзакцию) и объединение проверок (не более одной отложенной на бюджет).
+
+Запуск: python -m benchmarks.bench_budget_checks [кол-во транзакций] [кол-во категорий]
+"""
+import sys
+import time
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from unittest.mock import patch
+from benchmarks import (django_test_db,
+                        report,
+                        timed)
+
+
+def main(rows: int, categories: int) -> None:  # pylint: disable=too-many-locals
+    """
+    Серия POST /transactions/ по одному бюджету, затем выполнение проверок из очереди
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from budget.celery_tasks import check_budget_limit
+    from budget.models import (Budget,
+                               BudgetCategory)
+    from fin_transactions.models import Transaction
+    from users.models import User
+
+    user = User.objects.create(first_name='Bench', last_name='User', email='bench@example.com')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    budget = Budget.objects.create(user=user, start_date=start,
+                                   end_date=start + timedelta(days=365))
+    BudgetCategory.objects.bulk_create(
+        BudgetCategory(budget=budget, transaction_type=Transaction.EXPENSE,
+                       category=f'Category {index}', forecast=10 ** 9)
+        for index in range(categories))
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with patch('services.budget.check_budget_limit.apply_async') as mock_apply_async, \
+            patch('budget.celery_tasks.send_budget_notifications.apply_async'):
+        _, seconds = timed(lambda: [client.post(reverse('transaction-list-create'), {
+            'user': user.id,
+            'amount': f'{(i % 500) + 1}.25',
+            'transaction_type': Transaction.EXPENSE,
+            'category': f'Category {i % categories}',
+            'date_transaction': (start + timedelta(minutes=i)).strftime('%Y-%m-%dT%H:%MZ'),
+        }, format='json') for i in range(rows)])
+        report('POST /transactions/ (серия)', rows, seconds)
+
+        # До: check_budget_limit.delay на каждую транзакцию
+        # После: проверки, поставленные schedule_budget_checks
+        for name, queued in (('до: проверка на каждую транзакцию', rows),
+                             ('после: объединение проверок', mock_apply_async.call_count)):
+            cpu_started = time.process_time()
+            _, seconds = timed(lambda: [check_budget_limit(budget.id)
+                                        for _ in range(queued)])  # pylint: disable=cell-var-from-loop
+            print(f'{name:<40} в очереди: {queued:>6} '
+                  f'выполнение: {seconds:>8.3f} s, CPU воркера: '
+                  f'{time.process_time() - cpu_started:>8.3f} s')
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 40)
@@ -0,0 +1,109 @@
+"""
+Замер отправки уведомлений о бюджете: письмо на каждое уведомление с новым соединением
+(прежняя схема), те же письма через одно соединение и задача send_budget_notifications
+(сводные письма по пользователям).
+
+Письма принимает backend django.core.mail.backends.locmem, дополненный счетчиком соединений,
+поэтому замер не зависит от сети и SMTP-сервера: печатаются кол-во писем, кол-во открытых
+соединений (экземпляров backend) и время формирования писем.
+
+Запуск: python -m benchmarks.bench_notifications [кол-во уведомлений] [кол-во пользователей]
+"""
+import sys
+from typing import Any
+from django.core.mail.backends.locmem import EmailBackend
+from benchmarks import (django_test_db,
+                        timed)
+
+COUNTING_BACKEND = 'benchmarks.bench_notifications.CountingEmailBackend'
+
+
+class CountingEmailBackend(EmailBackend):  # pylint: disable=too-few-public-methods
+    """
+    Backend locmem (письма сохраняются в django.core.mail.outbox), считающий соединения
+    """
+    connections = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        type(self).connections += 1
+
+
+def create_recipients(users: int) -> list[Any]:
+    """
+    Создание users пользователей - получателей уведомлений
+    """
+    # pylint: disable=import-outside-toplevel
+    from users.models import User
+
+    return [User.objects.create(username=f'bench{index}', first_name='Bench',
+                                last_name='User', email=f'bench{index}@example.com')
+            for index in range(users)]
+
+
+def create_notifications(recipients: list[Any], notifications: int) -> None:
+    """
+    Создание notifications уведомлений о лимите бюджета, распределенных по recipients
+    """
+    # pylint: disable=import-outside-toplevel
+    from budget.models import BudgetNotification
+
+    BudgetNotification.objects.bulk_create(
+        BudgetNotification(user=recipients[index % len(recipients)], transaction_type='expense',
+                           category=f'Категория {index}',
+                           type_notify=BudgetNotification.LIMIT_BUDGET,
+                           forecast=100, actual=95)
+        for index in range(notifications))
+
+
+def main(notifications: int, users: int) -> None:
+    """
+    Отправка notifications уведомлений users пользователям тремя способами
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.conf import settings
+    from django.core import mail
+    from django.test.utils import override_settings
+    from django.utils.module_loading import import_string
+    from budget.celery_tasks import send_budget_notifications
+    from services.email import (send_email,
+                                send_emails)
+
+    recipients = create_recipients(users)
+    emails = [(f'Предупреждение о бюджете {index}', f'Категория {index}',
+               recipients[index % users].email) for index in range(notifications)]
+    # Класс, который загружает Django по пути из настроек (при запуске через -m модуль
+    # __main__ и benchmarks.bench_notifications - разные объекты)
+    backend = import_string(COUNTING_BACKEND)
+
+    def report(name: str, seconds: float) -> None:
+        print(f'{name:<45} писем: {len(mail.outbox):>6} соединений: {backend.connections:>6} '
+              f'{seconds:>8.3f} s {notifications / seconds:>9.1f} уведомлений/с')
+        mail.outbox = []
+        backend.connections = 0
+
+    with override_settings(EMAIL_BACKEND=COUNTING_BACKEND):
+        mail.outbox = []
+
+        def send_each() -> None:
+            for subject, body, to in emails:
+                send_email(subject, body, settings.DEFAULT_FROM_EMAIL, [to])
+
+        _, seconds = timed(send_each)
+        report('до: send_email (соединение на письмо)', seconds)
+
+        _, seconds = timed(lambda: send_emails([
+            mail.EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [to])
+            for subject, body, to in emails]))
+        report('send_emails (одно соединение)', seconds)
+
+        create_notifications(recipients, notifications)
+        with override_settings(BUDGET_NOTIFICATIONS_BATCH_SIZE=notifications + 1):
+            _, seconds = timed(send_budget_notifications)
+        report('после: send_budget_notifications (сводные)', seconds)
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,63 @@
+"""
+Замер ночной сверки бюджетов: время и пиковая память Python при большом кол-ве транзакций.
+
+Запуск: python -m benchmarks.bench_reconcile [кол-во транзакций] [кол-во пользователей]
+"""
+import sys
+import tracemalloc
+from datetime import (datetime,
+                      timezone)
+from benchmarks import (django_test_db,
+                        report,
+                        timed)
+
+
+def main(rows: int, users: int) -> None:
+    """
+    rows транзакций users пользователей (40 категорий, бюджеты на каждый месяц 2024 года),
+    фактические суммы всех категорий заведомо неверные
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.db import connection
+    from services.budget_reconcile import reconcile_budgets
+    from users.models import User
+
+    User.objects.bulk_create(User(username=f'bench{index}', first_name='Bench', last_name='User',
+                                  email=f'bench{index}@example.com') for index in range(users))
+    # Бюджеты, категории и транзакции генерируются в БД
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO budgets (user_id, start_date, end_date, date_modified)
+            SELECT u.id, m, m + interval '1 month' - interval '1 second', now()
+            FROM users u, generate_series('2024-01-01'::timestamptz, '2024-12-01', '1 month') m
+        ''')
+        cursor.execute('''
+            INSERT INTO budget_categories (budget_id, transaction_type, category, forecast,
+                                           actual, is_notified)
+            SELECT b.id, 'expense', 'Category ' || c, 1000, 1, false
+            FROM budgets b, generate_series(0, 39) c
+        ''')
+        cursor.execute('''
+            INSERT INTO transactions (user_id, amount, transaction_type, category,
+                                      date_transaction, date_modified)
+            SELECT u.id, (i %% 500) + 1.25, 'expense', 'Category ' || (i %% 40),
+                   '2024-01-01'::timestamptz + (i %% 525600) * interval '1 minute', now()
+            FROM (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM users) u,
+                 generate_series(0, %s - 1) i
+            WHERE i %% %s = u.n
+        ''', [rows, users])
+        cursor.execute('ANALYZE')
+
+    tracemalloc.start()
+    result, seconds = timed(lambda: reconcile_budgets(datetime(2024, 1, 1, tzinfo=timezone.utc)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report('reconcile_budgets', rows, seconds)
+    print(f"{'':<40} исправлено категорий: {result['fixed']}, бюджетов: {result['budgets']}, "
+          f'пиковая память Python: {peak / 1024 / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 100)
@@ -0,0 +1,73 @@
+"""
+Сравнение рендереров и парсеров API: стандартный JSON DRF, orjson и MessagePack
+на страницах списка транзакций и телах пакетного создания.
+
+Запуск: python -m benchmarks.bench_renderers [кол-во транзакций] [кол-во повторов]
+"""
+import io
+import sys
+from functools import partial
+from typing import Any
+from benchmarks import (create_transactions,
+                        django_test_db,
+                        report,
+                        timed)
+
+
+def main(rows: int, repeats: int) -> None:  # pylint: disable=too-many-locals
+    """
+    Замер рендеринга списка, разбора пакета и GET /transactions/ с разными Accept
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.urls import reverse
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+    from fin_transactions.models import Transaction
+    from fin_transactions.serializers import TransactionsSerializer
+    from services.renderers import (MessagePackParser,
+                                    MessagePackRenderer,
+                                    ORJSONParser,
+                                    ORJSONRenderer)
+
+    user = create_transactions(rows)
+    results = TransactionsSerializer(Transaction.objects.all(), many=True).data
+    page = {'next': None, 'previous': None, 'results': results}
+    batch = [{key: value for key, value in item.items() if key != 'id'} for item in results]
+    total = rows * repeats
+
+    def render(renderer: Any) -> bytes:
+        content = b''
+        for _ in range(repeats):
+            content = renderer.render(page)
+        return content
+
+    def parse(parser: Any, body: bytes) -> None:
+        for _ in range(repeats):
+            parser.parse(io.BytesIO(body))
+
+    for name, renderer, parser in (('JSONRenderer/JSONParser', JSONRenderer(), JSONParser()),
+                                   ('orjson', ORJSONRenderer(), ORJSONParser()),
+                                   ('MessagePack', MessagePackRenderer(), MessagePackParser())):
+        content, seconds = timed(partial(render, renderer))
+        report(f'{name}: список ({len(content) / 1024:.0f} KiB)', total, seconds)
+        _, seconds = timed(partial(parse, parser, renderer.render(batch)))
+        report(f'{name}: разбор пакета', total, seconds)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    def get_pages(accept: str) -> None:
+        for _ in range(repeats):
+            client.get(reverse('transaction-list-create'), {'page_size': rows},
+                       HTTP_ACCEPT=accept)
+
+    for accept in ('application/json', 'application/msgpack'):
+        _, seconds = timed(partial(get_pages, accept))
+        report(f'GET /transactions/ {accept}', total, seconds)
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 50)
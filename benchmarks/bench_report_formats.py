@@ -0,0 +1,58 @@
+"""
+Сравнение времени формирования и размера файла отчета в форматах CSV, Parquet и Arrow IPC.
+
+Запуск: python -m benchmarks.bench_report_formats [кол-во транзакций]
+"""
+import os
+import sys
+import tempfile
+from functools import partial
+from typing import Callable
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from benchmarks import (django_test_db,
+                        report,
+                        timed)
+
+
+def main(rows: int) -> None:  # pylint: disable=too-many-locals
+    """
+    Наполнение таблицы транзакций и замер каждого формата
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.conf import settings
+    from fin_transactions.models import Transaction
+    from services.report import save_csv
+    from services.report_arrow import (save_arrow,
+                                       save_parquet)
+    from users.models import User
+
+    user = User.objects.create(first_name='Bench', last_name='User', email='bench@example.com')
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    Transaction.objects.bulk_create((
+        Transaction(user=user, amount=f'{(i % 5000) + 1}.{i % 100:02d}',
+                    transaction_type=Transaction.EXPENSE if i % 4 else Transaction.INCOME,
+                    category=f'Category {i % 40}',
+                    date_transaction=start + timedelta(minutes=i))
+        for i in range(rows)), batch_size=10000)
+
+    transactions = Transaction.objects.for_user_period(user.id)
+    with tempfile.TemporaryDirectory() as folder:
+        writers: dict[str, Callable[[str], None]] = {
+            'csv': lambda path: save_csv(path, user, transactions,
+                                         settings.REPORT_CHUNK_SIZE),
+            'parquet': lambda path: save_parquet(path, user, transactions,
+                                                 settings.REPORT_BATCH_SIZE),
+            'arrow': lambda path: save_arrow(path, user, transactions,
+                                             settings.REPORT_BATCH_SIZE),
+        }
+        for report_format, writer in writers.items():
+            path = os.path.join(folder, f'report.{report_format}')
+            _, seconds = timed(partial(writer, path))
+            report(f'{report_format} ({os.path.getsize(path) / 2 ** 20:.1f} MiB)', rows, seconds)
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,95 @@
+"""
+Замер записи CSV отчета: построчное чтение экземпляров модели с обращением к transaction.user
+против движка services.report (серверный курсор, только колонки отчета, пользователь читается
+один раз) и COPY ... TO STDOUT в PostgreSQL. Печатаются время и пиковая память Python.
+
+Запуск: python -m benchmarks.bench_report_writer [кол-во транзакций]
+"""
+import csv
+import os
+import sys
+import tempfile
+import tracemalloc
+from functools import partial
+from typing import (Any,
+                    Callable)
+from benchmarks import (django_test_db,
+                        report,
+                        timed)
+
+
+def save_csv_models(file_path: str, transactions: Any) -> None:
+    """
+    Запись отчета по экземплярам модели: запрос пользователя на каждую строку
+    """
+    # pylint: disable=import-outside-toplevel
+    from services.report import REPORT_HEADER
+
+    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(REPORT_HEADER)
+        for transaction in transactions.order_by('date_transaction', 'id'):
+            user = transaction.user
+            writer.writerow([user.first_name, user.last_name, user.email, transaction.amount,
+                             transaction.get_transaction_type_display_custom(),
+                             transaction.category, transaction.date_transaction])
+
+
+def insert_transactions(rows: int) -> Any:
+    """
+    Создание пользователя и rows его транзакций (по одной в минуту, 40 категорий)
+    одним запросом INSERT ... SELECT generate_series
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.db import connection
+    from users.models import User
+
+    user = User.objects.create(first_name='Bench', last_name='User', email='bench@example.com')
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO transactions (user_id, amount, transaction_type, category,
+                                      date_transaction, date_modified)
+            SELECT %s, (i %% 500) + 1.25, 'expense', 'Category ' || (i %% 40),
+                   '2024-01-01'::timestamptz + i * interval '1 minute', now()
+            FROM generate_series(0, %s - 1) i
+        ''', [user.id, rows])
+        cursor.execute('ANALYZE transactions')
+    return user
+
+
+def measure(name: str, rows: int, writer: Callable[[], None]) -> None:
+    """
+    Замер времени и пиковой памяти Python одного способа записи отчета
+    """
+    tracemalloc.start()
+    _, seconds = timed(writer)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(name, rows, seconds)
+    print(f"{'':<40} пиковая память Python: {peak / 1024 / 1024:.1f} MiB")
+
+
+def main(rows: int) -> None:
+    """
+    rows транзакций одного пользователя, генерируются в БД
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.conf import settings
+    from fin_transactions.models import Transaction
+    from services.report import (save_csv,
+                                 save_csv_copy)
+
+    user = insert_transactions(rows)
+    transactions = Transaction.objects.for_user_period(user.id)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'report.csv')
+        measure('models + transaction.user', rows,
+                partial(save_csv_models, path, transactions))
+        measure('save_csv', rows,
+                partial(save_csv, path, user, transactions, settings.REPORT_CHUNK_SIZE))
+        measure('save_csv_copy (COPY)', rows, partial(save_csv_copy, path, user, transactions))
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,59 @@
+"""
+Сравнение пропускной способности пакетного создания транзакций (/transactions/batch/)
+с созданием по одной транзакции (POST /transactions/).
+
+Запуск: python -m benchmarks.bench_transactions_batch [кол-во транзакций]
+"""
+import sys
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from unittest.mock import patch
+from benchmarks import (django_test_db,
+                        report,
+                        timed)
+
+
+def main(rows: int) -> None:
+    """
+    Замер по одной транзакции и пакетом на одинаковых данных
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from budget.models import Budget
+    from fin_transactions.models import Transaction
+    from users.models import User
+
+    user = User.objects.create(first_name='Bench', last_name='User', email='bench@example.com')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    Budget.objects.create(user=user, start_date=start, end_date=start + timedelta(days=365))
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    data = [{
+        'user': user.id,
+        'amount': f'{(i % 500) + 1}.25',
+        'transaction_type': Transaction.EXPENSE,
+        'category': f'Category {i % 40}',
+        'date_transaction': (start + timedelta(minutes=i)).strftime('%Y-%m-%dT%H:%MZ'),
+    } for i in range(rows)]
+
+    with patch('services.budget.check_budget_limit.apply_async') as mock_delay:
+        _, seconds = timed(lambda: [client.post(reverse('transaction-list-create'), row,
+                                                format='json') for row in data])
+        report('POST /transactions/ (по одной)', rows, seconds)
+        print(f'{"":<40} check_budget_limit в очереди: {mock_delay.call_count}')
+
+        Transaction.objects.all().delete()
+        mock_delay.reset_mock()
+
+        _, seconds = timed(lambda: client.post(reverse('transaction-batch-create'), data,
+                                               format='json'))
+        report('POST /transactions/batch/', rows, seconds)
+        print(f'{"":<40} check_budget_limit в очереди: {mock_delay.call_count}')
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,63 @@
+"""
+Сравнение чтения страницы списка транзакций через ModelSerializer (экземпляры модели)
+и быстрым путем (.values() и легкий сериализатор строк), в т.ч. с выборочными полями.
+
+Запуск: python -m benchmarks.bench_transactions_list [размер страницы] [кол-во повторов]
+"""
+import sys
+from functools import partial
+from benchmarks import (create_transactions,
+                        django_test_db,
+                        report,
+                        timed)
+
+
+def main(page_size: int, repeats: int) -> None:  # pylint: disable=too-many-locals
+    """
+    Замер сериализации страницы и GET /transactions/ с параметром fields и без
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from fin_transactions.models import Transaction
+    from fin_transactions.serializers import (TransactionsSerializer,
+                                              TransactionRowSerializer)
+
+    user = create_transactions(page_size)
+    queryset = Transaction.objects.order_by('-date_transaction', '-id')[:page_size]
+    rows = page_size * repeats
+
+    def model_serializer() -> None:
+        for _ in range(repeats):
+            list(TransactionsSerializer(list(queryset), many=True).data)
+
+    def row_serializer(fields: tuple[str, ...]) -> None:
+        serializer = TransactionRowSerializer(fields)
+        for _ in range(repeats):
+            [serializer.to_representation(row)  # pylint: disable=expression-not-assigned
+             for row in queryset.values(*serializer.query_fields)]
+
+    _, seconds = timed(model_serializer)
+    report('ModelSerializer', rows, seconds)
+    _, seconds = timed(lambda: row_serializer(TransactionRowSerializer.default_fields))
+    report('.values() + RowSerializer', rows, seconds)
+    _, seconds = timed(lambda: row_serializer(('amount', 'category')))
+    report('.values() + RowSerializer (2 поля)', rows, seconds)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    def get_pages(params: dict[str, object]) -> None:
+        for _ in range(repeats):
+            client.get(reverse('transaction-list-create'), params)
+
+    for fields in ('', 'amount,category'):
+        params = {'page_size': page_size, **({'fields': fields} if fields else {})}
+        _, seconds = timed(partial(get_pages, params))
+        report(f'GET /transactions/?fields={fields or "*"}', rows, seconds)
+
+
+if __name__ == '__main__':
+    with django_test_db():
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 50)
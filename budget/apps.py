@@ -10,3 +10,7 @@ class BudgetConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'budget'
+
+    def ready(self) -> None:
+        # pylint: disable-next=import-outside-toplevel,unused-import
+        from . import signals  # noqa: F401
@@ -2,13 +2,21 @@
 Модуль Celery-задач для бюджета
 """
 import logging
+from decimal import Decimal
+from itertools import groupby
+from smtplib import SMTPException
+from typing import Any
 from celery import shared_task
 from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction as db_transaction
 from django.utils import timezone
-from django.db.models import Sum
-from fin_transactions.models import Transaction
-from services.email import send_email
-from .models import Budget
+from services.budget_reconcile import reconcile_budgets
+from services.email import send_emails
+from users.models import User
+from .models import (Budget,
+                     BudgetCategory,
+                     BudgetNotification)
 
 logger = logging.getLogger(__name__)
 
@@ -16,69 +24,133 @@ logger = logging.getLogger(__name__)
 @shared_task  # type: ignore
 def check_budget_limit(budget_id: int) -> None:
     """
-    Проверяем налие бюджета по категории и выполнение бюджета до опр. уровня
+    Проверяем налие бюджета по категории и выполнение бюджета до опр. уровня.
+    Фактические суммы читаются из категорий (их изменяют записи транзакций и сверка)
+    и не пересчитываются, поэтому проверка не перезаписывает параллельные изменения.
+    Уведомления сохраняются и отправляются отдельной задачей send_budget_notifications
     :param budget_id: id бюджета
     """
+    # Снимаем отметку до проверки: транзакции, сохраненные после этого, запланируют
+    # новую проверку (см. services.budget.schedule_budget_checks)
+    Budget.objects.filter(id=budget_id).update(check_scheduled_at=None)
     budget = Budget.objects.get(id=budget_id)
 
-    for transaction_type in ['income', 'expense']:
-        if transaction_type in budget.budget:
-            for category, data in budget.budget[transaction_type].items():
-                total_actual = Transaction.objects.filter(
-                    user=budget.user,
-                    category=category,
-                    transaction_type=transaction_type,
-                    date_transaction__range=[budget.start_date, budget.end_date]
-                ).aggregate(Sum('amount'))['amount__sum'] or 0
-
-                data['actual'] = float(total_actual)
-
-                budget_amounts = {
-                    'forecast': data['forecast'],
-                    'actual': total_actual
-                }
-                # Проверяем, нужно ли отправить оповещение для пустого бюджета
-                if data['forecast'] == 0:
-                    send_budget_notification(budget, transaction_type,
-                                             category, budget_amounts,
-                                             'zero_budget')
-
-                # Проверяем, нужно ли отправить оповещение при приближении к лимиту бюджета
-                if (total_actual >= 0.9 * data['forecast'] and
-                        data['forecast'] > 0 and
-                        not data['is_notified']):
-                    send_budget_notification(budget, transaction_type,
-                                             category, budget_amounts,
-                                             'limit_budget')
-                    data['is_notified'] = True
-                    data['date_notified'] = timezone.now().date().isoformat()
-
-    budget.save()
-
-
-def send_budget_notification(
-    budget: Budget,
-    transaction_type: str,
-    category: str,
-    budget_amounts: dict[str, float],
-    type_notify: str
-) -> None:
+    notifications: list[BudgetNotification] = []
+    near_limit: dict[int, BudgetCategory] = {}
+    for category in budget.categories.all():
+        # Проверяем, нужно ли отправить оповещение для пустого бюджета
+        if category.forecast == 0:
+            notifications.append(budget_notification(budget, category,
+                                                     BudgetNotification.ZERO_BUDGET))
+
+        # Проверяем, нужно ли отправить оповещение при приближении к лимиту бюджета
+        if (category.actual >= Decimal('0.9') * category.forecast and
+                category.forecast > 0 and
+                not category.is_notified):
+            near_limit[category.id] = category
+
+    if near_limit:
+        with db_transaction.atomic():
+            # Отметку ставим только категориям, которые еще не отмечены (строки блокируются),
+            # поэтому параллельная проверка того же бюджета не повторит уведомление
+            notify_ids = list(BudgetCategory.objects.select_for_update()
+                              .filter(id__in=near_limit, is_notified=False)
+                              .values_list('id', flat=True))
+            if notify_ids:
+                BudgetCategory.objects.filter(id__in=notify_ids).update(
+                    is_notified=True, date_notified=timezone.now().date())
+                # Дата изменения бюджета участвует в ETag
+                Budget.objects.filter(id=budget_id).update(date_modified=timezone.now())
+        for category_id in notify_ids:
+            notifications.append(budget_notification(budget, near_limit[category_id],
+                                                     BudgetNotification.LIMIT_BUDGET))
+
+    if notifications:
+        BudgetNotification.objects.bulk_create(notifications)
+        send_budget_notifications.apply_async(countdown=settings.BUDGET_NOTIFICATIONS_DELAY)
+
+
+def budget_notification(budget: Budget, category: BudgetCategory,
+                        type_notify: str) -> BudgetNotification:
     """
-    Отправляет уведомление пользователю о подходе к лимиту бюджета либо отсутствии бюджета
+    Уведомление пользователю о подходе к лимиту бюджета либо отсутствии бюджета
 
     :param budget: экземпляр бюджета
-    :param transaction_type: тип транзакции ('income' или 'expense')
-    :param category: категория транзакции
-    :param budget_amounts: словарь с прогнозируемой суммой бюджета и фактической
+    :param category: категория бюджета
     :param type_notify: тип уведомления ('zero_budget' или 'limit_budget')
     """
-    subject_email = 'Предупреждение о бюджете' if type_notify == 'limit_budget' \
+    return BudgetNotification(user_id=budget.user_id, transaction_type=category.transaction_type,
+                              category=category.category, type_notify=type_notify,
+                              forecast=category.forecast, actual=category.actual)
+
+
+def notification_text(notification: BudgetNotification) -> str:
+    """
+    Текст уведомления для письма
+
+    :param notification: уведомление о бюджете
+    """
+    if notification.type_notify == BudgetNotification.LIMIT_BUDGET:
+        return (f"Ваш лимит по категории '{notification.category}' "
+                f"({notification.transaction_type}) приблизился к 90%. "
+                f"Прогноз: {notification.forecast}, Фактически: {notification.actual}.")
+    return (f"Необходимо установить бюджет по категории '{notification.category}' "
+            f"({notification.transaction_type})")
+
+
+def budget_digest(user: User, notifications: list[BudgetNotification]) -> EmailMessage:
+    """
+    Сводное письмо пользователю со всеми его уведомлениями о бюджете
+
+    :param user: получатель
+    :param notifications: уведомления пользователя
+    """
+    subject_email = 'Предупреждение о бюджете' \
+        if any(notification.type_notify == BudgetNotification.LIMIT_BUDGET
+               for notification in notifications) \
         else 'Предупреждение о незаполненом бюджете'
-    body_email = (
-        f"Ваш лимит по категории '{category}' ({transaction_type}) "
-        f"приблизился к 90%. Прогноз: {budget_amounts['forecast']}, "
-        f"Фактически: {budget_amounts['actual']}."
-    ) if type_notify == 'limit_budget' \
-        else f"Необходимо установить бюджет по категории '{category}' ({transaction_type})"
-
-    send_email(subject_email, body_email, settings.DEFAULT_FROM_EMAIL, [budget.user.email])
+    body_email = '\n'.join(notification_text(notification) for notification in notifications)
+    return EmailMessage(subject_email, body_email, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+@shared_task(autoretry_for=(SMTPException, OSError), retry_backoff=True,
+             max_retries=5)  # type: ignore
+def send_budget_notifications() -> int:
+    """
+    Отправка неотправленных уведомлений о бюджете: одно сводное письмо на пользователя,
+    все письма порции - через одно SMTP-соединение.
+    Уведомления блокируются (SKIP LOCKED), поэтому параллельные задачи не отправляют их
+    повторно; при ошибке SMTP транзакция откатывается и задача повторяется с задержкой.
+    :return: кол-во отправленных писем
+    """
+    with db_transaction.atomic():
+        notifications = list(
+            BudgetNotification.objects.filter(sent_at__isnull=True)
+            .select_related('user').select_for_update(skip_locked=True, of=('self',))
+            .order_by('user_id', 'id')[:settings.BUDGET_NOTIFICATIONS_BATCH_SIZE]
+        )
+        if not notifications:
+            return 0
+
+        messages = [budget_digest(user_notifications[0].user, user_notifications)
+                    for user_notifications in (list(group) for _, group in groupby(
+                        notifications, key=lambda notification: notification.user_id))]
+        sent = send_emails(messages)
+        BudgetNotification.objects.filter(
+            id__in=[notification.id for notification in notifications]
+        ).update(sent_at=timezone.now())
+
+    logger.info('Отправлено уведомлений о бюджете: %s (%s писем)', len(notifications), sent)
+    if len(notifications) == settings.BUDGET_NOTIFICATIONS_BATCH_SIZE:
+        # Порция заполнена - остальные уведомления отправляет следующая задача
+        send_budget_notifications.apply_async()
+    return sent
+
+
+@shared_task  # type: ignore
+def reconcile_budget_actuals() -> dict[str, Any]:
+    """
+    Ночная сверка фактических сумм текущих и недавно завершенных бюджетов с транзакциями
+    :return: отчет о расхождениях
+    """
+    return reconcile_budgets()
@@ -0,0 +1,42 @@
+"""
+Команда сверки фактических сумм бюджетов с транзакциями:
+python manage.py reconcile_budgets [--since YYYY-MM-DD | --all] [--dry-run]
+"""
+from datetime import (datetime,
+                      timezone)
+from typing import Any
+from django.core.management.base import (BaseCommand,
+                                         CommandParser)
+from services.budget_reconcile import reconcile_budgets
+
+
+class Command(BaseCommand):
+    """
+    Пересчет фактических сумм категорий бюджетов и отчет о расхождениях
+    """
+    help = 'Сверка фактических сумм бюджетов с транзакциями'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument('--since', type=datetime.fromisoformat,
+                           help='Бюджеты, завершающиеся не ранее даты (по умолч. - '
+                                'текущие и завершившиеся за BUDGET_RECONCILE_DAYS дней)')
+        group.add_argument('--all', action='store_true', help='Все бюджеты')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Только отчет о расхождениях, без исправления')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        since = options['since']
+        if options['all']:
+            since = datetime.min.replace(tzinfo=timezone.utc)
+        elif since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        report = reconcile_budgets(since, dry_run=options['dry_run'])
+
+        self.stdout.write(f"Исправлено категорий: {report['fixed']}, "
+                          f"создано: {report['created']}, бюджетов: {report['budgets']}, "
+                          f"расхождение: {report['drift']}")
+        for item in report['largest']:
+            self.stdout.write(f"  бюджет {item['budget_id']} {item['transaction_type']} "
+                              f"'{item['category']}': {item['drift']}")
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.2 on 2024-11-20 09:30
+
+from decimal import Decimal
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def budget_to_categories(apps: Any, schema_editor: Any) -> None:
+    """
+    Перенос категорий из JSON-поля budget в таблицу budget_categories
+    """
+    Budget = apps.get_model('budget', 'Budget')
+    BudgetCategory = apps.get_model('budget', 'BudgetCategory')
+    for budget in Budget.objects.iterator(chunk_size=1000):
+        BudgetCategory.objects.bulk_create(
+            BudgetCategory(
+                budget_id=budget.id, transaction_type=transaction_type, category=category,
+                forecast=Decimal(str(data.get('forecast', 0))).quantize(Decimal('0.00')),
+                actual=Decimal(str(data.get('actual', 0))).quantize(Decimal('0.00')),
+                is_notified=bool(data.get('is_notified', False)),
+                date_notified=data.get('date_notified'),
+            )
+            for transaction_type in ('income', 'expense')
+            for category, data in (budget.budget or {}).get(transaction_type, {}).items()
+        )
+
+
+def categories_to_budget(apps: Any, schema_editor: Any) -> None:
+    """
+    Обратный перенос категорий в JSON-поле budget
+    """
+    Budget = apps.get_model('budget', 'Budget')
+    BudgetCategory = apps.get_model('budget', 'BudgetCategory')
+    budgets: dict[int, dict[str, Any]] = {}
+    for category in BudgetCategory.objects.order_by('budget_id', 'id').iterator(chunk_size=1000):
+        budgets.setdefault(category.budget_id, {'income': {}, 'expense': {}})[
+            category.transaction_type][category.category] = {
+                'forecast': float(category.forecast),
+                'actual': float(category.actual),
+                'is_notified': category.is_notified,
+                'date_notified': category.date_notified.isoformat()
+                if category.date_notified else None,
+        }
+    for budget_id, budget in budgets.items():
+        Budget.objects.filter(id=budget_id).update(budget=budget)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0002_budget_date_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_type', models.CharField(choices=[('income', 'Доход'), ('expense', 'Расход')], max_length=7, verbose_name='Тип транзакции')),
+                ('category', models.CharField(max_length=100, verbose_name='Категория')),
+                ('forecast', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Прогноз')),
+                ('actual', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Факт')),
+                ('is_notified', models.BooleanField(default=False, verbose_name='Уведомление отправлено')),
+                ('date_notified', models.DateField(blank=True, null=True, verbose_name='Дата уведомления')),
+                ('budget', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='budget.budget', verbose_name='Бюджет')),
+            ],
+            options={
+                'verbose_name': 'Категория бюджета',
+                'verbose_name_plural': 'Категории бюджета',
+                'db_table': 'budget_categories',
+                'constraints': [models.UniqueConstraint(fields=('budget', 'transaction_type', 'category'), name='budget_categories_budget_type_category_uniq')],
+            },
+        ),
+        migrations.RunPython(budget_to_categories, categories_to_budget),
+        migrations.RemoveField(
+            model_name='budget',
+            name='budget',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2024-11-21 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0003_budgetcategory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='check_scheduled_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.2 on 2024-11-22 11:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0004_budget_check_scheduled_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_type', models.CharField(choices=[('income', 'Доход'), ('expense', 'Расход')], max_length=7, verbose_name='Тип транзакции')),
+                ('category', models.CharField(max_length=100, verbose_name='Категория')),
+                ('type_notify', models.CharField(choices=[('zero_budget', 'Незаполненный бюджет'), ('limit_budget', 'Приближение к лимиту')], max_length=12, verbose_name='Тип уведомления')),
+                ('forecast', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Прогноз')),
+                ('actual', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Факт')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='budget_notifications', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Уведомление о бюджете',
+                'verbose_name_plural': 'Уведомления о бюджете',
+                'db_table': 'budget_notifications',
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['user', 'id'], name='budget_notifications_pending')],
+            },
+        ),
+    ]
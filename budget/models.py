@@ -1,11 +1,18 @@
 """
 Модуль моделей приложения budget для хранения информации о бюджете в БД
 """
-from django.db import models
+from decimal import Decimal
+from typing import (Any,
+                    Optional)
+from django.db import (IntegrityError,
+                       models,
+                       transaction as db_transaction)
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+TRANSACTION_TYPES = ('income', 'expense')
+
 
 class Budget(models.Model):
     """
@@ -15,16 +22,20 @@ class Budget(models.Model):
         user (ForeignKey): ссылка на пользователя, к которому относится бюджет
         start_date (DateTimeField): дата начала бюджета
         end_date (DateTimeField): дата завершения бюджета
-        budget (JSONField): бюджет, содержащий прогноз и фактические данные по доходам и расходам.
+        date_modified (DateTimeField): дата изменения бюджета. Обновляется автоматически
+        check_scheduled_at (DateTimeField): время постановки отложенной проверки лимитов,
+            пусто, если проверка не запланирована
 
-    Структура JSON:
+    Категории бюджета хранятся в модели BudgetCategory. Свойство budget представляет их
+    в прежнем формате JSON (только для чтения и замены целиком, фактические суммы
+    изменяются в БД через BudgetCategory.objects.add_actual):
     {
         "income": {
             "category_name": {
                 "forecast": float,  # прогнозируемая сумма дохода для категории
                 "actual": float,  # фактическая сумма дохода для категории
                 "is_notified": bool,  # было ли отправлено уведомление о пересечении 90% от бюджета
-                "date_notified": Optional[datetime]  # дата отправки уведомления, если отправлено
+                "date_notified": Optional[str]  # дата отправки уведомления, если отправлено
             },
             ...
         },
@@ -33,7 +44,7 @@ class Budget(models.Model):
                 "forecast": float,  # прогнозируемая сумма расхода для категории
                 "actual": float,  # фактическая сумма расхода для категории
                 "is_notified": bool,  # было ли отправлено уведомление о пересечении 90% от бюджета
-                "date_notified": Optional[datetime]  # дата отправки уведомления, если отправлено
+                "date_notified": Optional[str]  # дата отправки уведомления, если отправлено
             },
             ...
         }
@@ -43,7 +54,8 @@ class Budget(models.Model):
                              related_name='budgets', verbose_name='Пользователь')
     start_date = models.DateTimeField(verbose_name='Дата начала')
     end_date = models.DateTimeField(verbose_name='Дата завершения')
-    budget = models.JSONField(default=dict, verbose_name='Бюджет')
+    date_modified = models.DateTimeField(auto_now=True)
+    check_scheduled_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = models.Manager()
 
@@ -56,5 +68,211 @@ class Budget(models.Model):
         verbose_name = 'Бюджет'
         verbose_name_plural = 'Бюджеты'
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._budget: Optional[dict[str, Any]] = None
+        self._budget_changed = False
+        super().__init__(*args, **kwargs)
+
+    @property
+    def budget(self) -> dict[str, Any]:
+        """
+        Категории бюджета в формате JSON (учитывает prefetch_related('categories'))
+        """
+        if self._budget is None:
+            self._budget = {transaction_type: {} for transaction_type in TRANSACTION_TYPES}
+            if self.pk:
+                for category in self.categories.all():  # pylint: disable=no-member
+                    self._budget[category.transaction_type][category.category] = \
+                        category.as_json()
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: dict[str, Any]) -> None:
+        """
+        Замена категорий бюджета целиком (сохраняется в БД при save())
+        """
+        self._budget = value
+        self._budget_changed = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+            if self._budget_changed:
+                BudgetCategory.objects.replace(self, self._budget or {})
+                self._budget_changed = False
+                self._budget = None
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self._budget = None
+        self._budget_changed = False
+
     def __str__(self) -> str:
         return f'{self.user} ({self.start_date} - {self.end_date})'
+
+
+class BudgetCategoryQuerySet(models.QuerySet['BudgetCategory']):
+    """
+    Операции с категориями бюджета
+    """
+
+    def add_actual(self, budget_id: int, transaction_type: str, category: str,
+                   amount: Decimal) -> None:
+        """
+        Изменение фактической суммы категории на amount одним UPDATE
+        (actual = actual + amount) без чтения и перезаписи бюджета.
+        Если категории нет, она создается с нулевым прогнозом.
+        Дата изменения бюджета (ETag) здесь не обновляется: ее обновляет
+        services.budget.schedule_budget_checks в той же транзакции БД.
+        """
+        categories = self.filter(budget_id=budget_id, transaction_type=transaction_type,
+                                 category=category)
+        if categories.update(actual=models.F('actual') + amount):
+            return
+        try:
+            with db_transaction.atomic():
+                self.create(budget_id=budget_id, transaction_type=transaction_type,
+                            category=category, actual=amount)
+        except IntegrityError:
+            # Категорию создал параллельный запрос
+            categories.update(actual=models.F('actual') + amount)
+
+    def replace(self, budget: Budget, budget_data: dict[str, Any]) -> None:
+        """
+        Замена категорий бюджета данными в формате JSON
+        """
+        self.filter(budget=budget).delete()
+        self.bulk_create(
+            BudgetCategory.from_json(budget, transaction_type, category, data)
+            for transaction_type in TRANSACTION_TYPES
+            for category, data in budget_data.get(transaction_type, {}).items()
+        )
+
+
+class BudgetCategory(models.Model):
+    """
+    Модель категории бюджета
+
+    Поля:
+        budget (ForeignKey): ссылка на бюджет
+        transaction_type (CharField): тип транзакции ('income' или 'expense')
+        category (CharField): категория транзакции
+        forecast (DecimalField): прогнозируемая сумма
+        actual (DecimalField): фактическая сумма
+        is_notified (BooleanField): было ли отправлено уведомление о пересечении 90% от бюджета
+        date_notified (DateField): дата отправки уведомления
+    """
+    TRANSACTION_TYPE_CHOICES: list[tuple[str, str]] = [
+        ('income', 'Доход'),
+        ('expense', 'Расход'),
+    ]
+
+    # Отдельный индекс по FK не нужен: budget - первое поле уникального ограничения
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, db_index=False,
+                               related_name='categories', verbose_name='Бюджет')
+    transaction_type = models.CharField(max_length=7, choices=TRANSACTION_TYPE_CHOICES,
+                                        verbose_name='Тип транзакции')
+    category = models.CharField(max_length=100, verbose_name='Категория')
+    forecast = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'),
+                                   verbose_name='Прогноз')
+    actual = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'),
+                                 verbose_name='Факт')
+    is_notified = models.BooleanField(default=False, verbose_name='Уведомление отправлено')
+    date_notified = models.DateField(null=True, blank=True, verbose_name='Дата уведомления')
+
+    objects = BudgetCategoryQuerySet.as_manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Уст. название таблицы в БД, человекочитаемое название модели, ограничения
+        """
+        db_table = 'budget_categories'
+        verbose_name = 'Категория бюджета'
+        verbose_name_plural = 'Категории бюджета'
+        constraints = [
+            models.UniqueConstraint(fields=['budget', 'transaction_type', 'category'],
+                                    name='budget_categories_budget_type_category_uniq'),
+        ]
+
+    @classmethod
+    def from_json(cls, budget: Budget, transaction_type: str, category: str,
+                  data: dict[str, Any]) -> 'BudgetCategory':
+        """
+        Категория из данных в формате JSON
+        """
+        return cls(budget=budget, transaction_type=transaction_type, category=category,
+                   forecast=Decimal(str(data.get('forecast', 0))).quantize(Decimal('0.00')),
+                   actual=Decimal(str(data.get('actual', 0))).quantize(Decimal('0.00')),
+                   is_notified=bool(data.get('is_notified', False)),
+                   date_notified=data.get('date_notified'))
+
+    def as_json(self) -> dict[str, Any]:
+        """
+        Категория в формате JSON
+        """
+        date_notified: Any = self.date_notified
+        return {
+            'forecast': float(self.forecast),
+            'actual': float(self.actual),
+            'is_notified': self.is_notified,
+            'date_notified': date_notified.isoformat() if hasattr(date_notified, 'isoformat')
+            else date_notified,
+        }
+
+    def __str__(self) -> str:
+        return f'{self.transaction_type}: {self.category}'
+
+
+class BudgetNotification(models.Model):
+    """
+    Модель уведомления о бюджете, ожидающего отправки в сводном письме пользователю
+
+    Поля:
+        user (ForeignKey): ссылка на пользователя - получателя уведомления
+        transaction_type (CharField): тип транзакции ('income' или 'expense')
+        category (CharField): категория транзакции
+        type_notify (CharField): тип уведомления ('zero_budget' или 'limit_budget')
+        forecast (DecimalField): прогнозируемая сумма на момент проверки
+        actual (DecimalField): фактическая сумма на момент проверки
+        created_at (DateTimeField): дата создания уведомления
+        sent_at (DateTimeField): дата отправки письма, пусто, пока уведомление не отправлено
+    """
+    ZERO_BUDGET = 'zero_budget'
+    LIMIT_BUDGET = 'limit_budget'
+    TYPE_NOTIFY_CHOICES: list[tuple[str, str]] = [
+        (ZERO_BUDGET, 'Незаполненный бюджет'),
+        (LIMIT_BUDGET, 'Приближение к лимиту'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False,
+                             related_name='budget_notifications', verbose_name='Пользователь')
+    transaction_type = models.CharField(max_length=7,
+                                        choices=BudgetCategory.TRANSACTION_TYPE_CHOICES,
+                                        verbose_name='Тип транзакции')
+    category = models.CharField(max_length=100, verbose_name='Категория')
+    type_notify = models.CharField(max_length=12, choices=TYPE_NOTIFY_CHOICES,
+                                   verbose_name='Тип уведомления')
+    forecast = models.DecimalField(max_digits=14, decimal_places=2, verbose_name='Прогноз')
+    actual = models.DecimalField(max_digits=14, decimal_places=2, verbose_name='Факт')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name='Дата отправки')
+
+    objects = models.Manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Уст. название таблицы в БД, человекочитаемое название модели, индексы
+        """
+        db_table = 'budget_notifications'
+        verbose_name = 'Уведомление о бюджете'
+        verbose_name_plural = 'Уведомления о бюджете'
+        indexes = [
+            # Только неотправленные уведомления: индекс остается маленьким
+            models.Index(fields=['user', 'id'], condition=models.Q(sent_at__isnull=True),
+                         name='budget_notifications_pending'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.type_notify}: {self.transaction_type}: {self.category}'
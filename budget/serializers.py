@@ -3,6 +3,7 @@
 """
 from typing import Any, Dict
 from rest_framework import serializers
+from services.fieldsets import RowSerializer
 from .models import Budget
 
 
@@ -18,43 +19,42 @@ class BudgetListSerializer(serializers.ModelSerializer):  # type: ignore
         fields = ['id', 'start_date', 'end_date']
 
 
+class BudgetRowSerializer(RowSerializer):
+    """
+    Легкий сериализатор строк списка бюджетов (по умолч. поля BudgetListSerializer)
+    """
+    converters = {
+        'id': None,
+        'user': None,
+        'start_date': serializers.DateTimeField().to_representation,
+        'end_date': serializers.DateTimeField().to_representation,
+    }
+    default_fields = tuple(BudgetListSerializer.Meta.fields)
+    # Поля ETag списка (см. ConditionalListMixin)
+    required_fields = ('id', 'date_modified')
+
+
 class BudgetDetailSerializer(serializers.ModelSerializer):  # type: ignore
     """
     Класс сериализатора для получения списка опр. бюджета, редактирования бюджета целиком
-    и удаления бюджета
+    и удаления бюджета.
+    Категории бюджета (BudgetCategory) представлены полем budget в прежнем формате JSON.
     """
+    budget = serializers.JSONField()
+
     class Meta:  # pylint: disable=too-few-public-methods
         """
         Класс настройки сериализатора опр. бюджета для чтения, редактирования и удаления
         """
         model = Budget
-        fields = '__all__'
+        # Служебные поля (date_modified, check_scheduled_at) в API не отдаются и не изменяются
+        fields = ['id', 'user', 'start_date', 'end_date', 'budget']
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Проверка дат и структуры бюджета
         """
-        start_date = attrs.get('start_date')
-        end_date = attrs.get('end_date')
-        user = attrs.get('user')
-
-        request_method = self.context['request'].method
-
-        if request_method == 'POST' and start_date and end_date:
-            # Проверка дат начала и окончания
-            if end_date <= start_date:
-                raise serializers.ValidationError(
-                    {'message': "Дата окончания бюджета должна быть позже даты начала."})
-
-            # Проверка предыдущего бюджета (чтобы дата начала нового бюджета
-            # была после завершения предыдущего)
-            last_budget = Budget.objects.filter(user=user).order_by('-end_date').first()
-            if last_budget and start_date <= last_budget.end_date:
-                raise serializers.ValidationError(
-                    {'message': (
-                        "Дата начала бюджета должна следовать "
-                        "за датой завершения предыдущего бюджета."
-                    )})
+        self.check_period(attrs)
 
         # Проверка структуры поля budget
         budget_data = attrs.get('budget')
@@ -80,3 +80,39 @@ class BudgetDetailSerializer(serializers.ModelSerializer):  # type: ignore
                             )})
 
         return attrs
+
+    def check_period(self, attrs: Dict[str, Any]) -> None:
+        """
+        Проверка дат бюджета: дата окончания позже даты начала, периоды бюджетов пользователя
+        не пересекаются (на этом основан поиск бюджета по дате, см. services.budget_periods).
+        При создании бюджет должен начинаться после завершения последнего бюджета,
+        при редактировании - не пересекаться с остальными бюджетами пользователя.
+        """
+        instance = self.instance
+        start_date = attrs.get('start_date', getattr(instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(instance, 'end_date', None))
+        user = attrs.get('user', getattr(instance, 'user', None))
+        if not start_date or not end_date:
+            return
+
+        # Проверка дат начала и окончания
+        if end_date <= start_date:
+            raise serializers.ValidationError(
+                {'message': "Дата окончания бюджета должна быть позже даты начала."})
+
+        if instance is None:
+            # Проверка предыдущего бюджета (чтобы дата начала нового бюджета
+            # была после завершения предыдущего)
+            last_budget = Budget.objects.filter(user=user).order_by('-end_date').first()
+            if last_budget and start_date <= last_budget.end_date:
+                raise serializers.ValidationError(
+                    {'message': (
+                        "Дата начала бюджета должна следовать "
+                        "за датой завершения предыдущего бюджета."
+                    )})
+            return
+
+        if Budget.objects.filter(user=user, start_date__lte=end_date, end_date__gte=start_date) \
+                .exclude(pk=instance.pk).exists():
+            raise serializers.ValidationError(
+                {'message': "Период бюджета пересекается с другим бюджетом пользователя."})
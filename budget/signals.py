@@ -0,0 +1,23 @@
+"""
+Модуль обработчиков сигналов модели Budget
+"""
+from typing import Any
+from django.db import transaction as db_transaction
+from django.db.models.signals import (post_delete,
+                                      post_save)
+from django.dispatch import receiver
+from services.budget_periods import invalidate_budget_periods
+from .models import Budget
+
+
+@receiver([post_save, post_delete], sender=Budget)
+def invalidate_periods(sender: type[Budget], instance: Budget, **kwargs: Any) -> None:
+    """
+    Сброс кэша периодов бюджетов пользователя при сохранении и удалении бюджета.
+    Повторный сброс после фиксации транзакции БД исключает кэширование периодов,
+    прочитанных параллельным запросом до фиксации.
+    """
+    # pylint: disable=unused-argument
+    user_id = instance.user_id
+    invalidate_budget_periods(user_id)
+    db_transaction.on_commit(lambda: invalidate_budget_periods(user_id))
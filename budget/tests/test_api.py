@@ -10,6 +10,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 from users.models import User
 from budget.models import Budget
+from budget.serializers import BudgetListSerializer
 from .constants import BUDGET
 
 
@@ -81,6 +82,7 @@ class TestBudgetAPI:
         response = api_client.get(reverse('budget-detail', args=[budget.id]), format='json')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['id'] == budget.id
+        assert set(response.data) == {'id', 'user', 'start_date', 'end_date', 'budget'}
 
     def test_update_budget(self, api_client: APIClient,
                            user: User, valid_budget_data: dict[str, Any]) -> None:
@@ -121,6 +123,31 @@ class TestBudgetAPI:
         assert budget.budget['income']['Salary']['forecast'] == 1200.0
         assert budget.budget['expense']['Food']['forecast'] == 400.0
 
+    @pytest.mark.parametrize('start_days, end_days', [(20, 50), (10, 5)])
+    def test_update_budget_invalid_period(self, api_client: APIClient, user: User,
+                                          valid_budget_data: dict[str, Any],
+                                          start_days: int, end_days: int) -> None:
+        """
+        Проверка отказа в редактировании бюджета, если новый период пересекается с другим
+        бюджетом пользователя либо дата окончания раньше даты начала
+        """
+        api_client.force_authenticate(user=user)
+        valid_budget_data['user'] = user
+        budget = Budget.objects.create(**valid_budget_data)
+        start = valid_budget_data['start_date']
+        Budget.objects.create(user=user, start_date=start + timedelta(days=40),
+                              end_date=start + timedelta(days=70))
+
+        response = api_client.put(reverse('budget-detail', args=[budget.id]), {
+            **valid_budget_data, 'user': user.id,
+            'start_date': start + timedelta(days=start_days),
+            'end_date': start + timedelta(days=end_days),
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        budget.refresh_from_db()
+        assert budget.end_date == valid_budget_data['end_date']
+
     def test_delete_budget(self, api_client: APIClient,
                            user: User, valid_budget_data: dict[str, Any]) -> None:
         """
@@ -133,3 +160,78 @@ class TestBudgetAPI:
         response = api_client.delete(reverse('budget-detail', args=[budget.id]), format='json')
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert Budget.objects.count() == 0
+
+    def test_get_budget_detail_not_modified(self, api_client: APIClient,
+                                            user: User, valid_budget_data: dict[str, Any]) -> None:
+        """
+        Проверка ответа 304 на If-None-Match и нового ETag после изменения бюджета
+        """
+        api_client.force_authenticate(user=user)
+        valid_budget_data['user'] = user
+        budget = Budget.objects.create(**valid_budget_data)
+        url = reverse('budget-detail', args=[budget.id])
+
+        etag = api_client.get(url)['ETag']
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+        budget.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_update_budget_if_match(self, api_client: APIClient,
+                                    user: User, valid_budget_data: dict[str, Any]) -> None:
+        """
+        Проверка, что PUT с устаревшим If-Match отклоняется, а с актуальным - выполняется
+        """
+        api_client.force_authenticate(user=user)
+        valid_budget_data['user'] = user
+        budget = Budget.objects.create(**valid_budget_data)
+        url = reverse('budget-detail', args=[budget.id])
+        etag = api_client.get(url)['ETag']
+        updated_data = {**valid_budget_data, 'user': user.id}
+
+        response = api_client.put(url, updated_data, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+        response = api_client.put(url, updated_data, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_get_budget_list_not_modified(self, api_client: APIClient,
+                                          user: User, valid_budget_data: dict[str, Any]) -> None:
+        """
+        Проверка условного запроса списка бюджетов: 304 до удаления бюджета и 200 после
+        """
+        api_client.force_authenticate(user=user)
+        valid_budget_data['user'] = user
+        budget = Budget.objects.create(**valid_budget_data)
+        url = reverse('budget-list-create')
+
+        etag = api_client.get(url)['ETag']
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == \
+            status.HTTP_304_NOT_MODIFIED
+
+        budget.delete()
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_get_budget_list_fields(self, api_client: APIClient,
+                                    user: User, valid_budget_data: dict[str, Any]) -> None:
+        """
+        Проверка списка бюджетов с полями по умолч. и выборочными полями
+        """
+        api_client.force_authenticate(user=user)
+        valid_budget_data['user'] = user
+        budget = Budget.objects.create(**valid_budget_data)
+        url = reverse('budget-list-create')
+
+        response = api_client.get(url)
+        assert response.json() == [dict(BudgetListSerializer(budget).data)]
+
+        response = api_client.get(url, {'fields': 'id,user'})
+        assert response.json() == [{'id': budget.id, 'user': user.id}]
+
+        response = api_client.get(url, {'fields': 'id,unknown'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,218 @@
+"""
+Модуль для unit-тестов Celery-задачи проверки бюджета
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from smtplib import SMTPException
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.conf import settings
+from django.core.mail import (EmailMessage,
+                              get_connection)
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from budget.celery_tasks import (check_budget_limit,
+                                 send_budget_notifications)
+from budget.models import (Budget,
+                           BudgetCategory,
+                           BudgetNotification)
+from services.budget import (schedule_budget_checks,
+                             update_budget)
+from services.budget_periods import get_budget_periods
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestCheckBudgetLimit:
+    """
+    Набор тестов для check_budget_limit
+    """
+    @pytest.fixture
+    def user(self) -> User:
+        """
+        Создание пользователя для тестов
+        """
+        return User.objects.create(
+            first_name="John", last_name="Doe", email="john.doe@example.com"
+        )
+
+    @staticmethod
+    def create_budget(user: User, categories: int, actual: str = '95.00') -> Budget:
+        """
+        Создание бюджета на январь 2024 с categories категориями расходов
+        с прогнозом 100 и фактической суммой actual
+        """
+        budget = Budget.objects.create(
+            user=user,
+            start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc)
+        )
+        BudgetCategory.objects.bulk_create(
+            BudgetCategory(budget=budget, transaction_type='expense',
+                           category=f'Category {index}', forecast=100, actual=actual)
+            for index in range(categories)
+        )
+        return budget
+
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    def test_check_budget_limit(self, mock_send_notifications: MagicMock, user: User) -> None:
+        """
+        Проверка уведомлений по фактическим суммам категорий
+        """
+        budget = self.create_budget(user, 1)
+        budget.budget = {
+            'expense': {**budget.budget['expense'],
+                        'Empty': {'forecast': 0.0, 'actual': 0.0,
+                                  'is_notified': False, 'date_notified': None}},
+            'income': {'Salary': {'forecast': 1000.0, 'actual': 0.0,
+                                  'is_notified': False, 'date_notified': None}},
+        }
+        budget.save()
+        date_modified = budget.date_modified
+
+        check_budget_limit(budget.id)
+
+        budget.refresh_from_db()
+        assert budget.date_modified > date_modified
+        assert budget.budget['expense']['Category 0']['actual'] == 95.0
+        assert budget.budget['expense']['Category 0']['is_notified'] is True
+        assert budget.budget['expense']['Empty']['actual'] == 0.0
+        assert budget.budget['income']['Salary']['actual'] == 0.0
+        assert budget.budget['income']['Salary']['is_notified'] is False
+        notifications = BudgetNotification.objects.filter(user=user, sent_at__isnull=True)
+        assert sorted(notifications.values_list('category', 'type_notify')) == [
+            ('Category 0', 'limit_budget'), ('Empty', 'zero_budget')]
+        mock_send_notifications.assert_called_once_with(
+            countdown=settings.BUDGET_NOTIFICATIONS_DELAY)
+
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    def test_send_budget_notifications(self, mock_send_notifications: MagicMock, user: User,
+                                       mailoutbox: list[EmailMessage]) -> None:
+        """
+        Проверка отправки уведомлений сводными письмами через одно SMTP-соединение
+        """
+        other = User.objects.create(username='jane', first_name='Jane', last_name='Doe',
+                                    email='jane.doe@example.com')
+        check_budget_limit(self.create_budget(user, 2).id)
+        BudgetNotification.objects.create(user=other, transaction_type='expense',
+                                          category='Food', type_notify='zero_budget',
+                                          forecast=0, actual=0)
+
+        with patch('services.email.get_connection', wraps=get_connection) as mock_connection:
+            assert send_budget_notifications() == 2
+        mock_connection.assert_called_once()
+
+        assert [message.to for message in mailoutbox] == [['john.doe@example.com'],
+                                                          ['jane.doe@example.com']]
+        assert mailoutbox[0].subject == 'Предупреждение о бюджете'
+        assert mailoutbox[0].body.count('приблизился к 90%') == 2
+        assert mailoutbox[1].subject == 'Предупреждение о незаполненом бюджете'
+        assert not BudgetNotification.objects.filter(sent_at__isnull=True).exists()
+        assert send_budget_notifications() == 0
+        mock_send_notifications.assert_called_once()
+
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    def test_send_budget_notifications_error(self, mock_send_notifications: MagicMock,
+                                             user: User) -> None:
+        """
+        Проверка, что при ошибке SMTP уведомления остаются неотправленными для повтора
+        """
+        check_budget_limit(self.create_budget(user, 1).id)
+
+        with patch('services.email.get_connection', side_effect=SMTPException('timeout')):
+            with pytest.raises(SMTPException):
+                send_budget_notifications()
+        assert BudgetNotification.objects.filter(sent_at__isnull=True).count() == 1
+        mock_send_notifications.assert_called_once()
+
+    @override_settings(BUDGET_PERIODS_CACHE_ENABLED=True)
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_apply_amount(self, mock_check_budget_limit: MagicMock, user: User) -> None:
+        """
+        Проверка изменения фактической суммы одним UPDATE без чтения бюджета
+        и создания отсутствующей категории
+        """
+        budget = self.create_budget(user, 1, actual='0.00')
+        data = {'transaction_type': 'expense', 'amount': '10.25',
+                'date_transaction': '2024-01-15T10:00Z'}
+
+        get_budget_periods(user.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            update_budget(user, {**data, 'category': 'Category 0'})
+        sql = [query['sql'] for query in queries.captured_queries]
+        assert len(sql) == 3
+        assert '"actual" = ("budget_categories"."actual" + ' in sql[0]
+
+        update_budget(user, {**data, 'category': 'New'})
+        update_budget(user, {**data, 'category': 'New'}, operation='subtract')
+
+        actual = dict(BudgetCategory.objects.filter(budget=budget)
+                      .values_list('category', 'actual'))
+        assert actual == {'Category 0': Decimal('10.25'), 'New': Decimal('0.00')}
+        mock_check_budget_limit.assert_called_once_with(args=[budget.id],
+                                                        countdown=settings.BUDGET_CHECK_DELAY)
+
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_schedule_budget_checks(self, mock_check_budget_limit: MagicMock,
+                                    mock_send_notifications: MagicMock, user: User) -> None:
+        """
+        Проверка объединения проверок: до выполнения запланированной проверки новые
+        не ставятся, после ее начала - ставятся снова, зависшая отметка планируется повторно
+        """
+        budget = self.create_budget(user, 1)
+
+        assert schedule_budget_checks([budget.id]) == [budget.id]
+        assert not schedule_budget_checks([budget.id])
+        assert mock_check_budget_limit.call_count == 1
+
+        check_budget_limit(budget.id)
+        assert schedule_budget_checks([budget.id]) == [budget.id]
+
+        Budget.objects.filter(id=budget.id).update(
+            check_scheduled_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        assert schedule_budget_checks([budget.id]) == [budget.id]
+        assert mock_check_budget_limit.call_count == 3
+        assert mock_send_notifications.call_count == 1
+
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    def test_check_budget_limit_keeps_actual(self, mock_send_notifications: MagicMock,
+                                             user: User) -> None:
+        """
+        Проверка, что проверка не перезаписывает фактические суммы (изменения транзакций,
+        записанные во время проверки, не теряются) и не повторяет уведомление о лимите
+        """
+        budget = self.create_budget(user, 2)
+        BudgetCategory.objects.filter(category='Category 1').update(is_notified=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            check_budget_limit(budget.id)
+        assert not any('"actual"' in query['sql'] for query in queries.captured_queries
+                       if query['sql'].startswith('UPDATE'))
+
+        check_budget_limit(budget.id)
+        assert list(BudgetNotification.objects.values_list('category', flat=True)) == [
+            'Category 0']
+        mock_send_notifications.assert_called_once()
+
+    @pytest.mark.parametrize('categories', [1, 40])
+    @patch('budget.celery_tasks.send_budget_notifications.apply_async')
+    def test_check_budget_limit_queries(self, mock_send_notifications: MagicMock, user: User,
+                                        categories: int) -> None:
+        """
+        Проверка, что кол-во запросов не зависит от кол-ва категорий:
+        снятие отметки, бюджет, категории, в точке сохранения - блокировка неотмеченных
+        категорий, отметка уведомления и дата изменения бюджета, сохранение уведомлений
+        """
+        budget = self.create_budget(user, categories)
+
+        with CaptureQueriesContext(connection) as queries:
+            check_budget_limit(budget.id)
+
+        assert len(queries.captured_queries) == 9
+        assert 'FOR UPDATE' in queries.captured_queries[4]['sql']
+        assert BudgetNotification.objects.count() == categories
+        mock_send_notifications.assert_called_once()
@@ -0,0 +1,107 @@
+"""
+Модуль для unit-тестов сверки фактических сумм бюджетов
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from budget.models import (Budget,
+                           BudgetCategory)
+from fin_transactions.models import Transaction
+from services.budget_reconcile import reconcile_budgets
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestReconcileBudgets:
+    """
+    Набор тестов для сверки бюджетов
+    """
+    @pytest.fixture
+    def user(self) -> User:
+        """
+        Создание пользователя для тестов
+        """
+        return User.objects.create(
+            first_name="John", last_name="Doe", email="john.doe@example.com"
+        )
+
+    @pytest.fixture
+    def budgets(self, user: User) -> list[Budget]:
+        """
+        Бюджеты на 2023 год и январь 2024 с расхождениями и транзакции по ним
+        """
+        budgets = [
+            Budget.objects.create(user=user, start_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+                                  end_date=datetime(2023, 12, 31, tzinfo=timezone.utc)),
+            Budget.objects.create(user=user, start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                                  end_date=datetime(2024, 1, 31, tzinfo=timezone.utc)),
+        ]
+        BudgetCategory.objects.bulk_create([
+            BudgetCategory(budget=budgets[0], transaction_type='expense', category='Food',
+                           actual=1),
+            BudgetCategory(budget=budgets[1], transaction_type='expense', category='Food',
+                           actual=500),
+            BudgetCategory(budget=budgets[1], transaction_type='income', category='Salary',
+                           actual=1000),
+            BudgetCategory(budget=budgets[1], transaction_type='expense', category='Empty',
+                           actual=5),
+        ])
+        Transaction.objects.bulk_create(
+            Transaction(user=user, amount=amount, transaction_type=transaction_type,
+                        category=category, date_transaction=date)
+            for amount, transaction_type, category, date in (
+                ('100.00', 'expense', 'Food', '2023-06-01T10:00Z'),
+                ('150.50', 'expense', 'Food', '2024-01-10T10:00Z'),
+                ('1000.00', 'income', 'Salary', '2024-01-05T10:00Z'),
+                ('30.00', 'expense', 'Taxi', '2024-01-11T10:00Z'),
+                ('20.00', 'expense', 'Food', '2024-02-01T10:00Z'),
+            )
+        )
+        return budgets
+
+    @staticmethod
+    def actuals(budget: Budget) -> dict[str, Decimal]:
+        """
+        Фактические суммы категорий бюджета
+        """
+        return dict(BudgetCategory.objects.filter(budget=budget)
+                    .values_list('category', 'actual'))
+
+    def test_reconcile_budgets(self, budgets: list[Budget]) -> None:
+        """
+        Проверка исправления расхождений только в бюджетах, завершающихся не ранее since
+        """
+        report = reconcile_budgets(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+        assert self.actuals(budgets[1]) == {'Food': Decimal('150.50'), 'Salary': Decimal('1000'),
+                                            'Empty': Decimal('0'), 'Taxi': Decimal('30')}
+        assert self.actuals(budgets[0]) == {'Food': Decimal('1')}
+        assert report['fixed'] == 2
+        assert report['created'] == 1
+        assert report['budgets'] == 1
+        assert report['drift'] == '384.50'
+        assert report['largest'][0] == {'budget_id': budgets[1].id, 'transaction_type': 'expense',
+                                        'category': 'Food', 'drift': '-349.50'}
+        assert reconcile_budgets(datetime(2024, 1, 1, tzinfo=timezone.utc))['fixed'] == 0
+
+    def test_reconcile_budgets_dry_run(self, budgets: list[Budget]) -> None:
+        """
+        Проверка отчета без исправления
+        """
+        report = reconcile_budgets(datetime(2024, 1, 1, tzinfo=timezone.utc), dry_run=True)
+
+        assert (report['fixed'], report['created']) == (2, 1)
+        assert self.actuals(budgets[1])['Food'] == Decimal('500')
+
+    def test_command(self, budgets: list[Budget], settings: object) -> None:
+        """
+        Проверка команды reconcile_budgets по всем бюджетам малыми порциями
+        """
+        setattr(settings, 'BUDGET_RECONCILE_BATCH_SIZE', 1)
+        out = StringIO()
+        call_command('reconcile_budgets', '--all', stdout=out)
+
+        assert 'Исправлено категорий: 3, создано: 1, бюджетов: 2' in out.getvalue()
+        assert self.actuals(budgets[0]) == {'Food': Decimal('100')}
@@ -0,0 +1,105 @@
+"""
+Модуль для unit-тестов кэша периодов бюджетов
+"""
+from datetime import datetime, timezone
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from budget.models import Budget
+from services.budget_periods import (find_budget_id,
+                                     get_budget_periods)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestBudgetPeriods:
+    """
+    Набор тестов для кэша периодов бюджетов
+    """
+    @pytest.fixture(autouse=True)
+    def periods_cache(self, settings: object) -> None:
+        """
+        Включение кэша периодов (в тестах общий кэш - память процесса)
+        """
+        setattr(settings, 'BUDGET_PERIODS_CACHE_ENABLED', True)
+
+    @pytest.fixture
+    def user(self) -> User:
+        """
+        Создание пользователя для тестов
+        """
+        return User.objects.create(
+            first_name="John", last_name="Doe", email="john.doe@example.com"
+        )
+
+    @pytest.fixture
+    def budgets(self, user: User) -> list[Budget]:
+        """
+        Бюджеты на январь и март 2024
+        """
+        return [
+            Budget.objects.create(user=user,
+                                  start_date=datetime(2024, month, 1, tzinfo=timezone.utc),
+                                  end_date=datetime(2024, month, 31, 23, 59, tzinfo=timezone.utc))
+            for month in (1, 3)
+        ]
+
+    @pytest.mark.parametrize('date, index', [
+        (datetime(2023, 12, 31, tzinfo=timezone.utc), None),
+        (datetime(2024, 1, 1, tzinfo=timezone.utc), 0),
+        (datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc), 0),
+        (datetime(2024, 2, 10, tzinfo=timezone.utc), None),
+        (datetime(2024, 3, 15, tzinfo=timezone.utc), 1),
+        (datetime(2024, 4, 1, tzinfo=timezone.utc), None),
+    ])
+    def test_find_budget_id(self, user: User, budgets: list[Budget], date: datetime,
+                            index: int | None) -> None:
+        """
+        Проверка поиска бюджета по дате, в т.ч. на границах периодов и между ними
+        """
+        expected = None if index is None else budgets[index].id
+        assert find_budget_id(user.id, date) == expected
+
+    def test_cache(self, user: User, budgets: list[Budget]) -> None:
+        """
+        Проверка, что периоды читаются из БД один раз и сбрасываются при изменении бюджетов
+        """
+        with CaptureQueriesContext(connection) as queries:
+            get_budget_periods(user.id)
+            get_budget_periods(user.id)
+        assert len(queries.captured_queries) == 1
+
+        budgets[1].end_date = datetime(2024, 4, 30, tzinfo=timezone.utc)
+        budgets[1].save()
+        assert find_budget_id(user.id, datetime(2024, 4, 15, tzinfo=timezone.utc)) == \
+            budgets[1].id
+
+        budgets[0].delete()
+        assert [period.budget_id for period in get_budget_periods(user.id)] == [budgets[1].id]
+
+    def test_lru(self, user: User, budgets: list[Budget], settings: object) -> None:
+        """
+        Проверка вытеснения из LRU процесса: периоды берутся из общего кэша без запроса к БД
+        """
+        setattr(settings, 'BUDGET_PERIODS_CACHE_SIZE', 1)
+        other = User.objects.create(username='jane', first_name='Jane', last_name='Doe',
+                                    email='jane@example.com')
+        get_budget_periods(user.id)
+        get_budget_periods(other.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            periods = get_budget_periods(user.id)
+        assert not queries.captured_queries
+        assert [period.budget_id for period in periods] == [budget.id for budget in budgets]
+
+    def test_cache_disabled(self, user: User, budgets: list[Budget], settings: object) -> None:
+        """
+        Проверка, что без общего кэша периоды читаются из БД при каждом обращении
+        """
+        setattr(settings, 'BUDGET_PERIODS_CACHE_ENABLED', False)
+
+        with CaptureQueriesContext(connection) as queries:
+            get_budget_periods(user.id)
+            periods = get_budget_periods(user.id)
+        assert len(queries.captured_queries) == 2
+        assert [period.budget_id for period in periods] == [budget.id for budget in budgets]
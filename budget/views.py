@@ -8,17 +8,24 @@ from rest_framework import (generics,
 from rest_framework.request import Request
 from rest_framework.response import Response
 from django.db import transaction as db_transaction
+from services.conditional import (ConditionalDetailMixin,
+                                  ConditionalListMixin)
 from services.decorators import add_bearer_security
+from services.fieldsets import SparseFieldsListMixin
 from .models import Budget
 from .serializers import (BudgetListSerializer,
+                          BudgetRowSerializer,
                           BudgetDetailSerializer)
 
 
-class BudgetListCreateView(generics.ListCreateAPIView):  # type: ignore
+# pylint: disable-next=too-many-ancestors
+class BudgetListCreateView(ConditionalListMixin, SparseFieldsListMixin,
+                           generics.ListCreateAPIView):  # type: ignore
     """
     Получение списка бюджетов и создание бюджета
     """
     queryset = Budget.objects.all()
+    row_serializer_class = BudgetRowSerializer
 
     def get_serializer_class(self) -> Type[serializers.Serializer]:
         if self.request.method == 'GET':
@@ -36,7 +43,9 @@ class BudgetListCreateView(generics.ListCreateAPIView):  # type: ignore
         return response
 
 
-class BudgetDetailView(generics.RetrieveUpdateDestroyAPIView):  # type: ignore
+# pylint: disable-next=too-many-ancestors
+class BudgetDetailView(ConditionalDetailMixin,
+                       generics.RetrieveUpdateDestroyAPIView):  # type: ignore
     """
     Получение данных по опр. бюджету, редактирование бюджета и его удаление
     """
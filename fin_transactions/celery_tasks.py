@@ -1,61 +1,134 @@
 """
 Модуль Celery-задач для транзакций
 """
+import glob
 import os
 import logging
-from typing import (cast,
+import shutil
+from typing import (Any,
                     Optional)
-from datetime import datetime
+from datetime import (datetime,
+                      timedelta)
 from django.conf import settings
-from celery import shared_task
-from services.date_operations import transform_date
-from services.report import send_report_email, save_csv
-from .models import Transaction, ReportsResult
+from django.db import connection
+from django.db.models import (Max,
+                              Min,
+                              QuerySet)
+from django.utils import timezone as django_timezone
+from celery import (chord,
+                    group,
+                    shared_task)
+from rest_framework.exceptions import ValidationError
+from services.budget import create_transactions_bulk
+from services.date_operations import split_period
+from services.partitions import create_future_partitions
+from services.report import (save_csv,
+                             save_csv_copy,
+                             save_summary,
+                             send_report_email,
+                             send_summary_email,
+                             summarize_transactions)
+from services.transactions_import import (iter_chunks,
+                                          read_rows,
+                                          validate_row)
+from users.models import User
+from .filters import get_period
+from .models import Transaction, ReportsResult, ImportsResult
 
 logger = logging.getLogger(__name__)
 
 
+def save_csv_file(file_path: str, user: User, transactions: QuerySet[Transaction],
+                  header: bool = True) -> None:
+    """
+    Сохранение отчета в CSV файл: на PostgreSQL строки формирует сама БД (COPY),
+    на других БД - ORM (серверный курсор)
+    """
+    if connection.vendor == 'postgresql':
+        save_csv_copy(file_path, user, transactions, header)
+    else:
+        save_csv(file_path, user, transactions, settings.REPORT_CHUNK_SIZE, header)
+
+
+def save_report_file(file_path: str, report_format: str, user: User,
+                     transactions: QuerySet[Transaction]) -> None:
+    """
+    Сохранение отчета в файл в указанном формате (csv, parquet либо arrow)
+    """
+    if report_format == 'csv':
+        save_csv_file(file_path, user, transactions)
+        return
+
+    # pyarrow - необязательная зависимость, нужна только для колоночных форматов
+    # pylint: disable-next=import-outside-toplevel
+    from services.report_arrow import (save_arrow,
+                                       save_parquet)
+    save_columnar = save_parquet if report_format == 'parquet' else save_arrow
+    save_columnar(file_path, user, transactions, settings.REPORT_BATCH_SIZE)
+
+
 @shared_task  # type: ignore
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
 def generate_transaction_report(user_id: int, start_date: Optional[str] = None,
                                 end_date: Optional[str] = None,
-                                send_email: bool = False) -> Optional[str]:
+                                send_email: bool = False,
+                                report_format: str = 'csv',
+                                mode: str = 'rows') -> Optional[str]:
     """
     Фильтрация транзакций по дате и пользователю
     Аргументы:
         user_id(int): id пользователя
-        start_date(str): дата начала в формате 'YYYY-MM-DD'
-        end_date(str): дата завершения в формате 'YYYY-MM-DD'
+        start_date(str): дата начала в формате 'YYYY-MM-DD' либо 'YYYY-MM-DDTHH:MMZ'
+        end_date(str): дата завершения (включительно) в формате 'YYYY-MM-DD'
+            либо 'YYYY-MM-DDTHH:MMZ'
+        send_email(bool): отправить отчет на email (только CSV)
+        report_format(str): формат файла отчета - csv, parquet либо arrow (Arrow IPC);
+            для итогового отчета - csv либо json
+        mode(str): rows - все транзакции, summary - итоги по месяцам, типам и категориям
     Возвращает:
         str - путь к файлу
     """
-    task = ReportsResult.objects.create(user_id=user_id,
+    # Запись задачи создается при запуске из API (см. services.report_cache.reserve_report)
+    task = ReportsResult.objects.filter(task_id=generate_transaction_report.request.id).first() \
+        or ReportsResult.objects.create(user_id=user_id,
                                         task_id=generate_transaction_report.request.id,
                                         status='in_progress',
                                         send_email=send_email)
     try:
         # Фильтрация транзакций
-        transactions = Transaction.objects.filter(user_id=user_id)
+        # Даты разбираются так же, как в API (YYYY-MM-DD либо YYYY-MM-DDTHH:MMZ)
+        period = get_period({'start_date': start_date, 'end_date': end_date},
+                            'start_date', 'end_date') if start_date and end_date else (None, None)
+        transactions = Transaction.objects.for_user_period(user_id, *period)
 
-        if start_date and end_date:
-            start_date_time, end_date_time = transform_date(start_date, end_date)
-            transactions = transactions.filter(date_transaction__range=[start_date_time,
-                                                                        end_date_time])
+        if not transactions.exists():
+            raise ValueError('Нет транзакций за указанный период')
+        # Данные пользователя читаются один раз и подставляются в каждую строку отчета
+        user = User.objects.only('first_name', 'last_name', 'email').get(id=user_id)
 
         # Путь для сохранения отчета
-        first_transaction = cast(Transaction, transactions.first())
-        user_name = f'_{first_transaction.user.first_name}_{first_transaction.user.last_name}'
+        user_name = f'_{user.first_name}_{user.last_name}{"_summary" if mode == "summary" else ""}'
 
-        filename = f"report{user_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
+        filename = (f"report{user_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                    f".{report_format}")
         folder_path = os.path.join(settings.MEDIA_ROOT, 'reports')
 
         os.makedirs(folder_path, exist_ok=True)
 
         file_path = os.path.join(folder_path, filename)
 
-        if send_email:
-            send_report_email(transactions, first_transaction.user.email)
+        if mode == 'summary':
+            if send_email:
+                send_summary_email(user, summarize_transactions(user_id, *period))
+            else:
+                save_summary(file_path, report_format, summarize_transactions(user_id, *period))
+        elif send_email:
+            send_report_email(user, transactions, settings.REPORT_CHUNK_SIZE)
+        elif report_format == 'csv' and start_report_parts(task, transactions, file_path):
+            # Отчет формируется частями, запись задачи завершит merge_report_parts
+            return file_path
         else:
-            save_csv(file_path, transactions)
+            save_report_file(file_path, report_format, user, transactions)
 
         task.report = filename if not send_email else None
         task.status = 'completed'
@@ -67,4 +140,154 @@ def generate_transaction_report(user_id: int, start_date: Optional[str] = None,
         task.error_message = str(e)
         return None
     finally:
-        task.save()
+        # Отчет из частей сохраняет merge_report_parts: запись не перезаписывается
+        if task.status != 'in_progress':
+            task.save()
+
+
+def start_report_parts(task: ReportsResult, transactions: QuerySet[Transaction],
+                       file_path: str) -> bool:
+    """
+    Запуск параллельного формирования CSV отчета частями по REPORT_SLICE_DAYS дней
+    (Celery chord: части - generate_report_part, склейка - merge_report_parts).
+    Отчеты меньше REPORT_PARALLEL_MIN_ROWS транзакций либо из одной части
+    формируются одной задачей.
+
+    :return: запущено ли формирование частями
+    """
+    min_rows = settings.REPORT_PARALLEL_MIN_ROWS
+    if transactions[:min_rows].count() < min_rows:
+        return False
+    period = transactions.order_by().aggregate(start=Min('date_transaction'),
+                                               end=Max('date_transaction'))
+    slices = split_period(period['start'], period['end'],
+                          timedelta(days=settings.REPORT_SLICE_DAYS))
+    if len(slices) < 2:
+        return False
+
+    parts_folder = os.path.join(settings.MEDIA_ROOT, 'reports', 'parts')
+    os.makedirs(parts_folder, exist_ok=True)
+    parts = group(
+        generate_report_part.s(task.user_id, start.isoformat(), end.isoformat(),
+                               os.path.join(parts_folder, f'{task.task_id}_{index:05d}.csv'),
+                               index == 0)
+        for index, (start, end) in enumerate(slices)
+    )
+    chord(parts)(merge_report_parts.s(task.id, file_path)
+                 .on_error(report_parts_failed.s(task.id)))
+    return True
+
+
+@shared_task  # type: ignore
+def generate_report_part(user_id: int, start: str, end: str, part_path: str,
+                         header: bool) -> str:
+    """
+    Формирование части CSV отчета - транзакций за полуинтервал [start, end)
+    Аргументы:
+        user_id(int): id пользователя
+        start(str), end(str): границы части в формате ISO 8601
+        part_path(str): путь к временному файлу части
+        header(bool): записать заголовок (только первая часть)
+    Возвращает:
+        str - путь к файлу части
+    """
+    user = User.objects.only('first_name', 'last_name', 'email').get(id=user_id)
+    transactions = Transaction.objects.for_user_period(user_id).filter(
+        date_transaction__gte=datetime.fromisoformat(start),
+        date_transaction__lt=datetime.fromisoformat(end))
+    save_csv_file(part_path, user, transactions, header)
+    return part_path
+
+
+@shared_task  # type: ignore
+def merge_report_parts(part_paths: list[str], report_id: int, file_path: str) -> str:
+    """
+    Склейка частей отчета в порядке периодов в файл отчета и удаление частей
+    Аргументы:
+        part_paths(list[str]): пути к файлам частей (результаты generate_report_part)
+        report_id(int): id записи ReportsResult
+        file_path(str): путь к файлу отчета
+    Возвращает:
+        str - путь к файлу отчета
+    """
+    with open(file_path, 'wb') as file:
+        for part_path in part_paths:
+            with open(part_path, 'rb') as part:
+                shutil.copyfileobj(part, file)
+            os.remove(part_path)
+    ReportsResult.objects.filter(id=report_id).update(status='completed',
+                                                      report=os.path.basename(file_path))
+    return file_path
+
+
+@shared_task  # type: ignore
+def report_parts_failed(request: Any, exc: Exception, _traceback: Any, report_id: int) -> None:
+    """
+    Обработка ошибки формирования части отчета: задача отмечается ошибкой,
+    временные файлы частей удаляются
+    """
+    logger.error('Ошибка формирования части отчета (задача %s): %s', request.id, exc)
+    report = ReportsResult.objects.get(id=report_id)
+    report.status = 'error'
+    report.error_message = str(exc)
+    report.save(update_fields=['status', 'error_message'])
+    for part_path in glob.glob(os.path.join(settings.MEDIA_ROOT, 'reports', 'parts',
+                                            f'{report.task_id}_*.csv')):
+        os.remove(part_path)
+
+
+def import_chunk(task: ImportsResult, chunk: list[dict[str, str]]) -> None:
+    """
+    Проверка и сохранение порции строк файла импорта.
+    Транзакции порции, дневные суммы и пересчет бюджетов сохраняются в одной транзакции БД.
+    """
+    now = django_timezone.now()
+    transactions = []
+    for line, row in enumerate(chunk, start=task.processed_rows + 2):
+        try:
+            transactions.append(Transaction(user_id=task.user_id, **validate_row(row, now)))
+        except ValidationError as err:
+            task.rejected_rows += 1
+            if len(task.rejected) < settings.IMPORT_MAX_REJECTED_ROWS:
+                task.rejected.append({'line': line, 'errors': err.detail})
+
+    created = create_transactions_bulk(transactions)
+
+    task.processed_rows += len(chunk)
+    task.imported_rows += len(created)
+    task.save(update_fields=['processed_rows', 'imported_rows', 'rejected_rows', 'rejected'])
+
+
+@shared_task  # type: ignore
+def import_transactions(import_id: int) -> None:
+    """
+    Импорт транзакций из загруженного CSV файла.
+    Файл обрабатывается порциями по IMPORT_CHUNK_SIZE строк, после каждой порции
+    в ImportsResult сохраняется прогресс и отклоненные строки. По завершении файл удаляется.
+    Аргументы:
+        import_id(int): id записи ImportsResult
+    """
+    task = ImportsResult.objects.get(id=import_id)
+    try:
+        with open(task.file, encoding='utf-8-sig', newline='') as file:
+            for chunk in iter_chunks(read_rows(file), settings.IMPORT_CHUNK_SIZE):
+                import_chunk(task, chunk)
+        task.status = 'completed'
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.exception('Ошибка: %s', e)
+        task.status = 'error'
+        task.error_message = str(e)
+    finally:
+        task.save(update_fields=['status', 'error_message'])
+        if os.path.exists(task.file):
+            os.remove(task.file)
+
+
+@shared_task  # type: ignore
+def create_transaction_partitions() -> list[str]:
+    """
+    Ежедневное создание месячных секций таблицы транзакций на TRANSACTIONS_PARTITIONS_AHEAD
+    месяцев вперед
+    :return: имена созданных секций
+    """
+    return create_future_partitions()
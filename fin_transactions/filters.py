@@ -0,0 +1,122 @@
+"""
+Модуль фильтрации списка транзакций по параметрам запроса
+"""
+from datetime import datetime
+from decimal import (Decimal,
+                     InvalidOperation)
+from typing import (Any,
+                    Mapping,
+                    Optional)
+from django.http import QueryDict
+from rest_framework.exceptions import ValidationError
+from services.date_operations import parse_date_param
+from .models import (Transaction,
+                     TransactionQuerySet)
+
+
+def _get_datetime(query_params: Mapping[str, Any], name: str,
+                  end_of_day: bool) -> Optional[datetime]:
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        return parse_date_param(value, end_of_day=end_of_day)
+    except ValueError as err:
+        raise ValidationError({name: ("Неверный формат даты. Используйте формат: "
+                                      "YYYY-MM-DD либо YYYY-MM-DDTHH:MMZ.")}) from err
+
+
+def _get_amount(query_params: QueryDict, name: str) -> Optional[Decimal]:
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation as err:
+        raise ValidationError({name: "Сумма должна быть числом."}) from err
+    if not amount.is_finite():
+        raise ValidationError({name: "Сумма должна быть числом."})
+    return amount
+
+
+def _get_list(query_params: QueryDict, name: str) -> list[str]:
+    """
+    Непустые значения параметра, переданного один либо несколько раз (?category=a&category=b)
+    """
+    return [value for value in query_params.getlist(name) if value]
+
+
+def get_period(query_params: Mapping[str, Any], start_name: str, end_name: str
+               ) -> tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Период из параметров запроса start_name и end_name
+    (YYYY-MM-DD либо YYYY-MM-DDTHH:MMZ), дата окончания включительно
+    """
+    start = _get_datetime(query_params, start_name, end_of_day=False)
+    end = _get_datetime(query_params, end_name, end_of_day=True)
+    if start and end and start > end:
+        raise ValidationError({end_name: ("Дата окончания периода должна быть "
+                                          "позже даты начала.")})
+    return start, end
+
+
+def filter_period(queryset: TransactionQuerySet, query_params: QueryDict,
+                  start_name: str, end_name: str) -> TransactionQuerySet:
+    """
+    Фильтрация транзакций по периоду из параметров запроса start_name и end_name
+    (YYYY-MM-DD либо YYYY-MM-DDTHH:MMZ), дата окончания включительно
+    """
+    start, end = get_period(query_params, start_name, end_name)
+    if start:
+        queryset = queryset.filter(date_transaction__gte=start)
+    if end:
+        queryset = queryset.filter(date_transaction__lte=end)
+    return queryset
+
+
+def filter_transactions(queryset: TransactionQuerySet,
+                        query_params: QueryDict) -> TransactionQuerySet:
+    """
+    Фильтрация транзакций по параметрам запроса.
+
+    Параметры:
+        user: id пользователя
+        date_from, date_to: период (YYYY-MM-DD либо YYYY-MM-DDTHH:MMZ), date_to включительно
+        transaction_type: тип транзакции (income/expense)
+        category: категория; для списка категорий параметр передается несколько раз
+        amount_min, amount_max: диапазон суммы (включительно)
+
+    Условия по пользователю, дате, категории и типу обслуживаются индексами таблицы
+    транзакций, условие по сумме проверяется по строкам, отобранным по индексу
+    (для выборок по категории - прямо в покрывающем индексе, включающем amount).
+    """
+    user_id = query_params.get('user')
+    if user_id:
+        if not user_id.isdigit():
+            raise ValidationError({'user': "id пользователя должен быть целым числом."})
+        queryset = queryset.filter(user_id=int(user_id))
+
+    queryset = filter_period(queryset, query_params, 'date_from', 'date_to')
+
+    transaction_type = query_params.get('transaction_type')
+    if transaction_type:
+        types = [value for value, _ in Transaction.TRANSACTION_TYPE_CHOICES]
+        if transaction_type not in types:
+            raise ValidationError({'transaction_type': (f"Тип транзакции должен быть одним из: "
+                                                        f"{', '.join(types)}.")})
+        queryset = queryset.filter(transaction_type=transaction_type)
+
+    categories = _get_list(query_params, 'category')
+    if len(categories) == 1:
+        queryset = queryset.filter(category=categories[0])
+    elif categories:
+        queryset = queryset.filter(category__in=categories)
+
+    amount_min = _get_amount(query_params, 'amount_min')
+    amount_max = _get_amount(query_params, 'amount_max')
+    if amount_min is not None:
+        queryset = queryset.filter(amount__gte=amount_min)
+    if amount_max is not None:
+        queryset = queryset.filter(amount__lte=amount_max)
+
+    return queryset
@@ -0,0 +1,24 @@
+"""
+Команда пересчета дневных сумм транзакций:
+python manage.py backfill_rollups [--since YYYY-MM-DD]
+"""
+from datetime import date
+from typing import Any
+from django.core.management.base import (BaseCommand,
+                                         CommandParser)
+from services.rollups import backfill_rollups
+
+
+class Command(BaseCommand):
+    """
+    Пересчет таблицы transaction_daily_rollups по транзакциям
+    """
+    help = 'Пересчет дневных сумм транзакций'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--since', type=date.fromisoformat,
+                            help='Первый пересчитываемый день (по умолч. - за все время)')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows = backfill_rollups(options['since'])
+        self.stdout.write(f'Пересчитано дневных сумм: {rows}')
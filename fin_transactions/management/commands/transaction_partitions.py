@@ -0,0 +1,34 @@
+"""
+Команда обслуживания месячных секций таблицы транзакций:
+python manage.py transaction_partitions [--ahead N] [--detach-before YYYY-MM-DD [--drop]]
+"""
+from datetime import date
+from typing import Any
+from django.core.management.base import (BaseCommand,
+                                         CommandParser)
+from services.partitions import (create_future_partitions,
+                                 detach_partitions)
+
+
+class Command(BaseCommand):
+    """
+    Создание секций будущих месяцев и отсоединение секций старых месяцев
+    """
+    help = 'Создание и отсоединение месячных секций таблицы транзакций'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--ahead', type=int,
+                            help='Кол-во месяцев после текущего (по умолч. - '
+                                 'TRANSACTIONS_PARTITIONS_AHEAD)')
+        parser.add_argument('--detach-before', type=date.fromisoformat,
+                            help='Отсоединить секции месяцев, завершившихся до даты')
+        parser.add_argument('--drop', action='store_true',
+                            help='Удалить отсоединенные секции вместе с транзакциями')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        created = create_future_partitions(options['ahead'])
+        self.stdout.write(f"Создано секций: {len(created)} {' '.join(created)}".rstrip())
+        if options['detach_before']:
+            detached = detach_partitions(options['detach_before'], drop=options['drop'])
+            self.stdout.write(f"Отсоединено секций: {len(detached)} "
+                              f"{' '.join(detached)}".rstrip())
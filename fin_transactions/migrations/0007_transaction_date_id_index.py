@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0006_alter_reportsresult_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['date_transaction', 'id'], name='transactions_date_id_idx'),
+        ),
+    ]
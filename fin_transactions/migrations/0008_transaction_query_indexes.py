@@ -0,0 +1,38 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:20
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Индексы создаются без блокировки записи в таблицу транзакций,
+    # индекс по FK удаляется только после создания заменяющего его составного индекса
+    atomic = False
+
+    dependencies = [
+        ('fin_transactions', '0007_transaction_date_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'date_transaction'], name='transactions_user_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'category', 'transaction_type', 'date_transaction'], include=('amount',), name='transactions_budget_cover_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['date_transaction'], name='transactions_date_brin_idx'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0008_transaction_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportsResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=255, unique=True, verbose_name='Celery id')),
+                ('file', models.CharField(max_length=255, verbose_name='Путь к файлу')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('error', 'Error')], default='in_progress', max_length=20, verbose_name='Статус импорта')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Обработано строк')),
+                ('imported_rows', models.PositiveIntegerField(default=0, verbose_name='Импортировано строк')),
+                ('rejected_rows', models.PositiveIntegerField(default=0, verbose_name='Отклонено строк')),
+                ('rejected', models.JSONField(default=list, verbose_name='Отклоненные строки')),
+                ('error_message', models.TextField(blank=True, null=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imports_result', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Импорт транзакций',
+                'verbose_name_plural': 'Импорт транзакций',
+                'db_table': 'imports_result',
+            },
+        ),
+    ]
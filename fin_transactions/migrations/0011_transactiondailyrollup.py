@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0010_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('transaction_type', models.CharField(choices=[('income', 'Доход'), ('expense', 'Расход')], max_length=7, verbose_name='Тип транзакции')),
+                ('category', models.CharField(max_length=100, verbose_name='Категория')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сумма')),
+                ('count', models.IntegerField(default=0, verbose_name='Кол-во транзакций')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Дневная сумма транзакций',
+                'verbose_name_plural': 'Дневные суммы транзакций',
+                'db_table': 'transaction_daily_rollups',
+                'constraints': [models.UniqueConstraint(fields=('user', 'category', 'transaction_type', 'day'), name='transaction_daily_rollups_uniq')],
+            },
+        ),
+        # Дневные суммы существующих транзакций (таблица удаляется при откате)
+        migrations.RunSQL(
+            sql='''
+                INSERT INTO transaction_daily_rollups
+                    (user_id, day, transaction_type, category, total, count)
+                SELECT user_id, (date_transaction AT TIME ZONE 'UTC')::date, transaction_type,
+                       category, SUM(amount), COUNT(*)
+                FROM transactions
+                GROUP BY 1, 2, 3, 4
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:40
+
+from django.db import migrations
+
+# Секционирование таблицы transactions по месяцам date_transaction (UTC).
+# Первичный ключ секционированной таблицы включает ключ секционирования - (id, date_transaction);
+# модель Django по-прежнему использует id, значения которого выдает общая последовательность.
+# Состояние моделей не меняется: индексы и внешний ключ создаются с прежними именами.
+PARTITION_SQL = [
+    'ALTER TABLE transactions RENAME TO transactions_old',
+    # Освобождаем имена последовательности, первичного ключа и индексов
+    'ALTER TABLE transactions_old ALTER COLUMN id DROP IDENTITY',
+    'ALTER INDEX transactions_pkey RENAME TO transactions_old_pkey',
+    '''DROP INDEX transactions_date_id_idx, transactions_user_date_idx,
+                  transactions_budget_cover_idx, transactions_date_brin_idx''',
+    'CREATE SEQUENCE transactions_id_seq',
+    '''
+    CREATE TABLE transactions (
+        id bigint NOT NULL DEFAULT nextval('transactions_id_seq'),
+        amount numeric(10, 2) NOT NULL,
+        transaction_type varchar(7) NOT NULL,
+        category varchar(100) NOT NULL,
+        date_transaction timestamp with time zone NOT NULL,
+        date_modified timestamp with time zone NOT NULL,
+        user_id bigint NOT NULL,
+        CONSTRAINT transactions_pkey PRIMARY KEY (id, date_transaction)
+    ) PARTITION BY RANGE (date_transaction)
+    ''',
+    'ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id',
+    # Транзакции вне созданных месяцев (в т.ч. при отставании задачи создания секций)
+    'CREATE TABLE transactions_default PARTITION OF transactions DEFAULT',
+    # Секции от месяца первой транзакции до текущего месяца + 3, далее их создает
+    # задача create_transaction_partitions
+    '''
+    DO $$
+    DECLARE
+        month timestamp;
+    BEGIN
+        SELECT date_trunc('month', COALESCE(MIN(date_transaction), now()) AT TIME ZONE 'UTC')
+        INTO month FROM transactions_old;
+        WHILE month <= date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months' LOOP
+            EXECUTE format('CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                           'transactions_' || to_char(month, 'YYYY_MM'), month || '+00',
+                           (month + interval '1 month') || '+00');
+            month := month + interval '1 month';
+        END LOOP;
+    END $$
+    ''',
+    '''
+    INSERT INTO transactions (id, amount, transaction_type, category, date_transaction,
+                              date_modified, user_id)
+    SELECT id, amount, transaction_type, category, date_transaction, date_modified, user_id
+    FROM transactions_old
+    ''',
+    "SELECT setval('transactions_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM transactions_old",
+    'DROP TABLE transactions_old',
+    # Индексы и внешний ключ создаются на всех секциях после копирования
+    'CREATE INDEX transactions_date_id_idx ON transactions (date_transaction, id)',
+    'CREATE INDEX transactions_user_date_idx ON transactions (user_id, date_transaction)',
+    '''CREATE INDEX transactions_budget_cover_idx
+       ON transactions (user_id, category, transaction_type, date_transaction) INCLUDE (amount)''',
+    'CREATE INDEX transactions_date_brin_idx ON transactions USING brin (date_transaction)',
+    '''ALTER TABLE transactions ADD CONSTRAINT transactions_user_id_766cc893_fk_users_id
+       FOREIGN KEY (user_id) REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED''',
+]
+
+# Обратное преобразование в обычную таблицу (отсоединенные секции не возвращаются)
+UNPARTITION_SQL = [
+    'CREATE TABLE transactions_partitioned AS SELECT * FROM transactions',
+    'DROP TABLE transactions',
+    '''
+    CREATE TABLE transactions (
+        id bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+        amount numeric(10, 2) NOT NULL,
+        transaction_type varchar(7) NOT NULL,
+        category varchar(100) NOT NULL,
+        date_transaction timestamp with time zone NOT NULL,
+        date_modified timestamp with time zone NOT NULL,
+        user_id bigint NOT NULL,
+        CONSTRAINT transactions_pkey PRIMARY KEY (id)
+    )
+    ''',
+    '''
+    INSERT INTO transactions (id, amount, transaction_type, category, date_transaction,
+                              date_modified, user_id)
+    SELECT id, amount, transaction_type, category, date_transaction, date_modified, user_id
+    FROM transactions_partitioned
+    ''',
+    '''SELECT setval(pg_get_serial_sequence('transactions', 'id'), COALESCE(MAX(id), 0) + 1,
+                     false) FROM transactions''',
+    'DROP TABLE transactions_partitioned',
+    'CREATE INDEX transactions_date_id_idx ON transactions (date_transaction, id)',
+    'CREATE INDEX transactions_user_date_idx ON transactions (user_id, date_transaction)',
+    '''CREATE INDEX transactions_budget_cover_idx
+       ON transactions (user_id, category, transaction_type, date_transaction) INCLUDE (amount)''',
+    'CREATE INDEX transactions_date_brin_idx ON transactions USING brin (date_transaction)',
+    '''ALTER TABLE transactions ADD CONSTRAINT transactions_user_id_766cc893_fk_users_id
+       FOREIGN KEY (user_id) REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED''',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0011_transactiondailyrollup'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=PARTITION_SQL, reverse_sql=UNPARTITION_SQL),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0012_partition_transactions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportsresult',
+            name='cache_key',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='Ключ кэша'),
+        ),
+        migrations.AddIndex(
+            model_name='reportsresult',
+            index=models.Index(fields=['cache_key'], name='reports_result_cache_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reportsresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'in_progress')), fields=('cache_key',), name='reports_result_cache_key_in_progress_uniq'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fin_transactions', '0013_reportsresult_cache_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportsresult',
+            name='started_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Время запуска'),
+            preserve_default=False,
+        ),
+    ]
@@ -1,13 +1,36 @@
 """
 Модуль моделей приложения fin_transactions для хранения информации о транзакциях в БД
 """
+from datetime import datetime
+from typing import (Any,
+                    Optional)
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+class TransactionQuerySet(models.QuerySet['Transaction']):
+    """
+    Выборки транзакций для нагруженных запросов, каждая из которых обслуживается
+    своим индексом (см. Transaction.Meta.indexes)
+    """
+
+    def for_user_period(self, user_id: Any, start: Optional[datetime | str] = None,
+                        end: Optional[datetime | str] = None) -> 'TransactionQuerySet':
+        """
+        Транзакции пользователя за период (либо за все время, если период не указан).
+        Индекс: transactions_user_date_idx
+        """
+        queryset = self.filter(user_id=user_id)
+        if start and end:
+            queryset = queryset.filter(date_transaction__range=[start, end])
+        return queryset
+
+
 class Transaction(models.Model):
     """
     Модель транзакции
@@ -35,7 +58,8 @@ class Transaction(models.Model):
         (EXPENSE, 'Расход'),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE,
+    # Отдельный индекс по FK не нужен: user - первое поле составных индексов (см. Meta.indexes)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False,
                              related_name='transactions', verbose_name='Пользователь')
     amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='сумма')
     transaction_type = models.CharField(max_length=7,
@@ -45,16 +69,27 @@ class Transaction(models.Model):
     date_transaction = models.DateTimeField(verbose_name='Дата транзакции')
     date_modified = models.DateTimeField(auto_now=True)
 
-    objects = models.Manager()
+    objects = TransactionQuerySet.as_manager()
 
     # pylint: disable=too-few-public-methods
     class Meta:
         """
-        Уст. название таблицы в БД, человекочитаемое название модели
+        Уст. название таблицы в БД, человекочитаемое название модели, индексы
         """
         db_table = 'transactions'
         verbose_name = 'Транзакция'
         verbose_name_plural = 'Транзакции'
+        indexes = [
+            # Keyset-пагинация списка транзакций
+            models.Index(fields=['date_transaction', 'id'], name='transactions_date_id_idx'),
+            # Отчеты: транзакции пользователя за период
+            models.Index(fields=['user', 'date_transaction'], name='transactions_user_date_idx'),
+            # Сверка бюджетов: суммы по пользователю, категории и типу за период
+            models.Index(fields=['user', 'category', 'transaction_type', 'date_transaction'],
+                         include=['amount'], name='transactions_budget_cover_idx'),
+            # Диапазонные выборки по дате в таблице, которая в основном дополняется
+            BrinIndex(fields=['date_transaction'], name='transactions_date_brin_idx'),
+        ]
 
     def clean(self) -> None:
         """
@@ -78,6 +113,53 @@ class Transaction(models.Model):
         return f"{transaction_display} - {self.amount:.2f} ({self.category})"
 
 
+class TransactionDailyRollup(models.Model):
+    """
+    Модель дневных сумм транзакций пользователя по типу и категории.
+    Поддерживается в той же транзакции БД, что и запись транзакций (services.rollups),
+    используется вместо чтения исходных транзакций в сводных отчетах.
+
+    Поля:
+        user (ForeignKey): ссылка на пользователя
+        day (DateField): день транзакций (UTC)
+        transaction_type (CharField): тип транзакций
+        category (CharField): категория транзакций
+        total (DecimalField): сумма транзакций за день
+        count (IntegerField): кол-во транзакций за день
+    """
+    # Отдельный индекс по FK не нужен: user - первое поле уникального ограничения
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False,
+                             related_name='daily_rollups', verbose_name='Пользователь')
+    day = models.DateField(verbose_name='День')
+    transaction_type = models.CharField(max_length=7, choices=Transaction.TRANSACTION_TYPE_CHOICES,
+                                        verbose_name='Тип транзакции')
+    category = models.CharField(max_length=100, verbose_name='Категория')
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Сумма')
+    count = models.IntegerField(default=0, verbose_name='Кол-во транзакций')
+
+    objects = models.Manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Уст. название таблицы в БД, человекочитаемое название модели, ограничения
+        """
+        db_table = 'transaction_daily_rollups'
+        verbose_name = 'Дневная сумма транзакций'
+        verbose_name_plural = 'Дневные суммы транзакций'
+        constraints = [
+            # Цель ON CONFLICT и индекс выборок по пользователю, категории и периоду
+            models.UniqueConstraint(fields=['user', 'category', 'transaction_type', 'day'],
+                                    name='transaction_daily_rollups_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление: день, тип, категория и сумма
+        """
+        return f"{self.day} {self.transaction_type}: {self.category} - {self.total:.2f}"
+
+
 class ReportsResult(models.Model):
     """
         Модель Celery задач
@@ -96,6 +178,9 @@ class ReportsResult(models.Model):
             status (CharField): статус выполнения Celery задачи
             error_message (TextField): Сообщение об ошибке при наличии
             created_at (DateField): дата создания. Устанавливается автоматически
+            started_at (DateTimeField): время резервирования задачи. Устанавливается автоматически
+            cache_key (CharField): ключ кэша отчета (см. services.report_cache) - для
+                повторного использования файла и присоединения к выполняющейся задаче
         """
     STATUS_CHOICES = [
         ('in_progress', 'In Progress'),
@@ -112,17 +197,27 @@ class ReportsResult(models.Model):
                               default='in_progress', verbose_name='Статус отчета')
     error_message = models.TextField(blank=True, null=True, verbose_name='Ошибка')
     created_at = models.DateField(auto_now_add=True, verbose_name='Дата создания')
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name='Время запуска')
+    cache_key = models.CharField(max_length=64, blank=True, null=True, verbose_name='Ключ кэша')
 
     objects = models.Manager()
 
     # pylint: disable=too-few-public-methods
     class Meta:
         """
-        Уст. название таблицы в БД, человекочитаемое название модели
+        Уст. название таблицы в БД, человекочитаемое название модели, индексы и ограничения
         """
         db_table = 'reports_result'
         verbose_name = 'Отчет по пользователю'
         verbose_name_plural = 'Отчеты по пользователю'
+        indexes = [
+            models.Index(fields=['cache_key'], name='reports_result_cache_key_idx'),
+        ]
+        constraints = [
+            # Для одного ключа кэша выполняется не больше одной задачи
+            models.UniqueConstraint(fields=['cache_key'], condition=models.Q(status='in_progress'),
+                                    name='reports_result_cache_key_in_progress_uniq'),
+        ]
 
     def __str__(self) -> str:
         """
@@ -130,3 +225,105 @@ class ReportsResult(models.Model):
         относится данная задача.
         """
         return f"Task {self.task_id} for user {self.user}"
+
+
+class ImportsResult(models.Model):
+    """
+        Модель Celery задач импорта транзакций из CSV файла
+
+        Атрибуты:
+            STATUS_CHOICES (list[tuple[str, str]]): список статусов задач
+                -('in_progress', 'In Progress') - в прогрессе
+                - ('completed', 'Completed') - выполнено
+                - ('error', 'Error') - ошибка
+
+        Поля:
+            user (ForeignKey): ссылка на пользователя, которому импортируются транзакции
+            task_id (CharField): id Celery задачи
+            file (CharField): путь к загруженному CSV файлу
+            status (CharField): статус выполнения Celery задачи
+            processed_rows (PositiveIntegerField): кол-во обработанных строк файла
+            imported_rows (PositiveIntegerField): кол-во сохраненных транзакций
+            rejected_rows (PositiveIntegerField): кол-во отклоненных строк
+            rejected (JSONField): номера отклоненных строк и ошибки по ним
+                (не больше IMPORT_MAX_REJECTED_ROWS записей)
+            error_message (TextField): Сообщение об ошибке при наличии
+            created_at (DateTimeField): дата создания. Устанавливается автоматически
+        """
+    STATUS_CHOICES = [
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('error', 'Error'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='imports_result', verbose_name='Пользователь')
+    task_id = models.CharField(max_length=255, unique=True, verbose_name='Celery id')
+    file = models.CharField(max_length=255, verbose_name='Путь к файлу')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES,
+                              default='in_progress', verbose_name='Статус импорта')
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name='Обработано строк')
+    imported_rows = models.PositiveIntegerField(default=0, verbose_name='Импортировано строк')
+    rejected_rows = models.PositiveIntegerField(default=0, verbose_name='Отклонено строк')
+    rejected = models.JSONField(default=list, verbose_name='Отклоненные строки')
+    error_message = models.TextField(blank=True, null=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+
+    objects = models.Manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Уст. название таблицы в БД, человекочитаемое название модели
+        """
+        db_table = 'imports_result'
+        verbose_name = 'Импорт транзакций'
+        verbose_name_plural = 'Импорт транзакций'
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление задачи импорта: id задачи и пользователь
+        """
+        return f"Import {self.task_id} for user {self.user}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Модель ключей идемпотентности запросов создания транзакций
+
+    Поля:
+        user (ForeignKey): ссылка на пользователя, отправившего запрос
+        key (CharField): значение заголовка Idempotency-Key
+        request_hash (CharField): sha256 тела запроса
+        status_code (PositiveSmallIntegerField): код ответа на первый запрос
+        response (JSONField): тело ответа на первый запрос
+        created_at (DateTimeField): дата создания. Устанавливается автоматически
+    """
+    # Отдельный индекс по FK не нужен: user - первое поле уникального ограничения (user, key)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False,
+                             related_name='idempotency_keys', verbose_name='Пользователь')
+    key = models.CharField(max_length=255, verbose_name='Ключ идемпотентности')
+    request_hash = models.CharField(max_length=64, verbose_name='Хеш запроса')
+    status_code = models.PositiveSmallIntegerField(null=True, verbose_name='Код ответа')
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder, verbose_name='Ответ')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+
+    objects = models.Manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """
+        Уст. название таблицы в БД, человекочитаемое название модели, ограничения
+        """
+        db_table = 'idempotency_keys'
+        verbose_name = 'Ключ идемпотентности'
+        verbose_name_plural = 'Ключи идемпотентности'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_keys_user_key_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление ключа: ключ и пользователь
+        """
+        return f"Idempotency key {self.key} for user {self.user}"
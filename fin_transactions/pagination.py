@@ -0,0 +1,99 @@
+"""
+Модуль пагинации списка транзакций
+"""
+from datetime import datetime
+from typing import (Any,
+                    Optional)
+from django.conf import settings
+from django.db.models import (Q,
+                              QuerySet)
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor,
+                                       CursorPagination)
+from rest_framework.request import Request
+from rest_framework.views import APIView
+from .models import Transaction
+
+
+class TransactionCursorPagination(CursorPagination):  # type: ignore
+    """
+    Keyset-пагинация транзакций по паре (date_transaction, id).
+
+    Курсор хранит дату и id граничной записи, поэтому каждая страница (в т.ч. глубокая)
+    выбирается диапазонным условием по индексу (date_transaction, id) без OFFSET и COUNT(*).
+    Порядок стабилен: от новых транзакций к старым, при совпадении даты - по убыванию id.
+    """
+    page_size = settings.TRANSACTIONS_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.TRANSACTIONS_MAX_PAGE_SIZE
+    ordering = ('-date_transaction', '-id')
+
+    has_next: bool
+    has_previous: bool
+    page: list[Any]
+
+    def paginate_queryset(self, queryset: QuerySet[Any], request: Request,
+                          view: Optional[APIView] = None) -> Optional[list[Any]]:
+        # pylint: disable=attribute-defined-outside-init
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        queryset = queryset.order_by(*(('date_transaction', 'id') if reverse else self.ordering))
+
+        if self.cursor and self.cursor.position:
+            date_transaction, pk = self._decode_position(self.cursor.position)
+            if reverse:
+                queryset = queryset.filter(Q(date_transaction__gte=date_transaction) & (
+                    Q(date_transaction__gt=date_transaction) | Q(id__gt=pk)))
+            else:
+                queryset = queryset.filter(Q(date_transaction__lte=date_transaction) & (
+                    Q(date_transaction__lt=date_transaction) | Q(id__lt=pk)))
+
+        # Лишняя запись показывает, есть ли следующая страница, без COUNT(*)
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        position = self._encode_position(self.page[-1])
+        return str(self.encode_cursor(Cursor(offset=0, reverse=False, position=position)))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        position = self._encode_position(self.page[0])
+        return str(self.encode_cursor(Cursor(offset=0, reverse=True, position=position)))
+
+    @staticmethod
+    def _encode_position(instance: Transaction | dict[str, Any]) -> str:
+        """
+        Позиция курсора в виде 'дата_ISO|id'
+        """
+        if isinstance(instance, dict):
+            return f"{instance['date_transaction'].isoformat()}|{instance['id']}"
+        return f'{instance.date_transaction.isoformat()}|{instance.pk}'
+
+    def _decode_position(self, position: str) -> tuple[datetime, int]:
+        """
+        Разбор позиции курсора
+        """
+        try:
+            date_transaction, pk = position.rsplit('|', 1)
+            return datetime.fromisoformat(date_transaction), int(pk)
+        except ValueError as err:
+            raise NotFound(self.invalid_cursor_message) from err
@@ -8,7 +8,10 @@ from datetime import (datetime,
                       timezone)
 from rest_framework import serializers
 from django.utils import timezone as django_timezone
-from .models import Transaction
+from services.fieldsets import RowSerializer
+from users.models import User
+from .models import (Transaction,
+                     ImportsResult)
 
 
 class TransactionsSerializer(serializers.ModelSerializer):  # type: ignore
@@ -63,3 +66,61 @@ class TransactionsSerializer(serializers.ModelSerializer):  # type: ignore
         validated_data['date_transaction'] = validated_data.get('date_transaction',
                                                                 django_timezone.now())
         return cast(Transaction, super().update(instance, validated_data))
+
+
+class TransactionRowSerializer(RowSerializer):
+    """
+    Легкий сериализатор строк списка транзакций (ответ совпадает с TransactionsSerializer)
+    """
+    converters = {
+        'id': None,
+        'user': None,
+        # numeric(10, 2) читается как Decimal с двумя знаками после запятой
+        'amount': str,
+        'transaction_type': None,
+        'category': None,
+        # В TransactionsSerializer дата объявлена как CharField
+        'date_transaction': str,
+    }
+    default_fields = tuple(converters)
+    # Поля курсора пагинации (см. TransactionCursorPagination) и ETag списка
+    # (см. ConditionalListMixin)
+    required_fields = ('id', 'date_transaction', 'date_modified')
+
+
+class CachedUserField(serializers.PrimaryKeyRelatedField):  # type: ignore
+    """
+    Поле пользователя для пакетной валидации: каждый id пользователя загружается из БД
+    только один раз на весь пакет
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._users: Dict[str, User] = {}
+
+    def to_internal_value(self, data: Any) -> User:
+        key = str(data)
+        if key not in self._users:
+            self._users[key] = super().to_internal_value(data)
+        return self._users[key]
+
+
+class TransactionsBatchSerializer(TransactionsSerializer):
+    """
+    Класс сериализатора для пакетного создания транзакций
+    """
+    user = CachedUserField(queryset=User.objects.all())
+
+
+class ImportsResultSerializer(serializers.ModelSerializer):  # type: ignore
+    """
+    Класс сериализатора статуса импорта транзакций
+    """
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Класс настройки сериализатора статуса импорта
+        """
+        model = ImportsResult
+        fields = ['task_id', 'user', 'status', 'processed_rows', 'imported_rows',
+                  'rejected_rows', 'rejected', 'error_message', 'created_at']
@@ -0,0 +1,110 @@
+"""
+Модуль для unit-тестов API потоковой выгрузки транзакций
+"""
+import json
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionExportAPI:
+    """
+    Набор тестов для API потоковой выгрузки транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def transactions(self, user: User) -> list[Transaction]:
+        """
+        Фикстура для создания транзакций
+        """
+        return [
+            Transaction.objects.create(user=user, amount=100, transaction_type=Transaction.INCOME,
+                                       category='Salary', date_transaction='2024-01-01T00:01Z'),
+            Transaction.objects.create(user=user, amount=200, transaction_type=Transaction.EXPENSE,
+                                       category='Groceries', date_transaction='2024-02-02T00:01Z'),
+        ]
+
+    def test_export_csv(self, api_client: APIClient, user: User,
+                        transactions: list[Transaction]) -> None:
+        """
+        Проверка потоковой выгрузки в CSV с колонками отчета
+        """
+        assert transactions is not None
+        response = api_client.get(reverse('transaction-export'), {'user_id': user.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+
+        content = b''.join(response.streaming_content).decode('utf-8')
+        assert content.splitlines() == [
+            'Имя,Фамилия,Email,Сумма,Тип транзакции,Категория,Дата',
+            'John,Doe,john.doe@example.com,100.00,Доход,Salary,2024-01-01 00:01:00+00:00',
+            'John,Doe,john.doe@example.com,200.00,Расход,Groceries,2024-02-02 00:01:00+00:00',
+        ]
+
+    def test_export_ndjson_period(self, api_client: APIClient, user: User,
+                                  transactions: list[Transaction]) -> None:
+        """
+        Проверка выгрузки в NDJSON за период
+        """
+        assert transactions is not None
+        response = api_client.get(reverse('transaction-export'), {
+            'user_id': user.id, 'start_date': '2024-02-01', 'end_date': '2024-02-29',
+            'export_format': 'ndjson'
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == [{
+            'first_name': 'John', 'last_name': 'Doe', 'email': 'john.doe@example.com',
+            'amount': '200.00', 'transaction_type': 'Расход', 'category': 'Groceries',
+            'date_transaction': '2024-02-02 00:01:00+00:00'
+        }]
+
+    def test_export_chunks(self, api_client: APIClient, user: User,
+                           transactions: list[Transaction], settings: object) -> None:
+        """
+        Проверка, что заголовок отдается отдельной порцией, а строки - порциями по chunk_size
+        """
+        assert transactions is not None
+        setattr(settings, 'TRANSACTIONS_EXPORT_CHUNK_SIZE', 1)
+        response = api_client.get(reverse('transaction-export'), {'user_id': user.id})
+
+        assert len(list(response.streaming_content)) == 3
+
+    @pytest.mark.parametrize('params', [
+        {},
+        {'user_id': 'abc'},
+        {'user_id': '1', 'export_format': 'xml'},
+        {'user_id': '1', 'start_date': '01.01.2024'},
+    ])
+    def test_export_invalid_params(self, api_client: APIClient, user: User,
+                                   params: dict[str, str]) -> None:
+        """
+        Проверка ответа на некорректные параметры выгрузки
+        """
+        if params.get('user_id') == '1':
+            params['user_id'] = str(user.id)
+        response = api_client.get(reverse('transaction-export'), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_user_not_found(self, api_client: APIClient) -> None:
+        """
+        Проверка выгрузки по несуществующему пользователю
+        """
+        response = api_client.get(reverse('transaction-export'), {'user_id': 10 ** 9})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
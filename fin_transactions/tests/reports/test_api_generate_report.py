@@ -6,6 +6,7 @@ import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework.response import Response
+from django.test import override_settings
 from django.urls import reverse
 from fin_transactions.models import (Transaction,
                                      ReportsResult)
@@ -84,7 +85,9 @@ class TestReportAPI:
             user_id=user.id,
             start_date='2024-01-01T01:01Z',
             end_date='2024-12-31T01:01Z',
-            send_email=True
+            send_email=True,
+            report_format='csv',
+            mode='rows'
         )
 
         assert mock_generate_transaction_report_delay.called
@@ -129,3 +132,51 @@ class TestReportAPI:
         assert report.task_id == "some-task-id"
         assert report.status == "SUCCESS"
         assert report.report == "Отчет по транзакциям"
+
+    @pytest.mark.parametrize('report_format, send_email', [('xlsx', False), ('parquet', True)])
+    def test_generate_report_invalid_format(self, api_client: APIClient, user: User,
+                                            transaction: Transaction, report_format: str,
+                                            send_email: bool) -> None:
+        """
+        Проверка неподдерживаемого формата отчета и отправки на email не в CSV
+        """
+        assert transaction is not None
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('generate_report'), {
+            'user_id': user.id, 'send_email': send_email, 'format': report_format
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'format' in response.data
+
+    @override_settings(PYARROW_INSTALLED=False)
+    @pytest.mark.parametrize('report_format', ['parquet', 'arrow'])
+    def test_generate_report_columnar_without_pyarrow(self, api_client: APIClient, user: User,
+                                                      transaction: Transaction,
+                                                      report_format: str) -> None:
+        """
+        Проверка отказа в отчете Parquet/Arrow, если пакет pyarrow не установлен
+        """
+        assert transaction is not None
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('generate_report'), {
+            'user_id': user.id, 'format': report_format
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'pyarrow' in response.data['format'][0]
+        assert not ReportsResult.objects.exists()
+
+    @pytest.mark.parametrize('send_email', [False, True])
+    def test_generate_report_invalid_date(self, api_client: APIClient, user: User,
+                                          transaction: Transaction, send_email: bool) -> None:
+        """
+        Проверка отказа до запуска задачи, если дата периода в неверном формате
+        """
+        assert transaction is not None
+        response = self.generate_report(api_client, user, '2024-01-01 10:00',
+                                        '2024-12-31T01:01Z', send_email)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'start_date' in response.data
+        assert not ReportsResult.objects.exists()
@@ -0,0 +1,146 @@
+"""
+Модуль для тестирования кэша файлов отчетов и присоединения к выполняющейся задаче
+"""
+import os
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from fin_transactions.models import (ReportsResult,
+                                     Transaction)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestReportCache:
+    """
+    Набор тестов для повторных запросов отчета с теми же параметрами
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture(autouse=True)
+    def transaction(self, user: User) -> Transaction:
+        """
+        Фикстура для создания транзакции
+        """
+        return Transaction.objects.create(user=user, amount=100,
+                                          transaction_type=Transaction.INCOME,
+                                          category='Salary', date_transaction='2024-10-01T00:00Z')
+
+    @staticmethod
+    def post(api_client: APIClient, user: User, report_format: str = 'csv') -> Response:
+        """
+        Запрос отчета за 2024 год
+        """
+        return api_client.post(reverse('generate_report'),
+                               {'user_id': user.id, 'start_date': '2024-01-01',
+                                'end_date': '2024-12-31', 'format': report_format},
+                               format='json')
+
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async')
+    def test_in_flight_request_attaches_to_task(self, mock_apply: MagicMock,
+                                                api_client: APIClient, user: User) -> None:
+        """
+        Проверка, что повторный запрос во время формирования возвращает id той же задачи
+        """
+        first = self.post(api_client, user)
+        second = self.post(api_client, user)
+
+        assert first.status_code == second.status_code == status.HTTP_202_ACCEPTED
+        assert first.data['task_id'] == second.data['task_id']
+        mock_apply.assert_called_once()
+        assert ReportsResult.objects.filter(user=user).count() == 1
+
+    @override_settings(PYARROW_INSTALLED=True)
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async')
+    def test_other_format_starts_new_task(self, mock_apply: MagicMock, api_client: APIClient,
+                                          user: User) -> None:
+        """
+        Проверка, что отчет в другом формате формируется отдельной задачей
+        """
+        first = self.post(api_client, user)
+        second = self.post(api_client, user, report_format='parquet')
+
+        assert first.data['task_id'] != second.data['task_id']
+        assert mock_apply.call_count == 2
+
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async')
+    def test_completed_report_returned_from_cache(self, mock_apply: MagicMock, tmp_path: Path,
+                                                  api_client: APIClient, user: User) -> None:
+        """
+        Проверка возврата готового файла без новой задачи и сброса кэша при изменении транзакций
+        """
+        with override_settings(MEDIA_ROOT=str(tmp_path)):
+            task_id = self.post(api_client, user).data['task_id']
+            os.makedirs(tmp_path / 'reports')
+            (tmp_path / 'reports' / 'report.csv').write_text('cached')
+            ReportsResult.objects.filter(task_id=task_id).update(status='completed',
+                                                                 report='report.csv')
+
+            cached = self.post(api_client, user)
+
+            assert cached.status_code == status.HTTP_200_OK
+            assert cached.data['task_id'] == task_id
+            assert cached.data['file_url'].endswith('/reports/report.csv')
+            mock_apply.assert_called_once()
+
+            Transaction.objects.create(user=user, amount=5, transaction_type=Transaction.EXPENSE,
+                                       category='Taxi', date_transaction='2024-10-02T00:00Z')
+            changed = self.post(api_client, user)
+
+            assert changed.status_code == status.HTTP_202_ACCEPTED
+            assert changed.data['task_id'] != task_id
+            assert mock_apply.call_count == 2
+
+    @override_settings(REPORT_TASK_STALE_MINUTES=60)
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async')
+    def test_stale_task_is_replaced(self, mock_apply: MagicMock, api_client: APIClient,
+                                    user: User) -> None:
+        """
+        Проверка, что задача, не завершившаяся за REPORT_TASK_STALE_MINUTES, помечается ошибкой
+        и не мешает запуску новой
+        """
+        task_id = self.post(api_client, user).data['task_id']
+        ReportsResult.objects.filter(task_id=task_id).update(
+            started_at=timezone.now() - timedelta(minutes=61))
+
+        response = self.post(api_client, user)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['task_id'] != task_id
+        assert mock_apply.call_count == 2
+        assert ReportsResult.objects.get(task_id=task_id).status == 'error'
+
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async',
+           side_effect=ConnectionError)
+    def test_failed_start_releases_cache_key(self, mock_apply: MagicMock, api_client: APIClient,
+                                             user: User) -> None:
+        """
+        Проверка, что при ошибке постановки задачи в очередь запись помечается ошибкой
+        и следующий запрос запускает задачу заново
+        """
+        with pytest.raises(ConnectionError):
+            self.post(api_client, user)
+
+        assert ReportsResult.objects.get(user=user).status == 'error'
+
+        mock_apply.side_effect = None
+        response = self.post(api_client, user)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert ReportsResult.objects.filter(user=user, status='in_progress').count() == 1
@@ -0,0 +1,174 @@
+"""
+Модуль для тестирования итогового отчета (mode=summary)
+"""
+import json
+import os
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from fin_transactions.celery_tasks import generate_transaction_report
+from fin_transactions.models import Transaction
+from services.rollups import backfill_rollups
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestSummaryReport:
+    """
+    Набор тестов для итогового отчета по месяцам, типам и категориям
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture(autouse=True)
+    def transactions(self, user: User) -> None:
+        """
+        Фикстура для создания транзакций за январь-февраль 2024 и одной вне периода,
+        пересчет дневных сумм
+        """
+        data = [
+            (1000, Transaction.INCOME, 'Salary', '2024-01-05T10:00Z'),
+            (100, Transaction.EXPENSE, 'Food', '2024-01-10T10:00Z'),
+            (50.5, Transaction.EXPENSE, 'Food', '2024-01-31T23:59Z'),
+            (200, Transaction.EXPENSE, 'Taxi', '2024-02-01T00:00Z'),
+            (999, Transaction.EXPENSE, 'Food', '2024-03-01T00:00Z'),
+        ]
+        for amount, transaction_type, category, date in data:
+            Transaction.objects.create(user=user, amount=amount, transaction_type=transaction_type,
+                                       category=category, date_transaction=date)
+        backfill_rollups()
+
+    @staticmethod
+    def post(api_client: APIClient, user: User, **data: object) -> Response:
+        """
+        Запрос итогового отчета за январь-февраль 2024
+        """
+        return api_client.post(reverse('generate_report'),
+                               {'user_id': user.id, 'start_date': '2024-01-01',
+                                'end_date': '2024-02-29', 'mode': 'summary', **data},
+                               format='json')
+
+    def test_summary_json(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка итогов в JSON: группы по месяцам, итоги по типам и баланс
+        """
+        response = self.post(api_client, user, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            'months': [
+                {'month': '2024-01', 'transaction_type': 'expense', 'category': 'Food',
+                 'count': 2, 'total': '150.50'},
+                {'month': '2024-01', 'transaction_type': 'income', 'category': 'Salary',
+                 'count': 1, 'total': '1000.00'},
+                {'month': '2024-02', 'transaction_type': 'expense', 'category': 'Taxi',
+                 'count': 1, 'total': '200.00'},
+            ],
+            'income': '1000.00',
+            'expense': '350.50',
+            'balance': '649.50',
+        }
+
+    def test_summary_partial_days(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка итогов за период с неполными днями на границах: полные дни считаются
+        по дневным суммам, неполные - по транзакциям
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(api_client, user, format='json',
+                                 start_date='2024-01-05T10:00Z', end_date='2024-02-01T00:00Z')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(row['month'], row['category'], row['count'], row['total'])
+                for row in response.data['months']] == [
+            ('2024-01', 'Food', 2, '150.50'), ('2024-01', 'Salary', 1, '1000.00'),
+            ('2024-02', 'Taxi', 1, '200.00')]
+        assert response.data['balance'] == '649.50'
+        assert any('transaction_daily_rollups' in query['sql']
+                   for query in queries.captured_queries)
+
+        response = self.post(api_client, user, format='json',
+                             start_date='2024-01-05T10:01Z', end_date='2024-01-31T23:58Z')
+        assert [(row['category'], row['count']) for row in response.data['months']] == [
+            ('Food', 1)]
+
+    def test_summary_csv(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка итогов в CSV
+        """
+        response = self.post(api_client, user)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        lines = response.content.decode().splitlines()
+        assert lines[0] == 'Месяц,Тип транзакции,Категория,Кол-во,Сумма'
+        assert lines[1] == '2024-01,Расход,Food,2,150.50'
+        assert lines[-3:] == [',Доход,Итого,,1000.00', ',Расход,Итого,,350.50',
+                              ',Баланс,,,649.50']
+
+    @override_settings(REPORT_SUMMARY_SYNC_MAX_ROWS=2)
+    @patch('fin_transactions.celery_tasks.generate_transaction_report.apply_async')
+    def test_summary_over_limit_runs_task(self, mock_apply: MagicMock, api_client: APIClient,
+                                          user: User) -> None:
+        """
+        Проверка запуска задачи Celery, если транзакций больше порога синхронного ответа
+        """
+        response = self.post(api_client, user, format='json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        mock_apply.assert_called_once_with(
+            kwargs={'user_id': user.id, 'start_date': '2024-01-01', 'end_date': '2024-02-29',
+                    'report_format': 'json', 'mode': 'summary', 'send_email': False},
+            task_id=response.data['task_id'])
+
+    def test_summary_invalid_format(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка неподдерживаемого формата итогового отчета
+        """
+        response = self.post(api_client, user, format='parquet')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'format' in response.data
+
+    def test_summary_task_saves_json(self, user: User) -> None:
+        """
+        Проверка сохранения итогового отчета в JSON файл задачей Celery
+        """
+        result = generate_transaction_report.apply(
+            args=[user.id, '2024-01-01', '2024-02-29', False, 'json', 'summary'])
+
+        assert result.status == 'SUCCESS'
+        assert result.result.endswith('.json')
+        with open(result.result, encoding='utf-8') as file:
+            summary = json.load(file)
+        os.remove(result.result)
+        assert summary['balance'] == '649.50'
+        assert len(summary['months']) == 3
+
+    def test_summary_task_timestamp_dates(self, user: User) -> None:
+        """
+        Проверка, что задача Celery принимает даты в формате YYYY-MM-DDTHH:MMZ, как и API
+        """
+        result = generate_transaction_report.apply(
+            args=[user.id, '2024-01-05T10:00Z', '2024-02-01T00:00Z', False, 'json', 'summary'])
+
+        assert result.status == 'SUCCESS'
+        with open(result.result, encoding='utf-8') as file:
+            summary = json.load(file)
+        os.remove(result.result)
+        assert summary['balance'] == '649.50'
+        assert [row['category'] for row in summary['months']] == ['Food', 'Salary', 'Taxi']
@@ -0,0 +1,100 @@
+"""
+Модуль для тестирования сохранения отчета в колоночных форматах Parquet и Arrow IPC
+"""
+import os
+from datetime import (datetime,
+                      timezone)
+from decimal import Decimal
+from typing import (Any,
+                    Iterator)
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fin_transactions.models import Transaction
+from fin_transactions.celery_tasks import generate_transaction_report
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestColumnarReport:
+    """
+    Набор тестов для формирования отчета в Parquet и Arrow IPC
+    """
+
+    @pytest.fixture
+    def transactions(self, user: User) -> list[Transaction]:
+        """
+        Фикстура для создания транзакций
+        """
+        data = [
+            (100, Transaction.INCOME, 'Salary', '2024-01-01T00:01Z'),
+            (200.5, Transaction.EXPENSE, 'Groceries', '2024-01-02T00:01Z'),
+            (15, Transaction.EXPENSE, 'Taxi', '2024-01-03T00:01Z'),
+            (30, Transaction.EXPENSE, 'Groceries', '2024-01-04T00:01Z'),
+        ]
+        return [
+            Transaction.objects.create(user=user, amount=amount, transaction_type=transaction_type,
+                                       category=category, date_transaction=date)
+            for amount, transaction_type, category, date in data
+        ]
+
+    @pytest.fixture
+    def report_path(self) -> Iterator[list[str]]:
+        """
+        Фикстура для удаления созданных файлов отчета
+        """
+        paths: list[str] = []
+        yield paths
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def check_table(table: Any) -> None:
+        """
+        Проверка типов и значений колонок отчета
+        """
+        assert table.schema.field('amount').type == pa.decimal128(10, 2)
+        assert table.schema.field('date_transaction').type == pa.timestamp('us', tz='UTC')
+        assert pa.types.is_dictionary(table.schema.field('category').type)
+        assert pa.types.is_dictionary(table.schema.field('transaction_type').type)
+
+        rows = sorted(table.to_pylist(), key=lambda row: row['date_transaction'])
+        assert [row['amount'] for row in rows] == [Decimal('100.00'), Decimal('200.50'),
+                                                   Decimal('15.00'), Decimal('30.00')]
+        assert [row['category'] for row in rows] == ['Salary', 'Groceries', 'Taxi', 'Groceries']
+        assert rows[0]['transaction_type'] == Transaction.INCOME
+        assert rows[0]['date_transaction'] == datetime(2024, 1, 1, 0, 1, tzinfo=timezone.utc)
+        assert rows[0]['email'] == 'john.doe@example.com'
+
+    def test_generate_report_parquet(self, user: User, transactions: list[Transaction],
+                                     report_path: list[str], settings: object) -> None:
+        """
+        Проверка формирования отчета в Parquet несколькими пакетами
+        """
+        assert transactions is not None
+        setattr(settings, 'REPORT_BATCH_SIZE', 3)
+        result = generate_transaction_report.apply(
+            kwargs={'user_id': user.id, 'report_format': 'parquet'})
+        report_path.append(result.result)
+
+        assert result.result.endswith('.parquet')
+        parquet_file = pq.ParquetFile(result.result)
+        assert parquet_file.metadata.num_row_groups == 2
+        self.check_table(parquet_file.read())
+
+    def test_generate_report_arrow(self, user: User, transactions: list[Transaction],
+                                   report_path: list[str], settings: object) -> None:
+        """
+        Проверка формирования отчета в Arrow IPC: словари категорий дополняются между пакетами
+        """
+        assert transactions is not None
+        setattr(settings, 'REPORT_BATCH_SIZE', 2)
+        result = generate_transaction_report.apply(
+            kwargs={'user_id': user.id, 'report_format': 'arrow'})
+        report_path.append(result.result)
+
+        assert result.result.endswith('.arrow')
+        reader = pa.ipc.open_file(result.result)
+        assert reader.num_record_batches == 2
+        self.check_table(reader.read_all())
@@ -0,0 +1,101 @@
+"""
+Модуль для тестирования параллельного формирования отчета частями (Celery chord)
+"""
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from pathlib import Path
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.test import override_settings
+from fin_transactions.celery_tasks import (generate_report_part,
+                                           generate_transaction_report,
+                                           merge_report_parts,
+                                           save_csv_file)
+from fin_transactions.models import (ReportsResult,
+                                     Transaction)
+from services.date_operations import split_period
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestReportParts:
+    """
+    Набор тестов для разбиения отчета на части и их склейки
+    """
+
+    @pytest.fixture(autouse=True)
+    def transactions(self, user: User) -> None:
+        """
+        Фикстура для создания транзакций каждые 10 дней с января по июнь 2024
+        """
+        start = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        for index in range(18):
+            Transaction.objects.create(user=user, amount=index + 1,
+                                       transaction_type=Transaction.EXPENSE,
+                                       category=f'Category {index % 3}',
+                                       date_transaction=start + timedelta(days=10 * index))
+
+    def test_split_period(self) -> None:
+        """
+        Проверка разбиения периода на смежные полуинтервалы
+        """
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 10, 23, 59, tzinfo=timezone.utc)
+
+        slices = split_period(start, end, timedelta(days=4))
+
+        assert [(a.day, b.day) for a, b in slices] == [(1, 5), (5, 9), (9, 10)]
+        assert slices[-1][1] == end + timedelta(microseconds=1)
+
+    def test_merged_parts_match_single_file(self, tmp_path: Path, user: User) -> None:
+        """
+        Проверка совпадения склеенных частей с отчетом, сформированным одной задачей
+        """
+        transactions = Transaction.objects.for_user_period(user.id)
+        save_csv_file(str(tmp_path / 'single.csv'), user, transactions)
+        report = ReportsResult.objects.create(user=user, task_id='parts-task')
+        slices = split_period(datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+                              datetime(2024, 6, 28, 12, tzinfo=timezone.utc), timedelta(days=30))
+
+        parts = [generate_report_part(user.id, start.isoformat(), end.isoformat(),
+                                      str(tmp_path / f'part_{index}.csv'), index == 0)
+                 for index, (start, end) in enumerate(slices)]
+        merge_report_parts(parts, report.id, str(tmp_path / 'merged.csv'))
+
+        assert (tmp_path / 'merged.csv').read_bytes() == (tmp_path / 'single.csv').read_bytes()
+        assert not any(Path(part).exists() for part in parts)
+        report.refresh_from_db()
+        assert report.status == 'completed'
+        assert report.report == 'merged.csv'
+
+    @override_settings(REPORT_PARALLEL_MIN_ROWS=10, REPORT_SLICE_DAYS=60)
+    @patch('fin_transactions.celery_tasks.chord')
+    def test_large_report_runs_chord(self, mock_chord: MagicMock, tmp_path: Path,
+                                     user: User) -> None:
+        """
+        Проверка запуска частей отчета через chord, если транзакций не меньше порога
+        """
+        with override_settings(MEDIA_ROOT=str(tmp_path)):
+            result = generate_transaction_report.apply(args=[user.id, '2024-01-01',
+                                                             '2024-12-31'])
+
+        assert result.result.endswith('.csv')
+        parts = list(mock_chord.call_args.args[0].tasks)
+        assert len(parts) == 3
+        assert [part.args[4] for part in parts] == [True, False, False]
+        mock_chord.return_value.assert_called_once()
+        assert ReportsResult.objects.get(user=user).status == 'in_progress'
+
+    @override_settings(REPORT_PARALLEL_MIN_ROWS=100)
+    @patch('fin_transactions.celery_tasks.chord')
+    def test_small_report_single_task(self, mock_chord: MagicMock, user: User) -> None:
+        """
+        Проверка формирования отчета одной задачей, если транзакций меньше порога
+        """
+        result = generate_transaction_report.apply(args=[user.id, '2024-01-01', '2024-12-31'])
+
+        mock_chord.assert_not_called()
+        assert ReportsResult.objects.get(user=user).status == 'completed'
+        Path(result.result).unlink()
@@ -0,0 +1,130 @@
+"""
+Модуль для тестирования движка формирования CSV отчета (services.report)
+"""
+import csv
+import os
+from pathlib import Path
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from fin_transactions.models import Transaction
+from services.report import (REPORT_HEADER,
+                             save_csv,
+                             save_csv_copy,
+                             send_report_email)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestReportWriter:
+    """
+    Набор тестов для записи отчета в файл и на email
+    """
+
+    @pytest.fixture
+    def transactions(self, user: User) -> list[Transaction]:
+        """
+        Фикстура для создания транзакций (в т.ч. с запятой и кавычками в категории)
+        """
+        data = [
+            (100, Transaction.INCOME, 'Salary', '2024-01-01T00:01Z'),
+            (200.5, Transaction.EXPENSE, 'Food, "home"', '2024-01-02T10:30Z'),
+            (15, Transaction.EXPENSE, 'Taxi', '2024-01-03T23:59Z'),
+            (30, 'OTHER', 'Groceries', '2024-01-04T00:01Z'),
+            (7.25, Transaction.EXPENSE, 'Taxi', '2024-01-05T12:00Z'),
+        ]
+        return [
+            Transaction.objects.create(user=user, amount=amount, transaction_type=transaction_type,
+                                       category=category, date_transaction=date)
+            for amount, transaction_type, category, date in data
+        ]
+
+    @staticmethod
+    def model_csv(file_path: Path, transactions: list[Transaction]) -> bytes:
+        """
+        CSV отчета, сформированный, как в исходном save_csv: по экземплярам модели
+        (построчное чтение транзакции и ее пользователя), csv.writer с настройками по умолч.
+        """
+        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(REPORT_HEADER)
+            for transaction in Transaction.objects.filter(
+                    id__in=[item.id for item in transactions]).order_by('date_transaction', 'id'):
+                writer.writerow([transaction.user.first_name, transaction.user.last_name,
+                                 transaction.user.email, str(transaction.amount),
+                                 transaction.get_transaction_type_display_custom(),
+                                 transaction.category, str(transaction.date_transaction)])
+        return file_path.read_bytes()
+
+    def test_save_csv_matches_model_rows(self, tmp_path: Path, user: User,
+                                         transactions: list[Transaction]) -> None:
+        """
+        Проверка побайтового совпадения CSV с отчетом, построенным по экземплярам модели
+        """
+        file_path = tmp_path / 'report.csv'
+
+        save_csv(str(file_path), user, Transaction.objects.for_user_period(user.id), 2)
+
+        report = file_path.read_bytes()
+        assert report == self.model_csv(tmp_path / 'expected.csv', transactions)
+        assert report.count(b'\r\n') == len(transactions) + 1
+
+    @pytest.mark.usefixtures('transactions')
+    def test_save_csv_reads_rows_once(self, tmp_path: Path, user: User) -> None:
+        """
+        Проверка, что кол-во запросов не зависит от кол-ва строк (нет запроса на строку)
+        """
+        file_path = os.path.join(tmp_path, 'report.csv')
+
+        with CaptureQueriesContext(connection) as queries:
+            save_csv(file_path, user, Transaction.objects.for_user_period(user.id), 2)
+
+        assert len(queries.captured_queries) == 1
+        assert '"users"' not in queries.captured_queries[0]['sql']
+
+    @pytest.mark.usefixtures('transactions')
+    def test_send_report_email(self, user: User) -> None:
+        """
+        Проверка вложения письма: сумма как строка, дата без времени
+        """
+        mail.outbox = []
+
+        send_report_email(user, Transaction.objects.for_user_period(user.id), 2)
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [user.email]
+        lines = mail.outbox[0].attachments[0][1].splitlines()
+        assert lines[0] == ','.join(REPORT_HEADER)
+        assert lines[1] == 'John,Doe,john.doe@example.com,100.00,Доход,Salary,2024-01-01'
+        assert lines[4] == 'John,Doe,john.doe@example.com,30.00,OTHER,Groceries,2024-01-04'
+        assert len(lines) == 6
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql',
+                        reason='COPY поддерживается только в PostgreSQL')
+    def test_save_csv_copy_matches_save_csv(self, tmp_path: Path, user: User,
+                                            transactions: list[Transaction]) -> None:
+        """
+        Проверка побайтового совпадения CSV, сформированного COPY, с save_csv
+        (дата с микросекундами, пустая фамилия, перевод строки в категории, файл с заголовком
+        и без)
+        """
+        user.last_name = ''
+        user.save()
+        Transaction.objects.create(user=user, amount=1, transaction_type=Transaction.EXPENSE,
+                                   category='Coffee', date_transaction='2024-01-06T08:00:00.5Z')
+        Transaction.objects.create(user=user, amount=2, transaction_type=Transaction.EXPENSE,
+                                   category='Tea\n"green"', date_transaction='2024-01-07T08:00Z')
+        queryset = Transaction.objects.for_user_period(user.id, '2024-01-02T00:00Z',
+                                                       '2024-12-31T00:00Z')
+
+        save_csv(str(tmp_path / 'orm.csv'), user, queryset, 2)
+        save_csv_copy(str(tmp_path / 'copy.csv'), user, queryset)
+        save_csv(str(tmp_path / 'orm_part.csv'), user, queryset, 2, header=False)
+        save_csv_copy(str(tmp_path / 'copy_part.csv'), user, queryset, header=False)
+
+        copy_csv = (tmp_path / 'copy.csv').read_bytes()
+        assert copy_csv == (tmp_path / 'orm.csv').read_bytes()
+        assert (tmp_path / 'copy_part.csv').read_bytes() == (tmp_path / 'orm_part.csv').read_bytes()
+        assert copy_csv.count(b'\r\n') == len(transactions) + 2
+        assert b'"Tea\n""green"""' in copy_csv
@@ -1,11 +1,17 @@
 """
 Модуль для unit-тестов API Transaction
 """
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import (MagicMock,
+                           patch)
 import pytest
 from django.urls import reverse
 from django.utils import timezone as django_timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from budget.models import (Budget,
+                           BudgetCategory)
 from users.models import User
 from fin_transactions.models import Transaction
 
@@ -65,8 +71,8 @@ class TestBudgetAPI:
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['id'] == transaction.id
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['id'] == transaction.id
 
     def test_get_transaction_detail(self, api_client: APIClient, transaction: Transaction,
                                     user: User) -> None:
@@ -101,6 +107,87 @@ class TestBudgetAPI:
         assert response.data['amount'] == '200.00'
         assert response.data['category'] == 'Updated Salary'
 
+    @pytest.mark.parametrize('changes, expected', [
+        ({'amount': '70.00'}, {(1, 'expense', 'Food'): '70.00', (1, 'expense', 'Taxi'): '20.00'}),
+        ({'category': 'Taxi'}, {(1, 'expense', 'Food'): '0.00', (1, 'expense', 'Taxi'): '70.00'}),
+        ({'transaction_type': 'income', 'amount': '10.00'},
+         {(1, 'expense', 'Food'): '0.00', (1, 'expense', 'Taxi'): '20.00',
+          (1, 'income', 'Food'): '10.00'}),
+        ({'date_transaction': '2024-02-10T10:00Z'},
+         {(1, 'expense', 'Food'): '0.00', (1, 'expense', 'Taxi'): '20.00',
+          (2, 'expense', 'Food'): '50.00'}),
+        ({'date_transaction': '2024-03-10T10:00Z'},
+         {(1, 'expense', 'Food'): '0.00', (1, 'expense', 'Taxi'): '20.00'}),
+    ])
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_update_transaction_budget(self, mock_check_budget_limit: MagicMock,
+                                       api_client: APIClient, user: User,
+                                       changes: dict[str, str],
+                                       expected: dict[tuple[int, str, str], str]) -> None:
+        """
+        Проверка переноса вклада транзакции в бюджетах при изменении суммы, категории,
+        типа и даты (в т.ч. в другой бюджет и за пределы бюджетов)
+        """
+        api_client.force_authenticate(user=user)
+        budgets = {month: Budget.objects.create(
+            user=user, start_date=datetime(2024, month, 1, tzinfo=timezone.utc),
+            end_date=datetime(2024, month, 28, 23, 59, tzinfo=timezone.utc)) for month in (1, 2)}
+        BudgetCategory.objects.bulk_create([
+            BudgetCategory(budget=budgets[1], transaction_type='expense', category='Food',
+                           actual=50),
+            BudgetCategory(budget=budgets[1], transaction_type='expense', category='Taxi',
+                           actual=20),
+        ])
+        transaction = Transaction.objects.create(user=user, amount='50.00',
+                                                 transaction_type=Transaction.EXPENSE,
+                                                 category='Food',
+                                                 date_transaction='2024-01-10T10:00Z')
+        data = {'user': user.id, 'amount': '50.00', 'transaction_type': 'expense',
+                'category': 'Food', 'date_transaction': '2024-01-10T10:00Z', **changes}
+
+        response = api_client.put(reverse('transaction-detail-update-delete',
+                                          args=[transaction.id]), data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        month_by_budget = {budget.id: month for month, budget in budgets.items()}
+        assert {(month_by_budget[budget_id], transaction_type, category): str(actual)
+                for budget_id, transaction_type, category, actual in BudgetCategory.objects
+                .values_list('budget_id', 'transaction_type', 'category', 'actual')} == expected
+        assert sorted(call.kwargs['args'][0] for call in mock_check_budget_limit.call_args_list) \
+            == sorted({budgets[month].id for month, _, _ in expected})
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_create_delete_other_user_budget(self, mock_check_budget_limit: MagicMock,
+                                             api_client: APIClient, user: User) -> None:
+        """
+        Проверка, что создание и удаление транзакции другого пользователя изменяют бюджет
+        пользователя транзакции, а не пользователя запроса
+        """
+        other = User.objects.create(username='jane', first_name='Jane', last_name='Doe',
+                                    email='jane.doe@example.com')
+        budgets = {owner.id: Budget.objects.create(
+            user=owner, start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc)) for owner in (user, other)}
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(reverse('transaction-list-create'), {
+            'user': other.id, 'amount': '30.00', 'transaction_type': 'expense',
+            'category': 'Food', 'date_transaction': '2024-01-10T10:00Z'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert list(BudgetCategory.objects.values_list('budget_id', 'actual')) == [
+            (budgets[other.id].id, Decimal('30.00'))]
+
+        response = api_client.delete(reverse('transaction-detail-update-delete',
+                                             args=[response.data['id']]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert list(BudgetCategory.objects.values_list('budget_id', 'actual')) == [
+            (budgets[other.id].id, Decimal('0.00'))]
+        assert {call.kwargs['args'][0] for call in mock_check_budget_limit.call_args_list} \
+            == {budgets[other.id].id}
+
     def test_delete_transaction(self, api_client: APIClient, transaction: Transaction,
                                 user: User) -> None:
         """
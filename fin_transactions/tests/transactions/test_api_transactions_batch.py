@@ -0,0 +1,134 @@
+"""
+Модуль для unit-тестов API пакетного создания транзакций
+"""
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from budget.models import (Budget,
+                           BudgetCategory)
+from fin_transactions.models import Transaction
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionBatchAPI:
+    """
+    Набор тестов для API пакетного создания транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def budgets(self, user: User) -> list[Budget]:
+        """
+        Фикстура для создания двух последовательных бюджетов
+        """
+        january = Budget.objects.create(
+            user=user,
+            start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc)
+        )
+        BudgetCategory.objects.create(budget=january, transaction_type='expense',
+                                      category='Food', forecast=1000)
+        return [
+            january,
+            Budget.objects.create(
+                user=user,
+                start_date=datetime(2024, 2, 1, tzinfo=timezone.utc),
+                end_date=datetime(2024, 2, 29, 23, 59, tzinfo=timezone.utc)
+            ),
+        ]
+
+    @staticmethod
+    def row(user: User, amount: str, category: str, date: str,
+            transaction_type: str = Transaction.EXPENSE) -> dict[str, object]:
+        """
+        Вспомогательная функция для формирования транзакции в пакете
+        """
+        return {
+            'user': user.id,
+            'amount': amount,
+            'transaction_type': transaction_type,
+            'category': category,
+            'date_transaction': date
+        }
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_batch_create(self, mock_check_budget_limit: MagicMock, api_client: APIClient,
+                          user: User, budgets: list[Budget]) -> None:
+        """
+        Проверка пакетного создания и однократного обновления каждого бюджета
+        """
+        data = [
+            self.row(user, '100.00', 'Food', '2024-01-05T10:00Z'),
+            self.row(user, '50.50', 'Food', '2024-01-20T10:00Z'),
+            self.row(user, '30.00', 'Taxi', '2024-01-21T10:00Z'),
+            self.row(user, '200.00', 'Salary', '2024-02-10T10:00Z', Transaction.INCOME),
+            self.row(user, '10.00', 'Food', '2023-12-31T10:00Z'),
+        ]
+        response = api_client.post(reverse('transaction-batch-create'), data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 5
+        assert all(item['id'] for item in response.data)
+        assert Transaction.objects.count() == 5
+
+        january, february = budgets
+        january.refresh_from_db()
+        february.refresh_from_db()
+        assert january.budget['expense']['Food']['actual'] == 150.5
+        assert january.budget['expense']['Taxi']['actual'] == 30.0
+        assert february.budget['income']['Salary']['actual'] == 200.0
+
+        assert sorted(call.kwargs['args'][0] for call in mock_check_budget_limit.call_args_list) \
+            == sorted([january.id, february.id])
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_batch_create_invalid_amount(self, mock_check_budget_limit: MagicMock,
+                                         api_client: APIClient, user: User) -> None:
+        """
+        Проверка, что при ошибке в одной транзакции пакет не сохраняется
+        """
+        data = [
+            self.row(user, '100.00', 'Food', '2024-01-05T10:00Z'),
+            self.row(user, '-5', 'Food', '2024-01-06T10:00Z'),
+        ]
+        response = api_client.post(reverse('transaction-batch-create'), data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert 'amount' in response.data[1]
+        assert Transaction.objects.count() == 0
+        mock_check_budget_limit.assert_not_called()
+
+    @pytest.mark.parametrize('body, indexes', [([1, 2], '0, 1'), (['x'], '0'), ([{}, None], '1')])
+    def test_batch_create_not_objects(self, api_client: APIClient, body: list[Any],
+                                      indexes: str) -> None:
+        """
+        Проверка ответа 400 с индексами элементов массива, не являющихся объектами
+        """
+        response = api_client.post(reverse('transaction-batch-create'), body, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['detail'].endswith(f'индексы: {indexes}.')
+        assert Transaction.objects.count() == 0
+
+    def test_batch_create_not_list(self, api_client: APIClient) -> None:
+        """
+        Проверка, что тело запроса должно быть массивом
+        """
+        response = api_client.post(reverse('transaction-batch-create'), {}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
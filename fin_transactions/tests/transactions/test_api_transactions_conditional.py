@@ -0,0 +1,120 @@
+"""
+Модуль для unit-тестов условных запросов (ETag) к API транзакций
+"""
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionConditionalAPI:
+    """
+    Набор тестов для ETag, If-None-Match и If-Match
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def transaction(self, user: User) -> Transaction:
+        """
+        Фикстура для создания транзакции
+        """
+        return Transaction.objects.create(user=user, amount='100.00',
+                                          transaction_type=Transaction.INCOME,
+                                          category='Salary',
+                                          date_transaction='2024-01-01T00:01Z')
+
+    def test_detail_not_modified(self, api_client: APIClient,
+                                 transaction: Transaction) -> None:
+        """
+        Проверка, что 304 отдается одним запросом к БД без сериализации
+        """
+        url = reverse('transaction-detail-update-delete', args=[transaction.id])
+        etag = api_client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries, \
+                patch('fin_transactions.views.TransactionsSerializer.to_representation'
+                      ) as mock_representation:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert len(queries.captured_queries) == 1
+        mock_representation.assert_not_called()
+
+    @patch('fin_transactions.views.update_budget_delta')
+    def test_update_if_match(self, mock_update_budget: MagicMock, api_client: APIClient,
+                             user: User, transaction: Transaction) -> None:
+        """
+        Проверка PUT с устаревшим If-Match
+        """
+        url = reverse('transaction-detail-update-delete', args=[transaction.id])
+        etag = api_client.get(url)['ETag']
+        Transaction.objects.get(id=transaction.id).save()
+
+        response = api_client.put(url, {
+            'user': user.id, 'amount': '150.00', 'transaction_type': Transaction.INCOME,
+            'category': 'Salary', 'date_transaction': '2024-01-01T00:01Z'
+        }, format='json', HTTP_IF_MATCH=etag)
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        transaction.refresh_from_db()
+        assert str(transaction.amount) == '100.00'
+        mock_update_budget.assert_not_called()
+
+    def test_list_not_modified(self, api_client: APIClient, user: User,
+                               transaction: Transaction) -> None:
+        """
+        Проверка условного запроса списка: ETag зависит от параметров и меняется
+        при добавлении транзакции
+        """
+        url = reverse('transaction-list-create')
+        etag = api_client.get(url, {'category': 'Salary'})['ETag']
+
+        assert api_client.get(url, {'category': 'Salary'},
+                              HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        assert api_client.get(url, {'category': 'Food'},
+                              HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+        Transaction.objects.create(user=user, amount='5.00', transaction_type=transaction.EXPENSE,
+                                   category='Salary', date_transaction='2023-01-01T00:01Z')
+        assert api_client.get(url, {'category': 'Salary'},
+                              HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_list_etag_from_page_rows(self, api_client: APIClient,
+                                      transaction: Transaction) -> None:
+        """
+        Проверка ETag списка по строкам страницы: без If-None-Match - без дополнительных
+        запросов, с совпадающим If-None-Match - 304 одним запросом, изменение транзакции
+        страницы меняет ETag
+        """
+        url = reverse('transaction-list-create')
+        with CaptureQueriesContext(connection) as queries:
+            etag = api_client.get(url)['ETag']
+        assert len(queries.captured_queries) == 1
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(queries.captured_queries) == 1
+        assert '"amount"' not in queries.captured_queries[0]['sql']
+
+        transaction.amount = '150.00'
+        transaction.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
@@ -0,0 +1,76 @@
+"""
+Модуль для unit-тестов выборочных полей (fields=) списка транзакций
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from fin_transactions.serializers import TransactionsSerializer
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionFieldsAPI:
+    """
+    Набор тестов для быстрого чтения списка транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def transactions(self, user: User) -> list[Transaction]:
+        """
+        Фикстура для создания транзакций
+        """
+        return [
+            Transaction.objects.create(user=user, amount=amount,
+                                       transaction_type=Transaction.EXPENSE,
+                                       category=f'Category {index}',
+                                       date_transaction=f'2024-01-0{index + 1}T10:30Z')
+            for index, amount in enumerate(['100', '20.5', '3.07'])
+        ]
+
+    def test_default_fields(self, api_client: APIClient,
+                            transactions: list[Transaction]) -> None:
+        """
+        Проверка, что без параметра fields ответ совпадает с TransactionsSerializer
+        """
+        response = api_client.get(reverse('transaction-list-create'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert transactions is not None
+        expected = TransactionsSerializer(Transaction.objects.order_by('-date_transaction'),
+                                          many=True).data
+        assert response.json()['results'] == [dict(item) for item in expected]
+
+    def test_sparse_fields_pagination(self, api_client: APIClient,
+                                      transactions: list[Transaction]) -> None:
+        """
+        Проверка выборочных полей на нескольких страницах курсорной пагинации
+        """
+        assert transactions is not None
+        response = api_client.get(reverse('transaction-list-create'),
+                                  {'fields': 'amount,category', 'page_size': 2})
+        assert response.data['results'] == [
+            {'amount': '3.07', 'category': 'Category 2'},
+            {'amount': '20.50', 'category': 'Category 1'},
+        ]
+
+        response = api_client.get(response.data['next'])
+        assert response.data['results'] == [{'amount': '100.00', 'category': 'Category 0'}]
+
+    @pytest.mark.parametrize('fields', ['amount,password', ','])
+    def test_invalid_fields(self, api_client: APIClient, fields: str) -> None:
+        """
+        Проверка ответа на неизвестные поля
+        """
+        response = api_client.get(reverse('transaction-list-create'), {'fields': fields})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
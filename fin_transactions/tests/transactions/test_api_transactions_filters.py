@@ -0,0 +1,141 @@
+"""
+Модуль для unit-тестов фильтрации списка транзакций
+"""
+from typing import Any
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionFilters:
+    """
+    Набор тестов для фильтрации списка транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def other_user(self) -> User:
+        """
+        Фикстура для создания второго пользователя
+        """
+        return User.objects.create(first_name='Jane', last_name='Doe',
+                                   email='jane.doe@example.com', username='jane')
+
+    @pytest.fixture
+    def transactions(self, user: User, other_user: User) -> dict[str, Transaction]:
+        """
+        Фикстура для создания транзакций двух пользователей
+        """
+        data = {
+            'salary': (user, 1000, Transaction.INCOME, 'Salary', '2024-01-10T09:00Z'),
+            'food': (user, 50, Transaction.EXPENSE, 'Food', '2024-01-15T12:00Z'),
+            'taxi': (user, 20, Transaction.EXPENSE, 'Taxi', '2024-02-01T00:00Z'),
+            'rent': (user, 500, Transaction.EXPENSE, 'Rent', '2024-02-28T23:59Z'),
+            'other': (other_user, 70, Transaction.EXPENSE, 'Food', '2024-01-20T10:00Z'),
+        }
+        return {
+            name: Transaction.objects.create(user=owner, amount=amount,
+                                             transaction_type=transaction_type,
+                                             category=category, date_transaction=date)
+            for name, (owner, amount, transaction_type, category, date) in data.items()
+        }
+
+    @staticmethod
+    def get_ids(api_client: APIClient, params: dict[str, Any]) -> set[int]:
+        """
+        Вспомогательная функция: id транзакций в ответе на запрос с фильтрами
+        """
+        response = api_client.get(reverse('transaction-list-create'), params)
+        assert response.status_code == status.HTTP_200_OK
+        return {item['id'] for item in response.data['results']}
+
+    @staticmethod
+    def ids(transactions: dict[str, Transaction], *names: str) -> set[int]:
+        """
+        Вспомогательная функция: id транзакций по их названиям в фикстуре
+        """
+        return {transactions[name].id for name in names}
+
+    def test_filter_by_user(self, api_client: APIClient, user: User,
+                            transactions: dict[str, Transaction]) -> None:
+        """
+        Проверка фильтрации по пользователю
+        """
+        assert self.get_ids(api_client, {'user': user.id}) == \
+            self.ids(transactions, 'salary', 'food', 'taxi', 'rent')
+
+    def test_filter_by_period(self, api_client: APIClient,
+                              transactions: dict[str, Transaction]) -> None:
+        """
+        Проверка фильтрации по периоду, дата окончания включительно
+        """
+        params = {'date_from': '2024-01-15', 'date_to': '2024-02-28'}
+        assert self.get_ids(api_client, params) == \
+            self.ids(transactions, 'food', 'taxi', 'rent', 'other')
+
+        params = {'date_from': '2024-01-15T12:01Z', 'date_to': '2024-02-01T00:00Z'}
+        assert self.get_ids(api_client, params) == self.ids(transactions, 'taxi', 'other')
+
+    def test_filter_by_type_and_category(self, api_client: APIClient, user: User,
+                                         transactions: dict[str, Transaction]) -> None:
+        """
+        Проверка фильтрации по типу и категории (одной и списку)
+        """
+        assert self.get_ids(api_client, {'transaction_type': Transaction.INCOME}) == \
+            self.ids(transactions, 'salary')
+        assert self.get_ids(api_client, {'category': 'Food', 'user': user.id}) == \
+            self.ids(transactions, 'food')
+        assert self.get_ids(api_client, {'category': ['Food', 'Taxi']}) == \
+            self.ids(transactions, 'food', 'taxi', 'other')
+
+    def test_filter_by_amount(self, api_client: APIClient,
+                              transactions: dict[str, Transaction]) -> None:
+        """
+        Проверка фильтрации по диапазону суммы
+        """
+        assert self.get_ids(api_client, {'amount_min': '50', 'amount_max': '500'}) == \
+            self.ids(transactions, 'food', 'rent', 'other')
+
+    def test_filters_with_pagination(self, api_client: APIClient, user: User,
+                                     transactions: dict[str, Transaction]) -> None:
+        """
+        Проверка, что фильтры сохраняются при переходе по страницам
+        """
+        response = api_client.get(reverse('transaction-list-create'),
+                                  {'user': user.id, 'transaction_type': Transaction.EXPENSE,
+                                   'page_size': 2})
+        ids = [item['id'] for item in response.data['results']]
+        response = api_client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+
+        assert response.data['next'] is None
+        assert ids == [transactions['rent'].id, transactions['taxi'].id,
+                       transactions['food'].id]
+
+    @pytest.mark.parametrize('params', [
+        {'user': 'abc'},
+        {'date_from': '15.01.2024'},
+        {'date_from': '2024-02-01', 'date_to': '2024-01-01'},
+        {'transaction_type': 'transfer'},
+        {'amount_min': 'many'},
+    ])
+    def test_invalid_filters(self, api_client: APIClient, params: dict[str, str]) -> None:
+        """
+        Проверка ответа на некорректные значения фильтров
+        """
+        response = api_client.get(reverse('transaction-list-create'), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) <= {'user', 'date_from', 'date_to',
+                                      'transaction_type', 'amount_min'}
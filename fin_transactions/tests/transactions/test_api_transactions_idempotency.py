@@ -0,0 +1,119 @@
+"""
+Модуль для unit-тестов заголовка Idempotency-Key при создании транзакции
+"""
+from datetime import timedelta
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.urls import reverse
+from django.utils import timezone as django_timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import (Transaction,
+                                     IdempotencyKey)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionIdempotencyAPI:
+    """
+    Набор тестов для повторных запросов создания транзакции
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @staticmethod
+    def data(user: User, amount: str = '150.00') -> dict[str, object]:
+        """
+        Вспомогательная функция для формирования тела запроса
+        """
+        return {
+            'user': user.id,
+            'amount': amount,
+            'transaction_type': Transaction.INCOME,
+            'category': 'Bonus',
+            'date_transaction': '2023-10-10T10:00Z'
+        }
+
+    @patch('fin_transactions.views.update_budget')
+    def test_replay(self, mock_update_budget: MagicMock, api_client: APIClient,
+                    user: User) -> None:
+        """
+        Проверка, что повтор с тем же ключом возвращает сохраненный ответ без создания транзакции
+        """
+        url = reverse('transaction-list-create')
+        first = api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        second = api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k1')
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert second.data == first.data
+        assert second['Idempotent-Replayed'] == 'true'
+        assert Transaction.objects.count() == 1
+        mock_update_budget.assert_called_once()
+
+    @patch('fin_transactions.views.update_budget')
+    def test_other_keys(self, mock_update_budget: MagicMock, api_client: APIClient,
+                        user: User) -> None:
+        """
+        Проверка, что запросы с разными ключами и без ключа обрабатываются отдельно
+        """
+        url = reverse('transaction-list-create')
+        api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k2')
+        api_client.post(url, self.data(user), format='json')
+
+        assert Transaction.objects.count() == 3
+        assert mock_update_budget.call_count == 3
+
+    @patch('fin_transactions.views.update_budget')
+    def test_key_with_other_body(self, mock_update_budget: MagicMock, api_client: APIClient,
+                                 user: User) -> None:
+        """
+        Проверка ответа на повтор ключа с другим телом запроса
+        """
+        url = reverse('transaction-list-create')
+        api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        response = api_client.post(url, self.data(user, '200.00'), format='json',
+                                   HTTP_IDEMPOTENCY_KEY='k1')
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert Transaction.objects.count() == 1
+        mock_update_budget.assert_called_once()
+
+    @patch('fin_transactions.views.update_budget')
+    def test_expired_key(self, mock_update_budget: MagicMock, api_client: APIClient,
+                         user: User, settings: object) -> None:
+        """
+        Проверка, что просроченный ключ удаляется и запрос обрабатывается заново
+        """
+        setattr(settings, 'IDEMPOTENCY_KEY_TTL', 60)
+        url = reverse('transaction-list-create')
+        api_client.post(url, self.data(user), format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        IdempotencyKey.objects.update(created_at=django_timezone.now() - timedelta(seconds=61))
+
+        response = api_client.post(url, self.data(user), format='json',
+                                   HTTP_IDEMPOTENCY_KEY='k1')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert 'Idempotent-Replayed' not in response
+        assert Transaction.objects.count() == 2
+        assert IdempotencyKey.objects.count() == 1
+        assert mock_update_budget.call_count == 2
+
+    def test_failed_request_not_stored(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка, что ключ запроса с ошибкой не сохраняется
+        """
+        url = reverse('transaction-list-create')
+        response = api_client.post(url, self.data(user, '-1'), format='json',
+                                   HTTP_IDEMPOTENCY_KEY='k1')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not IdempotencyKey.objects.exists()
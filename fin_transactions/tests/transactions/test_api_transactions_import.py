@@ -0,0 +1,126 @@
+"""
+Модуль для unit-тестов API импорта транзакций из CSV файла
+"""
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from budget.models import Budget
+from fin_transactions.celery_tasks import import_transactions
+from fin_transactions.models import (Transaction,
+                                     ImportsResult)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionImportAPI:
+    """
+    Набор тестов для API импорта транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings: object, tmp_path: Path) -> Path:
+        """
+        Фикстура для сохранения загруженных файлов во временную папку
+        """
+        setattr(settings, 'MEDIA_ROOT', str(tmp_path))
+        return tmp_path
+
+    @staticmethod
+    def upload(api_client: APIClient, content: str) -> tuple[ImportsResult, MagicMock]:
+        """
+        Вспомогательная функция загрузки файла с подменой постановки задачи в очередь
+        """
+        csv_file = SimpleUploadedFile('transactions.csv', content.encode('utf-8'),
+                                      content_type='text/csv')
+        with patch('fin_transactions.views.import_transactions.apply_async') as mock_apply:
+            response = api_client.post(reverse('transaction-import'), {'file': csv_file},
+                                       format='multipart')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        return ImportsResult.objects.get(task_id=response.data['task_id']), mock_apply
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_import(self, mock_check_budget_limit: MagicMock, api_client: APIClient,
+                    user: User, settings: object) -> None:
+        """
+        Проверка импорта порциями: корректные строки сохраняются, ошибочные - отклоняются
+        """
+        setattr(settings, 'IMPORT_CHUNK_SIZE', 2)
+        budget = Budget.objects.create(
+            user=user,
+            start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc)
+        )
+        task, mock_apply = self.upload(api_client, (
+            'amount,transaction_type,category,date_transaction\n'
+            '100.00,expense,Food,2024-01-05T10:00Z\n'
+            '-5,expense,Food,2024-01-06T10:00Z\n'
+            '50.50,expense,Food,2024-01-07T10:00Z\n'
+            '10,gift,Food,2024-01-08T10:00Z\n'
+            '200,income,Salary,05.01.2024\n'
+        ))
+        mock_apply.assert_called_once_with(args=[task.id], task_id=task.task_id)
+        assert task.status == 'in_progress'
+
+        import_transactions.apply(args=[task.id])
+
+        response = api_client.get(reverse('transaction-import-status', args=[task.task_id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'completed'
+        assert response.data['processed_rows'] == 5
+        assert response.data['imported_rows'] == 2
+        assert response.data['rejected_rows'] == 3
+        assert [item['line'] for item in response.data['rejected']] == [3, 5, 6]
+        assert 'amount' in response.data['rejected'][0]['errors']
+        assert 'transaction_type' in response.data['rejected'][1]['errors']
+
+        assert Transaction.objects.filter(user=user).count() == 2
+        budget.refresh_from_db()
+        assert budget.budget['expense']['Food']['actual'] == 150.5
+        # Проверки по порциям одного импорта объединяются в одну
+        mock_check_budget_limit.assert_called_once()
+        assert mock_check_budget_limit.call_args.kwargs['args'] == [budget.id]
+        assert not os.path.exists(task.file)
+
+    def test_import_missing_columns(self, api_client: APIClient, user: User) -> None:
+        """
+        Проверка ошибки импорта при отсутствии обязательных колонок
+        """
+        task, _ = self.upload(api_client, 'amount,category\n100,Food\n')
+
+        import_transactions.apply(args=[task.id])
+
+        task.refresh_from_db()
+        assert task.status == 'error'
+        assert 'transaction_type' in str(task.error_message)
+        assert not Transaction.objects.filter(user=user).exists()
+
+    def test_import_without_file(self, api_client: APIClient) -> None:
+        """
+        Проверка, что файл обязателен
+        """
+        response = api_client.post(reverse('transaction-import'), {}, format='multipart')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_import_status_not_found(self, api_client: APIClient) -> None:
+        """
+        Проверка статуса несуществующего импорта
+        """
+        response = api_client.get(reverse('transaction-import-status', args=['unknown']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,118 @@
+"""
+Модуль для unit-тестов keyset-пагинации списка транзакций
+"""
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from fin_transactions.pagination import TransactionCursorPagination
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionPagination:
+    """
+    Набор тестов для пагинации списка транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def transactions(self, user: User) -> list[Transaction]:
+        """
+        Фикстура для создания транзакций, часть из которых с одинаковой датой
+        """
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return [
+            Transaction.objects.create(
+                user=user,
+                amount=10 + i,
+                transaction_type=Transaction.EXPENSE,
+                category='Food',
+                date_transaction=start + timedelta(days=i // 2)
+            )
+            for i in range(7)
+        ]
+
+    @staticmethod
+    def expected_ids(transactions: list[Transaction]) -> list[int]:
+        """
+        Ожидаемый порядок: по убыванию (date_transaction, id)
+        """
+        return [transaction.id for transaction in sorted(
+            transactions, key=lambda t: (t.date_transaction, t.id), reverse=True)]
+
+    def test_walk_forward_and_back(self, api_client: APIClient,
+                                   transactions: list[Transaction]) -> None:
+        """
+        Проверка обхода всех страниц вперед и назад без пропусков и повторов
+        """
+        url: str | None = f"{reverse('transaction-list-create')}?page_size=3"
+        pages: list[list[int]] = []
+        last_response = None
+        while url:
+            last_response = api_client.get(url)
+            assert last_response.status_code == status.HTTP_200_OK
+            pages.append([item['id'] for item in last_response.data['results']])
+            url = last_response.data['next']
+
+        assert [pk for page in pages for pk in page] == self.expected_ids(transactions)
+        assert [len(page) for page in pages] == [3, 3, 1]
+
+        assert last_response is not None
+        previous = api_client.get(last_response.data['previous'])
+        assert [item['id'] for item in previous.data['results']] == pages[1]
+        first = api_client.get(previous.data['previous'])
+        assert [item['id'] for item in first.data['results']] == pages[0]
+        assert first.data['previous'] is None
+
+    def test_max_page_size(self, api_client: APIClient, transactions: list[Transaction],
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Проверка ограничения размера страницы сверху
+        """
+        assert transactions is not None
+        monkeypatch.setattr(TransactionCursorPagination, 'max_page_size', 5)
+        response = api_client.get(reverse('transaction-list-create'), {'page_size': 10 ** 6})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 5
+        assert response.data['next'] is not None
+
+    def test_no_count_and_offset(self, api_client: APIClient,
+                                 transactions: list[Transaction]) -> None:
+        """
+        Проверка, что страница выбирается одним запросом без COUNT(*) и OFFSET
+        """
+        first = api_client.get(reverse('transaction-list-create'), {'page_size': 2})
+        next_url = first.data['next']
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(next_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert len(queries.captured_queries) == 1
+        sql = queries.captured_queries[0]['sql'].upper()
+        assert 'COUNT(' not in sql
+        assert 'OFFSET' not in sql
+        assert transactions is not None
+
+    def test_invalid_cursor(self, api_client: APIClient) -> None:
+        """
+        Проверка ответа на некорректный курсор
+        """
+        response = api_client.get(reverse('transaction-list-create'), {'cursor': 'broken'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
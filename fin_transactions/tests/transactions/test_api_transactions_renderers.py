@@ -0,0 +1,111 @@
+"""
+Модуль для unit-тестов рендереров и парсеров API (orjson и MessagePack)
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import (MagicMock,
+                           patch)
+import msgpack
+import orjson
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from fin_transactions.models import Transaction
+from services.renderers import ORJSONRenderer
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionRenderersAPI:
+    """
+    Набор тестов для форматов тела запроса и ответа
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def transaction(self, user: User) -> Transaction:
+        """
+        Фикстура для создания транзакции
+        """
+        return Transaction.objects.create(user=user, amount='100.50',
+                                          transaction_type=Transaction.INCOME,
+                                          category='Зарплата',
+                                          date_transaction='2024-01-01T00:01Z')
+
+    def test_orjson_same_as_json_renderer(self) -> None:
+        """
+        Проверка, что ORJSONRenderer формирует тот же JSON, что и JSONRenderer
+        """
+        data = {
+            'amount': Decimal('10.25'),
+            'date': datetime(2024, 1, 1, 10, 30, 0, 123456, tzinfo=timezone.utc),
+            'text': 'Категория\u2028',
+            'items': [1, 2.5, None, True],
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert orjson.loads(ORJSONRenderer().render(data))['amount'] == '10.25'
+
+    def test_json_list(self, api_client: APIClient, transaction: Transaction) -> None:
+        """
+        Проверка ответа списка в JSON
+        """
+        response = api_client.get(reverse('transaction-list-create'))
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.json()['results'][0]['id'] == transaction.id
+        assert response.content == JSONRenderer().render(response.data)
+
+    def test_msgpack_list(self, api_client: APIClient, transaction: Transaction) -> None:
+        """
+        Проверка выбора MessagePack заголовком Accept
+        """
+        response = api_client.get(reverse('transaction-list-create'),
+                                  HTTP_ACCEPT='application/msgpack')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/msgpack'
+        data = msgpack.unpackb(response.content)
+        assert data['results'][0] == {
+            'id': transaction.id, 'user': transaction.user_id, 'amount': '100.50',
+            'transaction_type': 'income', 'category': 'Зарплата',
+            'date_transaction': '2024-01-01 00:01:00+00:00'
+        }
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_msgpack_batch(self, mock_check_budget_limit: MagicMock, api_client: APIClient,
+                           user: User) -> None:
+        """
+        Проверка пакетного создания транзакций с телом запроса в MessagePack
+        """
+        body = msgpack.packb([{
+            'user': user.id, 'amount': '15.00', 'transaction_type': 'expense',
+            'category': 'Food', 'date_transaction': '2024-01-05T10:00Z'
+        }])
+        response = api_client.post(reverse('transaction-batch-create'), body,
+                                   content_type='application/msgpack')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Transaction.objects.get().category == 'Food'
+        mock_check_budget_limit.assert_not_called()
+
+    @pytest.mark.parametrize('content_type, body', [
+        ('application/json', b'{"amount": '),
+        ('application/msgpack', b'\xc1'),
+    ])
+    def test_parse_error(self, api_client: APIClient, content_type: str, body: bytes) -> None:
+        """
+        Проверка ответа 400 на некорректное тело запроса
+        """
+        response = api_client.post(reverse('transaction-batch-create'), body,
+                                   content_type=content_type)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
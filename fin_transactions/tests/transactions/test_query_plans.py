@@ -0,0 +1,146 @@
+"""
+Модуль регрессионных тестов планов запросов (EXPLAIN) для нагруженных выборок транзакций.
+
+Таблица в тестах маленькая, поэтому последовательное сканирование отключается
+(enable_seqscan = off): если подходящего индекса нет, планировщик все равно выберет Seq Scan
+и тест упадет. Таблица секционирована по месяцам: в плане указываются индексы секций,
+созданные по индексам таблицы transactions.
+"""
+from datetime import (datetime,
+                      timedelta,
+                      timezone)
+from typing import Any
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import QueryDict
+from fin_transactions.filters import filter_transactions
+from fin_transactions.models import Transaction
+from services.partitions import ensure_partitions
+from users.models import User
+
+pytestmark = pytest.mark.skipif(connection.vendor != 'postgresql',
+                                reason='Планы запросов проверяются только на PostgreSQL')
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 12, 31, 23, 59, tzinfo=timezone.utc)
+
+
+def explain(queryset: QuerySet[Any], *disabled: str) -> str:
+    """
+    План запроса с отключенными способами сканирования
+    """
+    with connection.cursor() as cursor:
+        for setting in ('enable_seqscan', *disabled):
+            cursor.execute(f'SET LOCAL {setting} = off')
+    return str(queryset.explain())
+
+
+def uses_index(plan: str, index: str) -> bool:
+    """
+    Используется ли в плане индекс секции, созданный по индексу index таблицы transactions
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT inhrelid::regclass::text FROM pg_inherits '
+                       'WHERE inhparent = %s::regclass', [index])
+        return any(f' {name} ' in plan for name, in cursor.fetchall())
+
+
+@pytest.mark.django_db
+class TestTransactionQueryPlans:
+    """
+    Набор тестов, проверяющих использование индексов таблицы транзакций
+    """
+
+    @pytest.fixture(autouse=True)
+    def transactions(self, user: User) -> None:
+        """
+        Фикстура для наполнения таблицы транзакциями нескольких пользователей (по секциям
+        месяцев 2024 года) и сбора статистики
+        """
+        ensure_partitions(START.date(), END.date())
+        users = [user] + [
+            User.objects.create(first_name='Other', last_name=str(i),
+                                email=f'other{i}@example.com', username=f'other{i}')
+            for i in range(19)
+        ]
+        Transaction.objects.bulk_create(
+            Transaction(user=users[i % len(users)], amount=i + 1,
+                        transaction_type=(Transaction.INCOME if i % 3 == 0
+                                          else Transaction.EXPENSE),
+                        category=f'Category {i % 10}',
+                        date_transaction=START + timedelta(minutes=15 * i))
+            for i in range(8000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE transactions')
+
+    def test_category_sum_uses_covering_index(self, user: User) -> None:
+        """
+        Сумма по категории за период (сверка бюджетов) читается только из покрывающего индекса
+        """
+        queryset = Transaction.objects.filter(
+            user_id=user.id, category='Category 1', transaction_type=Transaction.EXPENSE,
+            date_transaction__range=[START, END]).values('amount')
+        plan = explain(queryset, 'enable_bitmapscan')
+
+        assert 'Seq Scan' not in plan
+        assert 'Index Only Scan using' in plan
+        assert uses_index(plan, 'transactions_budget_cover_idx')
+
+    def test_report_uses_user_date_index(self, user: User) -> None:
+        """
+        Выборка транзакций пользователя за период для отчета идет по индексу
+        """
+        plan = explain(Transaction.objects.for_user_period(user.id, START,
+                                                           START + timedelta(days=30)))
+
+        assert 'Seq Scan' not in plan
+        assert uses_index(plan, 'transactions_user_date_idx')
+
+    def test_date_range_uses_index(self) -> None:
+        """
+        Диапазонная выборка по дате по всем пользователям идет по индексу
+        """
+        queryset = Transaction.objects.filter(date_transaction__range=[START, END])
+        plan = explain(queryset)
+
+        assert 'Seq Scan' not in plan
+
+    def test_date_range_can_use_brin_index(self) -> None:
+        """
+        Диапазонная выборка по дате может обслуживаться BRIN-индексом
+        """
+        queryset = Transaction.objects.filter(date_transaction__range=[START, END])
+        plan = explain(queryset, 'enable_indexscan', 'enable_indexonlyscan')
+
+        assert 'Seq Scan' not in plan
+        assert uses_index(plan, 'transactions_date_brin_idx')
+
+    def test_list_filters_use_index(self, user: User) -> None:
+        """
+        Страница списка транзакций с фильтрами по пользователю, периоду и категориям
+        выбирается по индексу
+        """
+        query_params = QueryDict(mutable=True)
+        query_params.update({'user': str(user.id), 'date_from': '2024-02-01',
+                             'date_to': '2024-02-29', 'amount_min': '10'})
+        query_params.setlist('category', ['Category 1', 'Category 2'])
+        queryset = filter_transactions(Transaction.objects.all(), query_params)
+        plan = explain(queryset.order_by('-date_transaction', '-id')[:100])
+
+        assert 'Seq Scan' not in plan
+
+    def test_date_range_partition_pruning(self, user: User) -> None:
+        """
+        Выборка за период читает только секции месяцев периода
+        """
+        plan = explain(Transaction.objects.for_user_period(
+            user.id, datetime(2024, 2, 10, tzinfo=timezone.utc),
+            datetime(2024, 3, 5, tzinfo=timezone.utc)))
+
+        assert 'transactions_2024_02' in plan
+        assert 'transactions_2024_03' in plan
+        assert 'transactions_2024_01' not in plan
+        assert 'transactions_2024_04' not in plan
+        assert 'transactions_default' not in plan
@@ -0,0 +1,101 @@
+"""
+Модуль для unit-тестов месячных секций таблицы транзакций
+"""
+from datetime import (date,
+                      datetime,
+                      timezone)
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone as django_timezone
+from fin_transactions.celery_tasks import create_transaction_partitions
+from fin_transactions.models import (Transaction,
+                                     TransactionDailyRollup)
+from services.partitions import (add_months,
+                                 ensure_partitions,
+                                 get_partitions)
+from services.rollups import backfill_rollups
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionPartitions:
+    """
+    Набор тестов для создания и отсоединения секций
+    """
+
+    @staticmethod
+    def partitions_of_rows() -> dict[str, int]:
+        """
+        Кол-во транзакций по секциям
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text, COUNT(*) FROM transactions '
+                           'GROUP BY 1')
+            return dict(cursor.fetchall())
+
+    @pytest.fixture
+    def transactions(self, user: User) -> None:
+        """
+        Фикстура для создания транзакций за январь-март 2024 (до создания их секций)
+        """
+        Transaction.objects.bulk_create(
+            Transaction(user=user, amount='10.00', transaction_type=Transaction.EXPENSE,
+                        category='Food', date_transaction=datetime(2024, month, day, hour,
+                                                                   tzinfo=timezone.utc))
+            for month in (1, 2, 3) for day, hour in ((1, 0), (15, 12), (28, 23))
+        )
+
+    def test_add_months(self) -> None:
+        """
+        Проверка вычисления месяцев
+        """
+        assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+    @pytest.mark.usefixtures('transactions')
+    def test_ensure_partitions_moves_rows(self) -> None:
+        """
+        Проверка переноса транзакций из секции по умолчанию в созданные секции месяцев
+        """
+        assert self.partitions_of_rows() == {'transactions_default': 9}
+
+        created = ensure_partitions(date(2024, 1, 1), date(2024, 2, 29))
+
+        assert created == ['transactions_2024_01', 'transactions_2024_02']
+        assert self.partitions_of_rows() == {'transactions_2024_01': 3,
+                                             'transactions_2024_02': 3,
+                                             'transactions_default': 3}
+        assert not ensure_partitions(date(2024, 1, 1), date(2024, 2, 29))
+        assert Transaction.objects.count() == 9
+
+    def test_create_transaction_partitions(self) -> None:
+        """
+        Проверка создания секций будущих месяцев задачей Celery
+        """
+        month = django_timezone.now().date().replace(day=1)
+
+        create_transaction_partitions()
+
+        assert {add_months(month, months) for months in range(4)} <= set(get_partitions())
+
+    @pytest.mark.usefixtures('transactions')
+    def test_detach_partitions(self, user: User) -> None:
+        """
+        Проверка отсоединения секций старых месяцев командой transaction_partitions
+        """
+        ensure_partitions(date(2024, 1, 1), date(2024, 3, 1))
+        backfill_rollups()
+
+        out = StringIO()
+        call_command('transaction_partitions', '--detach-before', '2024-03-01', '--drop',
+                     stdout=out)
+
+        assert 'Отсоединено секций: 2 transactions_2024_01 transactions_2024_02' \
+            in out.getvalue()
+        assert self.partitions_of_rows() == {'transactions_2024_03': 3}
+        assert date(2024, 3, 1) in get_partitions()
+        assert date(2024, 2, 1) not in get_partitions()
+        assert set(TransactionDailyRollup.objects.filter(user=user)
+                   .values_list('day__month', flat=True)) == {3}
@@ -0,0 +1,158 @@
+"""
+Модуль для unit-тестов дневных сумм транзакций
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import StringIO
+from typing import Optional
+from unittest.mock import (MagicMock,
+                           patch)
+import pytest
+from django.core.management import call_command
+from django.db.models import (Count,
+                              Sum)
+from django.db.models.functions import TruncMonth
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from fin_transactions.models import (Transaction,
+                                     TransactionDailyRollup)
+from services.rollups import (backfill_rollups,
+                              month_totals)
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestTransactionDailyRollup:
+    """
+    Набор тестов для дневных сумм транзакций
+    """
+
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        """
+        Фикстура для авторизованного клиента API
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @staticmethod
+    def rollups() -> dict[tuple[str, str, str], tuple[Decimal, int]]:
+        """
+        Ненулевые дневные суммы: (день, тип, категория) -> (сумма, кол-во)
+        """
+        return {(str(rollup.day), rollup.transaction_type, rollup.category):
+                (rollup.total, rollup.count)
+                for rollup in TransactionDailyRollup.objects.all() if rollup.count}
+
+    @staticmethod
+    def row(user: User, amount: str, category: str, date: str) -> dict[str, object]:
+        """
+        Вспомогательная функция для формирования транзакции
+        """
+        return {'user': user.id, 'amount': amount, 'transaction_type': Transaction.EXPENSE,
+                'category': category, 'date_transaction': date}
+
+    @patch('services.budget.check_budget_limit.apply_async')
+    def test_rollups_on_write(self, mock_check_budget_limit: MagicMock, api_client: APIClient,
+                              user: User) -> None:
+        """
+        Проверка обновления дневных сумм при создании, пакетном создании, редактировании
+        и удалении транзакций
+        """
+        # pylint: disable=unused-argument
+        response = api_client.post(reverse('transaction-list-create'),
+                                   self.row(user, '100.00', 'Food', '2024-01-05T10:00Z'),
+                                   format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        transaction_id = response.data['id']
+        response = api_client.post(reverse('transaction-batch-create'), [
+            self.row(user, '50.50', 'Food', '2024-01-05T23:59Z'),
+            self.row(user, '30.00', 'Taxi', '2024-01-06T00:00Z'),
+        ], format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert self.rollups() == {
+            ('2024-01-05', 'expense', 'Food'): (Decimal('150.50'), 2),
+            ('2024-01-06', 'expense', 'Taxi'): (Decimal('30.00'), 1),
+        }
+
+        url = reverse('transaction-detail-update-delete', args=[transaction_id])
+        response = api_client.put(url, self.row(user, '20.00', 'Taxi', '2024-01-06T10:00Z'),
+                                  format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert self.rollups() == {
+            ('2024-01-05', 'expense', 'Food'): (Decimal('50.50'), 1),
+            ('2024-01-06', 'expense', 'Taxi'): (Decimal('50.00'), 2),
+        }
+
+        response = api_client.delete(url)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert self.rollups() == {
+            ('2024-01-05', 'expense', 'Food'): (Decimal('50.50'), 1),
+            ('2024-01-06', 'expense', 'Taxi'): (Decimal('30.00'), 1),
+        }
+
+    @pytest.mark.parametrize('start, end', [
+        (datetime(2024, 1, 1, tzinfo=timezone.utc),
+         datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc)),
+        (datetime(2024, 1, 5, 10, 30, tzinfo=timezone.utc),
+         datetime(2024, 2, 20, 10, 0, tzinfo=timezone.utc)),
+        (datetime(2024, 1, 10, 9, 0, tzinfo=timezone.utc),
+         datetime(2024, 1, 10, 11, 0, tzinfo=timezone.utc)),
+        (datetime(2024, 1, 10, tzinfo=timezone.utc),
+         datetime(2024, 1, 10, 23, 59, 59, 999999, tzinfo=timezone.utc)),
+        (datetime(2024, 1, 20, 10, 30, tzinfo=timezone.utc), None),
+        (None, datetime(2024, 2, 5, 10, 0, tzinfo=timezone.utc)),
+        (None, None),
+    ])
+    def test_month_totals(self, user: User, start: Optional[datetime],
+                          end: Optional[datetime]) -> None:
+        """
+        Проверка совпадения сумм и кол-ва по месяцам за период по дневным суммам
+        (с неполными днями на границах и открытыми границами) с группировкой транзакций
+        """
+        Transaction.objects.bulk_create(
+            Transaction(user=user, amount=Decimal(day * 10 + hour), category=category,
+                        transaction_type=Transaction.EXPENSE,
+                        date_transaction=datetime(2024, month, day, hour, tzinfo=timezone.utc))
+            for month in (1, 2) for day in range(1, 29) for hour in (0, 10, 23)
+            for category in ('Food', 'Taxi')
+        )
+        backfill_rollups()
+        transactions = Transaction.objects.filter(user=user)
+        if start:
+            transactions = transactions.filter(date_transaction__gte=start)
+        if end:
+            transactions = transactions.filter(date_transaction__lte=end)
+        expected = transactions.annotate(
+            month=TruncMonth('date_transaction', tzinfo=timezone.utc)) \
+            .values_list('month', 'transaction_type', 'category') \
+            .annotate(count=Count('id'), total=Sum('amount')) \
+            .order_by('month', 'transaction_type', 'category')
+
+        assert [(f'{month:%Y-%m}', *row) for month, *row in month_totals(user.id, start, end)] \
+            == [(f'{month:%Y-%m}', *row) for month, *row in expected]
+
+    def test_backfill_rollups(self, user: User) -> None:
+        """
+        Проверка пересчета дневных сумм командой backfill_rollups
+        """
+        Transaction.objects.bulk_create(
+            Transaction(user=user, amount=amount, transaction_type=Transaction.EXPENSE,
+                        category='Food', date_transaction=date)
+            for amount, date in (('10.00', '2024-01-05T10:00Z'), ('20.00', '2024-01-05T20:00Z'),
+                                 ('5.00', '2024-02-01T10:00Z'))
+        )
+        TransactionDailyRollup.objects.create(user=user, day='2024-01-05',
+                                              transaction_type='expense', category='Food',
+                                              total=999, count=9)
+
+        out = StringIO()
+        call_command('backfill_rollups', '--since', '2024-01-01', stdout=out)
+
+        assert out.getvalue().strip() == 'Пересчитано дневных сумм: 2'
+        assert self.rollups() == {
+            ('2024-01-05', 'expense', 'Food'): (Decimal('30.00'), 2),
+            ('2024-02-01', 'expense', 'Food'): (Decimal('5.00'), 1),
+        }
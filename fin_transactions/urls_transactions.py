@@ -3,11 +3,23 @@
 """
 from django.urls import path
 from .views import (TransactionListCreateView,
+                    TransactionBatchCreateView,
+                    TransactionExportView,
+                    TransactionImportView,
+                    TransactionImportStatusView,
                     TransactionDetailView)
 
 urlpatterns = [
     path('transactions/', TransactionListCreateView.as_view(),
          name='transaction-list-create'),
+    path('transactions/batch/', TransactionBatchCreateView.as_view(),
+         name='transaction-batch-create'),
+    path('transactions/export/', TransactionExportView.as_view(),
+         name='transaction-export'),
+    path('transactions/import/', TransactionImportView.as_view(),
+         name='transaction-import'),
+    path('transactions/import/<str:task_id>/', TransactionImportStatusView.as_view(),
+         name='transaction-import-status'),
     path('transactions/<int:pk>/', TransactionDetailView.as_view(),
          name='transaction-detail-update-delete')
 ]
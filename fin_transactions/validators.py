@@ -0,0 +1,30 @@
+"""
+Модуль для проверки данных транзакций
+"""
+from typing import Any
+from decimal import (Decimal,
+                     InvalidOperation)
+from rest_framework.exceptions import ValidationError
+
+
+def validate_amount(data: dict[str, Any]) -> Decimal:
+    """
+        Проверяет, что сумма (amount) является числом и больше нуля.
+        Возвращает значение суммы как Decimal, если проверка пройдена.
+
+        Аргументы:
+            data (dict[str, Any]): данные запроса
+        Возвращает:
+            Decimal: проверенное значение 'amount'
+        Исключения:
+            ValidationError: если сумма не является числом или меньше либо равна нулю
+        """
+    try:
+        amount = Decimal(data.get('amount', '0')).quantize(Decimal('0.00'))
+    except (ValueError, TypeError, InvalidOperation) as err:
+        raise ValidationError({"amount": "Сумма транзакции должна быть числом."}) from err
+
+    if amount <= 0:
+        raise ValidationError({"amount": "Сумма транзакции должна быть больше нуля"})
+
+    return amount
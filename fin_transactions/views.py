@@ -1,97 +1,87 @@
 """
 Модуль для представлений модели Transaction
 """
+import csv
+import os
+import uuid
 from typing import Any
-from decimal import (Decimal,
-                     InvalidOperation)
 from celery.result import AsyncResult
 from rest_framework import (generics,
                             status)
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import (NotFound,
+                                       ValidationError)
+from rest_framework.parsers import MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction as db_transaction
+from django.http import (HttpResponse,
+                         StreamingHttpResponse)
 from django.utils import timezone as django_timezone
+from services.conditional import (ConditionalDetailMixin,
+                                  ConditionalListMixin)
 from services.decorators import (add_bearer_security,
                                  swagger_auto_schema_with_types)
-from budget.models import Budget
-from budget.celery_tasks import check_budget_limit
+from services.budget import (create_transactions_bulk,
+                             update_budget,
+                             update_budget_delta)
+from services.fieldsets import SparseFieldsListMixin
+from services.idempotency import (find_stored_response,
+                                  get_idempotency_key,
+                                  request_hash,
+                                  reserve_key,
+                                  save_response)
+from services.report import (COLUMNAR_FORMATS,
+                             REPORT_FORMATS,
+                             REPORT_MODES,
+                             SUMMARY_FORMATS,
+                             iter_report_rows,
+                             stream_csv,
+                             stream_ndjson,
+                             summarize_transactions,
+                             summary_rows,
+                             summary_to_json)
+from services.report_cache import (find_cached_report,
+                                   report_cache_key,
+                                   reserve_report)
+from services.rollups import (add_to_rollups,
+                              update_rollups)
 from users.models import User
-from .celery_tasks import generate_transaction_report
+from .celery_tasks import (generate_transaction_report,
+                           import_transactions)
+from .filters import (filter_period,
+                      filter_transactions,
+                      get_period)
 from .models import (Transaction,
-                     ReportsResult)
-from .serializers import TransactionsSerializer
-
-
-def validate_amount(data: dict[str, Any]) -> Decimal:
-    """
-        Проверяет, что сумма (amount) является числом и больше нуля.
-        Возвращает значение суммы как Decimal, если проверка пройдена.
-
-        Аргументы:
-            data (dict[str, Any]): данные запроса
-        Возвращает:
-            Decimal: проверенное значение 'amount'
-        Исключения:
-            ValidationError: если сумма не является числом или меньше либо равна нулю
-        """
-    try:
-        amount = Decimal(data.get('amount', '0')).quantize(Decimal('0.00'))
-    except (ValueError, TypeError, InvalidOperation) as err:
-        raise ValidationError({"amount": "Сумма транзакции должна быть числом."}) from err
-
-    if amount <= 0:
-        raise ValidationError({"amount": "Сумма транзакции должна быть больше нуля"})
-
-    return amount
-
-
-def update_budget(user: User, transaction_data: dict[str, Any],
-                  operation: str = 'add'
-                  ) -> None:
-    """Функция для обновления бюджета на основе транзакции."""
-    transaction_type = transaction_data['transaction_type']
-    category = transaction_data['category']
-    amount = float(Decimal(transaction_data['amount']).quantize(Decimal('0.00')))
-    print('transaction_data:', transaction_data)
-    budget = Budget.objects.filter(user=user, start_date__lte=transaction_data['date_transaction'],
-                                   end_date__gte=transaction_data['date_transaction']).first()
-
-    if not budget:
-        return
-
-    # Выбираем нужный тип бюджета
-    budget_type = budget.budget.get(transaction_type, {})
-
-    # Если категории в бюджете нет, создаем ее
-    if category not in budget_type:
-        budget_type[category] = {
-            'forecast': float(Decimal('0.00')),
-            'actual': float(Decimal('0.00')),
-            'is_notified': False,
-            'date_notified': None,
-        }
-
-    # Обновляем фактическое значение в зависимости от операции
-    if operation == 'add':
-        budget_type[category]['actual'] += amount
-    elif operation == 'subtract':
-        budget_type[category]['actual'] -= amount
-
-    budget.budget[transaction_type] = budget_type
-    budget.save()
-    check_budget_limit.delay(budget.id)
-
-
-class TransactionListCreateView(generics.ListCreateAPIView):  # type: ignore
+                     ReportsResult,
+                     ImportsResult,
+                     TransactionQuerySet)
+from .pagination import TransactionCursorPagination
+from .serializers import (TransactionsSerializer,
+                          TransactionRowSerializer,
+                          TransactionsBatchSerializer,
+                          ImportsResultSerializer)
+from .validators import validate_amount
+
+
+# pylint: disable-next=too-many-ancestors
+class TransactionListCreateView(ConditionalListMixin, SparseFieldsListMixin,
+                                generics.ListCreateAPIView):  # type: ignore
     """
     Получение списка транзакций и создание транзакции
     """
     queryset = Transaction.objects.all()
     serializer_class = TransactionsSerializer
+    row_serializer_class = TransactionRowSerializer
+    pagination_class = TransactionCursorPagination
+
+    def get_queryset(self) -> TransactionQuerySet:
+        queryset: TransactionQuerySet = super().get_queryset()
+        if self.request.method == 'GET':
+            queryset = filter_transactions(queryset, self.request.query_params)
+        return queryset
 
     @add_bearer_security
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -99,6 +89,17 @@ class TransactionListCreateView(generics.ListCreateAPIView):  # type: ignore
 
     @add_bearer_security
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Создание транзакции. С заголовком Idempotency-Key повторный запрос с тем же ключом
+        и телом возвращает сохраненный ответ, не создавая транзакцию и не меняя бюджет.
+        """
+        key = get_idempotency_key(request)
+        body_hash = request_hash(request.data) if key else ''
+        if key:
+            replayed = find_stored_response(request.user.id, key, body_hash)
+            if replayed:
+                return replayed
+
         validate_amount(request.data)
 
         date_transaction = request.data.get('date_transaction')
@@ -106,13 +107,130 @@ class TransactionListCreateView(generics.ListCreateAPIView):  # type: ignore
             request.data['date_transaction'] = (django_timezone.now()
                                                 .strftime('%Y-%m-%dT%H:%M') + 'Z')
 
+        record = None
         with db_transaction.atomic():
+            if key:
+                record, replayed = reserve_key(request.user.id, key, body_hash)
+                if replayed:
+                    return replayed
             response = super().post(request, *args, **kwargs)
-            update_budget(request.user, request.data, operation='add')
+            if record:
+                save_response(record, response)
         return response
 
+    def perform_create(self, serializer: TransactionsSerializer) -> None:
+        """
+        Сохранение транзакции, добавление ее в дневные суммы и в бюджет ее пользователя
+        """
+        transaction = serializer.save()
+        add_to_rollups([transaction])
+        update_budget(transaction.user, transaction.__dict__, operation='add')
+
+
+class TransactionBatchCreateView(generics.GenericAPIView):  # type: ignore
+    """
+    Пакетное создание транзакций: валидация за один проход, вставка через bulk_create
+    и однократный пересчет каждого затронутого бюджета
+    """
+    queryset = Transaction.objects.all()
+    serializer_class = TransactionsBatchSerializer
 
-class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):  # type: ignore
+    @add_bearer_security
+    def post(self, request: Request, *_args: Any, **_kwargs: Any) -> Response:
+        """
+        POST-запрос с массивом транзакций
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({"detail": "Ожидается непустой массив транзакций."})
+        if len(rows) > settings.TRANSACTIONS_BATCH_MAX_SIZE:
+            raise ValidationError({"detail": (f"Максимальный размер пакета - "
+                                              f"{settings.TRANSACTIONS_BATCH_MAX_SIZE} "
+                                              f"транзакций.")})
+
+        not_objects = [str(index) for index, row in enumerate(rows) if not isinstance(row, dict)]
+        if not_objects:
+            raise ValidationError({"detail": (f"Элементы массива должны быть объектами "
+                                              f"транзакций, индексы: {', '.join(not_objects)}.")})
+
+        amount_errors: list[dict[str, Any]] = []
+        for row in rows:
+            try:
+                validate_amount(row)
+                amount_errors.append({})
+            except ValidationError as err:
+                amount_errors.append(err.detail)
+        if any(amount_errors):
+            raise ValidationError(amount_errors)
+
+        serializer = self.get_serializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        now = django_timezone.now()
+        transactions = [
+            Transaction(**{'date_transaction': now, **validated_data})
+            for validated_data in serializer.validated_data
+        ]
+
+        created = create_transactions_bulk(transactions)
+
+        return Response(self.get_serializer(created, many=True).data,
+                        status=status.HTTP_201_CREATED)
+
+
+class TransactionImportView(APIView):  # type: ignore
+    """
+    Асинхронный импорт транзакций из CSV файла
+    """
+    parser_classes = [MultiPartParser]
+
+    @add_bearer_security
+    def post(self, request: Request, *_args: Any, **_kwargs: Any) -> Response:
+        """
+        POST-запрос с CSV файлом (поле file) и необязательным id пользователя (поле user_id).
+        Файл сохраняется на диск порциями и обрабатывается задачей Celery.
+        CSV файл: заголовок amount,transaction_type,category[,date_transaction].
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': "Необходимо передать CSV файл."})
+
+        user_id = str(request.data.get('user_id', request.user.id))
+        if not user_id.isdigit():
+            raise ValidationError({'user_id': "id пользователя должен быть целым числом."})
+        if not User.objects.filter(id=user_id).exists():
+            raise NotFound({'detail': "Пользователь не найден."})
+
+        task_id = str(uuid.uuid4())
+        folder_path = os.path.join(settings.MEDIA_ROOT, 'imports')
+        os.makedirs(folder_path, exist_ok=True)
+        file_path = os.path.join(folder_path, f'{task_id}.csv')
+        with open(file_path, 'wb') as file:
+            for chunk in upload.chunks():
+                file.write(chunk)
+
+        task = ImportsResult.objects.create(user_id=user_id, task_id=task_id, file=file_path)
+        import_transactions.apply_async(args=[task.id], task_id=task_id)
+
+        return Response({"task_id": task_id}, status=status.HTTP_202_ACCEPTED)
+
+
+class TransactionImportStatusView(generics.RetrieveAPIView):  # type: ignore
+    """
+    Получение статуса импорта: прогресс и отклоненные строки
+    """
+    queryset = ImportsResult.objects.all()
+    serializer_class = ImportsResultSerializer
+    lookup_field = 'task_id'
+
+    @add_bearer_security
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+
+# pylint: disable-next=too-many-ancestors
+class TransactionDetailView(ConditionalDetailMixin,
+                            generics.RetrieveUpdateDestroyAPIView):  # type: ignore
     """
     Получение данных по опр. транзакции, редактирование транзакции и её удаление
     """
@@ -127,68 +245,192 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):  # type: ign
     @add_bearer_security
     def put(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         validate_amount(request.data)
-        transaction = self.get_object()
-
-        # Вычисляем разницу между новым и старым amount
-        old_amount = transaction.amount
-        new_amount = Decimal(request.data['amount'])
-        difference = new_amount - old_amount
         with db_transaction.atomic():
             response = super().put(request, *args, **kwargs)
-            if difference > 0:
-                update_budget(request.user, request.data, operation='add')
-            elif difference < 0:
-                update_budget(request.user, request.data, operation='subtract')
 
         return response
 
+    def perform_update(self, serializer: TransactionsSerializer) -> None:
+        """
+        Сохранение транзакции и перенос ее вклада в дневных суммах и бюджетах
+        с прежних значений на новые
+        """
+        # Прежние значения читаем с блокировкой строки: параллельное редактирование
+        # дождется фиксации и учтет уже новую версию транзакции
+        old = Transaction.objects.select_for_update().get(pk=serializer.instance.pk)
+        transaction = serializer.save()
+        update_rollups(old, transaction)
+        update_budget_delta(old, transaction)
+
     @add_bearer_security
     def delete(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         transaction = self.get_object()
 
         with db_transaction.atomic():
             response = super().delete(request, *args, **kwargs)
-            update_budget(request.user, transaction.__dict__, operation='subtract')
+            add_to_rollups([transaction], sign=-1)
+            update_budget(transaction.user, transaction.__dict__, operation='subtract')
 
         return response
 
 
+class TransactionExportView(APIView):  # type: ignore
+    """
+    Потоковая выгрузка транзакций пользователя за все время либо за опр. период в CSV или NDJSON
+    """
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+
+    @add_bearer_security
+    def get(self, request: Request, *_args: Any, **_kwargs: Any) -> StreamingHttpResponse:
+        """
+        GET-запрос с параметрами user_id, start_date, end_date и export_format (csv/ndjson).
+        Строки читаются серверным курсором и отдаются клиенту по мере формирования.
+        """
+        user_id = request.query_params.get('user_id', '')
+        if not user_id.isdigit():
+            raise ValidationError({'user_id': "id пользователя должен быть целым числом."})
+
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in self.content_types:
+            raise ValidationError({'export_format': (f"Формат выгрузки должен быть одним из: "
+                                                     f"{', '.join(self.content_types)}.")})
+
+        try:
+            user = User.objects.only('first_name', 'last_name', 'email').get(id=user_id)
+        except ObjectDoesNotExist as err:
+            raise NotFound({'detail': "Пользователь не найден."}) from err
+
+        transactions = filter_period(Transaction.objects.for_user_period(user.id),
+                                     request.query_params, 'start_date', 'end_date')
+
+        chunk_size = settings.TRANSACTIONS_EXPORT_CHUNK_SIZE
+        rows = iter_report_rows(user, transactions, chunk_size)
+        stream = stream_csv if export_format == 'csv' else stream_ndjson
+        response = StreamingHttpResponse(stream(rows, chunk_size),
+                                         content_type=self.content_types[export_format])
+        response['Content-Disposition'] = (f'attachment; filename="transactions_{user.id}.'
+                                           f'{export_format}"')
+        return response
+
+
 class GenerateReportView(APIView):  # type: ignore
     """
     Формирование отчета по пользователю за все время либо за опр. период
     """
 
     @swagger_auto_schema_with_types
-    def post(self, request: Request, *_args: Any, **_kwargs: Any) -> Response:
+    def post(self, request: Request, *_args: Any, **_kwargs: Any) -> HttpResponse:
         """
         POST-запрос для генерации отчета по транзакциям пользователя.
         Проверяет наличие транзакций за указанный период и инициирует задачу Celery.
+        Итоговый отчет (mode=summary) по не больше REPORT_SUMMARY_SYNC_MAX_ROWS транзакций
+        возвращается сразу, без задачи Celery.
+        Файл отчета с теми же параметрами и транзакциями возвращается из кэша, а повторный
+        запрос во время формирования присоединяется к выполняющейся задаче.
         """
         user_id = request.data.get('user_id')
         start_date = request.data.get('start_date')
         end_date = request.data.get('end_date')
         send_email = bool(request.data.get('send_email', False))
+        report_format = request.data.get('format', 'csv')
+        mode = request.data.get('mode', 'rows')
+
+        if mode not in REPORT_MODES:
+            raise ValidationError({'mode': (f"Режим отчета должен быть одним из: "
+                                            f"{', '.join(REPORT_MODES)}.")})
+        formats = SUMMARY_FORMATS if mode == 'summary' else REPORT_FORMATS
+        if report_format not in formats:
+            raise ValidationError({'format': (f"Формат отчета должен быть одним из: "
+                                              f"{', '.join(formats)}.")})
+        if report_format in COLUMNAR_FORMATS and not settings.PYARROW_INSTALLED:
+            raise ValidationError({'format': (f"Формат {report_format} недоступен: на сервере "
+                                              f"не установлен пакет pyarrow.")})
+        if send_email and report_format != 'csv':
+            raise ValidationError({'format': "На email отчет отправляется только в формате csv."})
+
+        # Период - как в задаче формирования отчета: дата окончания включительно
+        period = get_period(request.data, 'start_date', 'end_date') \
+            if start_date and end_date else (None, None)
+        transactions_query = Transaction.objects.for_user_period(user_id, *period)
+
+        if send_email:
+            if not transactions_query.exists():
+                return self.no_transactions_response()
+            task = generate_transaction_report.delay(user_id=user_id,
+                                                     start_date=start_date,
+                                                     end_date=end_date,
+                                                     send_email=send_email,
+                                                     report_format=report_format,
+                                                     mode=mode)
+            return Response({"task_id": task.id}, status=status.HTTP_202_ACCEPTED)
+
+        if mode == 'summary':
+            # Кол-во транзакций считается не дальше порога синхронного ответа
+            rows = transactions_query[:settings.REPORT_SUMMARY_SYNC_MAX_ROWS + 1].count()
+            if 0 < rows <= settings.REPORT_SUMMARY_SYNC_MAX_ROWS:
+                return self.summary_response(summarize_transactions(user_id, *period),
+                                             report_format)
+
+        return self.start_report(request, transactions_query, user_id=user_id,
+                                 start_date=start_date, end_date=end_date,
+                                 report_format=report_format, mode=mode)
+
+    def start_report(self, request: Request, transactions: TransactionQuerySet,
+                     **params: Any) -> Response:
+        """
+        Запуск задачи формирования файла отчета с учетом кэша: готовый файл с тем же ключом
+        возвращается сразу, во время формирования возвращается id выполняющейся задачи
+        """
+        cache_key = report_cache_key(transactions, **params)
+        if cache_key is None:
+            return self.no_transactions_response()
+
+        cached_report = find_cached_report(cache_key)
+        if cached_report:
+            return Response({
+                'task_id': cached_report.task_id,
+                'status': 'Формирование отчета выполнено',
+                'file_url': request.build_absolute_uri(
+                    f'{settings.MEDIA_URL}reports/{cached_report.report}')
+            }, status=status.HTTP_200_OK)
+
+        report, start_task = reserve_report(params['user_id'], cache_key)
+        if start_task:
+            try:
+                generate_transaction_report.apply_async(kwargs={**params, 'send_email': False},
+                                                        task_id=report.task_id)
+            except Exception:
+                # Зарезервированная задача не запущена - освобождаем ключ кэша
+                report.status = 'error'
+                report.save(update_fields=['status'])
+                raise
+
+        return Response({"task_id": report.task_id}, status=status.HTTP_202_ACCEPTED)
 
-        transactions_query = Transaction.objects.filter(user_id=user_id)
-
-        if start_date and end_date:
-            transactions_query = transactions_query.filter(
-                date_transaction__range=[start_date, end_date])
-
-        transactions_exists = transactions_query.exists()
-
-        if not transactions_exists:
-            return Response(
-                {"detail": "В БД нет записей для выбранного пользователя за указанный период."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        task = generate_transaction_report.delay(user_id=user_id,
-                                                 start_date=start_date,
-                                                 end_date=end_date,
-                                                 send_email=send_email)
+    @staticmethod
+    def no_transactions_response() -> Response:
+        """
+        Ответ при отсутствии транзакций за период
+        """
+        return Response(
+            {"detail": "В БД нет записей для выбранного пользователя за указанный период."},
+            status=status.HTTP_404_NOT_FOUND
+        )
 
-        return Response({"task_id": task.id}, status=status.HTTP_202_ACCEPTED)
+    @staticmethod
+    def summary_response(summary: dict[str, Any], report_format: str) -> HttpResponse:
+        """
+        Итоговый отчет в ответе: JSON либо CSV файл
+        """
+        if report_format == 'json':
+            return Response(summary_to_json(summary), status=status.HTTP_200_OK)
+        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="report_summary.csv"'
+        csv.writer(response).writerows(summary_rows(summary))
+        return response
 
 
 class ReportDownloadView(APIView):  # type: ignore
@@ -9,9 +9,11 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+import importlib.util
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from environs import Env
 
 env = Env()
@@ -89,6 +91,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'fms.wsgi.application'
 
+# Отчеты в Parquet/Arrow IPC, если установлен пакет pyarrow
+PYARROW_INSTALLED = importlib.util.find_spec('pyarrow') is not None
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -96,8 +101,80 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'services.renderers.ORJSONRenderer',
+        'services.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'services.renderers.ORJSONParser',
+        'services.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Пакетное создание транзакций
+TRANSACTIONS_BATCH_MAX_SIZE = env.int('TRANSACTIONS_BATCH_MAX_SIZE', 10000)
+TRANSACTIONS_BULK_CREATE_BATCH_SIZE = env.int('TRANSACTIONS_BULK_CREATE_BATCH_SIZE', 1000)
+
+# Пагинация списка транзакций
+TRANSACTIONS_PAGE_SIZE = env.int('TRANSACTIONS_PAGE_SIZE', 100)
+TRANSACTIONS_MAX_PAGE_SIZE = env.int('TRANSACTIONS_MAX_PAGE_SIZE', 1000)
+
+# Потоковая выгрузка транзакций: кол-во строк, читаемых из БД и отдаваемых клиенту за раз
+TRANSACTIONS_EXPORT_CHUNK_SIZE = env.int('TRANSACTIONS_EXPORT_CHUNK_SIZE', 2000)
+
+# Месячные секции таблицы транзакций: кол-во создаваемых заранее месяцев после текущего
+TRANSACTIONS_PARTITIONS_AHEAD = env.int('TRANSACTIONS_PARTITIONS_AHEAD', 3)
+
+# Формирование отчетов в CSV: кол-во строк, читаемых из БД серверным курсором и записываемых за раз
+REPORT_CHUNK_SIZE = env.int('REPORT_CHUNK_SIZE', 10000)
+
+# Параллельное формирование CSV отчета частями (Celery chord): мин. кол-во транзакций
+# и длина периода одной части в днях
+REPORT_PARALLEL_MIN_ROWS = env.int('REPORT_PARALLEL_MIN_ROWS', 1000000)
+REPORT_SLICE_DAYS = env.int('REPORT_SLICE_DAYS', 90)
+
+# Итоговый отчет (mode=summary): макс. кол-во транзакций, по которым он возвращается сразу,
+# без задачи Celery
+REPORT_SUMMARY_SYNC_MAX_ROWS = env.int('REPORT_SUMMARY_SYNC_MAX_ROWS', 200000)
+
+# Время в минутах, после которого незавершенная задача отчета считается потерянной
+# и не блокирует запуск новой задачи с теми же параметрами
+REPORT_TASK_STALE_MINUTES = env.int('REPORT_TASK_STALE_MINUTES', 120)
+
+# Формирование отчетов в Parquet/Arrow: кол-во строк в одном пакете (record batch)
+REPORT_BATCH_SIZE = env.int('REPORT_BATCH_SIZE', 65536)
+
+# Время хранения ключей Idempotency-Key для создания транзакций, в секундах
+IDEMPOTENCY_KEY_TTL = env.int('IDEMPOTENCY_KEY_TTL', 86400)
+
+# Импорт транзакций из CSV: кол-во строк в порции и макс. кол-во сохраняемых ошибок
+IMPORT_CHUNK_SIZE = env.int('IMPORT_CHUNK_SIZE', 5000)
+IMPORT_MAX_REJECTED_ROWS = env.int('IMPORT_MAX_REJECTED_ROWS', 1000)
+
+# Окно объединения проверок лимитов бюджета, в секундах: не более одной отложенной
+# проверки на бюджет за окно
+BUDGET_CHECK_DELAY = env.int('BUDGET_CHECK_DELAY', 30)
+
+# Кэш периодов бюджетов: кол-во пользователей в LRU процесса и время хранения в общем кэше.
+# Кэш включается только с общим для процессов кэшем Django (REDIS_CACHE=True): иначе сброс
+# кэша при изменении бюджета в одном процессе не виден другим (gunicorn, воркеры Celery)
+BUDGET_PERIODS_CACHE_ENABLED = env.bool('REDIS_CACHE', False)
+BUDGET_PERIODS_CACHE_SIZE = env.int('BUDGET_PERIODS_CACHE_SIZE', 10000)
+BUDGET_PERIODS_CACHE_TIMEOUT = env.int('BUDGET_PERIODS_CACHE_TIMEOUT', 86400)
+
+# Уведомления о бюджете: задержка отправки для накопления сводных писем, в секундах,
+# и макс. кол-во уведомлений в одной отправке
+BUDGET_NOTIFICATIONS_DELAY = env.int('BUDGET_NOTIFICATIONS_DELAY', 10)
+BUDGET_NOTIFICATIONS_BATCH_SIZE = env.int('BUDGET_NOTIFICATIONS_BATCH_SIZE', 1000)
+
+# Ночная сверка фактических сумм бюджетов: бюджеты, завершившиеся не ранее чем N дней назад,
+# и кол-во категорий с расхождением, обрабатываемых за раз
+BUDGET_RECONCILE_DAYS = env.int('BUDGET_RECONCILE_DAYS', 35)
+BUDGET_RECONCILE_BATCH_SIZE = env.int('BUDGET_RECONCILE_BATCH_SIZE', 2000)
+
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', env.str('JWT_SECRET_KEY'))
 
 SIMPLE_JWT = {
@@ -131,6 +208,33 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# Уведомления о бюджете отправляются отдельным воркером (очередь notifications),
+# чтобы медленный SMTP-сервер не задерживал проверки бюджета
+CELERY_TASK_ROUTES = {
+    'budget.celery_tasks.send_budget_notifications': {'queue': 'notifications'},
+}
+
+# Периодические задачи (контейнер celery_beat)
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-budgets': {
+        'task': 'budget.celery_tasks.reconcile_budget_actuals',
+        'schedule': crontab(hour=env.int('BUDGET_RECONCILE_HOUR', 3), minute=0),
+    },
+    'create-transaction-partitions': {
+        'task': 'fin_transactions.celery_tasks.create_transaction_partitions',
+        'schedule': crontab(hour=env.int('TRANSACTIONS_PARTITIONS_HOUR', 2), minute=0),
+    },
+}
+
+# Общий кэш: Redis (отдельная БД), если REDIS_CACHE=True, иначе память процесса
+if env.bool('REDIS_CACHE', False):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'redis://{env("REDIS_SERVER")}:6379/1',
+        }
+    }
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
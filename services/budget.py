@@ -0,0 +1,191 @@
+"""
+Модуль для пересчета фактических значений бюджета по транзакциям
+"""
+from collections import defaultdict
+from datetime import (datetime,
+                      timedelta)
+from decimal import Decimal
+from typing import (Any,
+                    Iterable)
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+from budget.models import (Budget,
+                           BudgetCategory)
+from budget.celery_tasks import check_budget_limit
+from fin_transactions.models import Transaction
+from services.budget_periods import (BudgetPeriod,
+                                     find_budget_id,
+                                     find_period,
+                                     get_budget_periods)
+from services.rollups import add_to_rollups
+from users.models import User
+
+
+def apply_amount(budget_id: int, transaction_type: str, category: str,
+                 amount: Decimal) -> None:
+    """
+    Изменяет фактическое значение категории бюджета на сумму amount одним UPDATE в БД.
+    Если категории в бюджете нет, она создается.
+
+    :param budget_id: id бюджета
+    :param transaction_type: тип транзакции ('income' или 'expense')
+    :param category: категория транзакции
+    :param amount: сумма изменения (отрицательная для вычитания)
+    """
+    BudgetCategory.objects.add_actual(budget_id, transaction_type, category, amount)
+
+
+def schedule_budget_checks(budget_ids: list[int]) -> list[int]:
+    """
+    Отметка бюджетов измененными и планирование проверки лимитов.
+    Проверка ставится в очередь с задержкой BUDGET_CHECK_DELAY, только если для бюджета
+    еще нет запланированной (условный UPDATE check_scheduled_at), поэтому серия транзакций
+    по одному бюджету приводит к одной проверке, учитывающей их все.
+    Отметка снимается в начале проверки; если проверка не выполнилась за 10 окон
+    (например, задача потеряна), бюджет планируется повторно.
+
+    :param budget_ids: id измененных бюджетов
+    :return: id бюджетов, для которых поставлена проверка
+    """
+    if not budget_ids:
+        return []
+    now = timezone.now()
+    # Дата изменения бюджета участвует в ETag
+    Budget.objects.filter(id__in=budget_ids).update(date_modified=now)
+
+    delay = settings.BUDGET_CHECK_DELAY
+    not_scheduled = Q(check_scheduled_at__isnull=True) | \
+        Q(check_scheduled_at__lt=now - timedelta(seconds=delay * 10))
+    scheduled = [budget_id for budget_id in budget_ids
+                 if Budget.objects.filter(not_scheduled, id=budget_id)
+                 .update(check_scheduled_at=now)]
+    for budget_id in scheduled:
+        check_budget_limit.apply_async(args=[budget_id], countdown=delay)
+    return scheduled
+
+
+def update_budget(user: User, transaction_data: dict[str, Any],
+                  operation: str = 'add'
+                  ) -> None:
+    """Функция для обновления бюджета на основе транзакции."""
+    transaction_type = transaction_data['transaction_type']
+    category = transaction_data['category']
+    amount = Decimal(transaction_data['amount']).quantize(Decimal('0.00'))
+    date_transaction = transaction_data['date_transaction']
+    if not isinstance(date_transaction, datetime):
+        date_transaction = serializers.DateTimeField().to_internal_value(date_transaction)
+    # Бюджет по кэшу периодов пользователя, без запроса к БД
+    budget_id = find_budget_id(user.id, date_transaction)
+
+    if not budget_id:
+        return
+
+    # Обновляем фактическое значение в зависимости от операции
+    if operation == 'add':
+        apply_amount(budget_id, transaction_type, category, amount)
+    elif operation == 'subtract':
+        apply_amount(budget_id, transaction_type, category, -amount)
+
+    schedule_budget_checks([budget_id])
+
+
+def update_budget_delta(old: Transaction, new: Transaction) -> list[int]:
+    """
+    Обновление бюджетов при редактировании транзакции: вклад прежней версии транзакции
+    вычитается, новой - прибавляется. Изменение даты, типа, категории или пользователя может
+    затронуть две категории одного бюджета или два бюджета; если категория та же, применяется
+    только разница сумм. Вызывается в транзакции БД вместе с сохранением транзакции.
+
+    :param old: транзакция до изменения
+    :param new: транзакция после изменения
+    :return: список id обновленных бюджетов
+    """
+    deltas: dict[tuple[int, str, str], Decimal] = defaultdict(Decimal)
+    for transaction, sign in ((old, -1), (new, 1)):
+        budget_id = find_budget_id(transaction.user_id, transaction.date_transaction)
+        if budget_id:
+            deltas[(budget_id, transaction.transaction_type, transaction.category)] += \
+                sign * Decimal(transaction.amount).quantize(Decimal('0.00'))
+
+    # Постоянный порядок обновления строк исключает взаимные блокировки
+    budget_ids: list[int] = []
+    for (budget_id, transaction_type, category), amount in sorted(deltas.items()):
+        if amount:
+            apply_amount(budget_id, transaction_type, category, amount)
+            if budget_id not in budget_ids:
+                budget_ids.append(budget_id)
+
+    schedule_budget_checks(budget_ids)
+    return budget_ids
+
+
+def _group_totals(periods: list[BudgetPeriod], transactions: Iterable[Transaction]
+                  ) -> dict[tuple[int, str, str], Decimal]:
+    """
+    Суммы транзакций по (id бюджета, тип, категория).
+    Бюджет для даты транзакции находится бинарным поиском по периодам;
+    транзакции вне бюджетов пропускаются.
+    """
+    totals: dict[tuple[int, str, str], Decimal] = defaultdict(Decimal)
+    for transaction in transactions:
+        index = find_period(periods, transaction.date_transaction)
+        if index is None:
+            continue
+        totals[(periods[index].budget_id, transaction.transaction_type,
+                transaction.category)] += Decimal(transaction.amount)
+    return totals
+
+
+def update_budgets_bulk(transactions: Iterable[Transaction]) -> list[int]:
+    """
+    Обновление бюджетов по пакету транзакций.
+    Транзакции группируются по бюджетам, в период которых они попадают, по каждой
+    (бюджет, тип, категория) выполняется один UPDATE, каждый затронутый бюджет
+    проверяется на лимиты ровно один раз.
+
+    :param transactions: созданные транзакции
+    :return: список id обновленных бюджетов
+    """
+    transactions_by_user: dict[int, list[Transaction]] = defaultdict(list)
+    for transaction in transactions:
+        transactions_by_user[transaction.user_id].append(transaction)
+
+    budget_ids: list[int] = []
+    for user_id, user_transactions in transactions_by_user.items():
+        # Периоды бюджетов пользователя из кэша (не более одного запроса на пользователя)
+        periods = get_budget_periods(user_id)
+        if not periods:
+            continue
+
+        touched: set[int] = set()
+        for (budget_id, transaction_type, category), amount in _group_totals(
+                periods, user_transactions).items():
+            apply_amount(budget_id, transaction_type, category,
+                         amount.quantize(Decimal('0.00')))
+            touched.add(budget_id)
+
+        budget_ids.extend(sorted(touched))
+
+    schedule_budget_checks(budget_ids)
+
+    return budget_ids
+
+
+def create_transactions_bulk(transactions: list[Transaction]) -> list[Transaction]:
+    """
+    Сохранение пакета транзакций в одной транзакции БД: вставка через bulk_create,
+    добавление в дневные суммы и обновление бюджетов (update_budgets_bulk).
+    Используется пакетным созданием транзакций через API и импортом из CSV.
+
+    :param transactions: несохраненные транзакции
+    :return: созданные транзакции
+    """
+    with db_transaction.atomic():
+        created = Transaction.objects.bulk_create(
+            transactions, batch_size=settings.TRANSACTIONS_BULK_CREATE_BATCH_SIZE)
+        add_to_rollups(created)
+        update_budgets_bulk(created)
+    return created
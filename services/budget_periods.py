@@ -0,0 +1,130 @@
+"""
+Модуль кэша периодов бюджетов пользователей для записи транзакций.
+
+Для каждого пользователя кэшируется отсортированный список периодов (start_date, end_date, id)
+его бюджетов; бюджет для даты транзакции находится бинарным поиском без запроса к БД.
+Уровни кэша:
+    - LRU в памяти процесса (BUDGET_PERIODS_CACHE_SIZE пользователей);
+    - общий кэш Django (Redis при REDIS_CACHE=True), ключ содержит версию периодов.
+Версия пользователя хранится в общем кэше и меняется при сохранении и удалении бюджета
+(сигналы budget.signals), поэтому устаревшие записи обоих уровней не используются.
+Без общего для процессов кэша (BUDGET_PERIODS_CACHE_ENABLED=False) версия не была бы видна
+другим процессам, поэтому периоды читаются из БД при каждом обращении.
+"""
+import uuid
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import (NamedTuple,
+                    Optional)
+from django.conf import settings
+from django.core.cache import cache
+from budget.models import Budget
+
+
+class BudgetPeriod(NamedTuple):
+    """
+    Период бюджета
+    """
+    start_date: datetime
+    end_date: datetime
+    budget_id: int
+
+
+_local: OrderedDict[int, tuple[str, list[BudgetPeriod]]] = OrderedDict()
+_local_lock = Lock()
+
+
+def _version_key(user_id: int) -> str:
+    return f'budget_periods:{user_id}:version'
+
+
+def _periods_key(user_id: int, version: str) -> str:
+    return f'budget_periods:{user_id}:{version}'
+
+
+def _get_version(user_id: int) -> str:
+    """
+    Текущая версия периодов пользователя (создается при отсутствии)
+    """
+    version: Optional[str] = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), uuid.uuid4().hex, settings.BUDGET_PERIODS_CACHE_TIMEOUT)
+        version = cache.get(_version_key(user_id))
+    return version or ''
+
+
+def _load_periods(user_id: int) -> list[BudgetPeriod]:
+    """
+    Периоды бюджетов пользователя из БД
+    """
+    return [BudgetPeriod(*row) for row in Budget.objects.filter(user_id=user_id)
+            .order_by('start_date').values_list('start_date', 'end_date', 'id')]
+
+
+def get_budget_periods(user_id: int) -> list[BudgetPeriod]:
+    """
+    Периоды бюджетов пользователя, отсортированные по дате начала
+
+    :param user_id: id пользователя
+    """
+    if not settings.BUDGET_PERIODS_CACHE_ENABLED:
+        return _load_periods(user_id)
+
+    version = _get_version(user_id)
+    with _local_lock:
+        local = _local.get(user_id)
+        if local and local[0] == version:
+            _local.move_to_end(user_id)
+            return local[1]
+
+    periods: Optional[list[BudgetPeriod]] = cache.get(_periods_key(user_id, version))
+    if periods is None:
+        periods = _load_periods(user_id)
+        cache.set(_periods_key(user_id, version), periods,
+                  settings.BUDGET_PERIODS_CACHE_TIMEOUT)
+
+    with _local_lock:
+        _local[user_id] = (version, periods)
+        _local.move_to_end(user_id)
+        while len(_local) > settings.BUDGET_PERIODS_CACHE_SIZE:
+            _local.popitem(last=False)
+    return periods
+
+
+def find_period(periods: list[BudgetPeriod], date: datetime) -> Optional[int]:
+    """
+    Индекс периода, в который попадает дата (бюджеты пользователя не пересекаются)
+
+    :param periods: периоды, отсортированные по дате начала
+    :param date: дата транзакции
+    :return: индекс периода или None, если дата не попадает ни в один бюджет
+    """
+    index = bisect_right(periods, date, key=lambda period: period.start_date) - 1
+    if index < 0 or date > periods[index].end_date:
+        return None
+    return index
+
+
+def find_budget_id(user_id: int, date: datetime) -> Optional[int]:
+    """
+    id бюджета пользователя, в период которого попадает дата
+
+    :param user_id: id пользователя
+    :param date: дата транзакции
+    """
+    periods = get_budget_periods(user_id)
+    index = find_period(periods, date)
+    return None if index is None else periods[index].budget_id
+
+
+def invalidate_budget_periods(user_id: int) -> None:
+    """
+    Сброс кэша периодов пользователя: новая версия в общем кэше и удаление из LRU процесса
+    """
+    if not settings.BUDGET_PERIODS_CACHE_ENABLED:
+        return
+    cache.set(_version_key(user_id), uuid.uuid4().hex, settings.BUDGET_PERIODS_CACHE_TIMEOUT)
+    with _local_lock:
+        _local.pop(user_id, None)
@@ -0,0 +1,134 @@
+"""
+Модуль сверки фактических сумм бюджетов с транзакциями.
+
+Суммы транзакций по всем категориям всех сверяемых бюджетов считаются одним запросом
+(бюджеты JOIN категории LEFT JOIN транзакции, GROUP BY категория); из БД читаются только
+категории с расхождением - серверным курсором порциями по BUDGET_RECONCILE_BATCH_SIZE,
+поэтому память не зависит от кол-ва транзакций.
+Исправление применяется одним UPDATE на порцию как разница
+(actual = actual + (сумма - сохраненное значение)), вычисленная по одному снимку БД,
+поэтому транзакции, записанные во время сверки, не теряются.
+"""
+import logging
+from datetime import (datetime,
+                      timedelta)
+from decimal import Decimal
+from typing import (Any,
+                    Optional)
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from budget.models import (Budget,
+                           BudgetCategory)
+
+logger = logging.getLogger(__name__)
+
+# Категории сверяемых бюджетов, фактическая сумма которых отличается от суммы транзакций
+DRIFT_SQL = '''
+    SELECT bc.id, bc.budget_id, bc.transaction_type, bc.category, bc.actual,
+           COALESCE(SUM(t.amount), 0) AS total
+    FROM budget_categories bc
+    JOIN budgets b ON b.id = bc.budget_id
+    LEFT JOIN transactions t ON t.user_id = b.user_id
+        AND t.transaction_type = bc.transaction_type
+        AND t.category = bc.category
+        AND t.date_transaction BETWEEN b.start_date AND b.end_date
+    WHERE b.end_date >= %s
+    GROUP BY bc.id
+    HAVING bc.actual <> COALESCE(SUM(t.amount), 0)
+    ORDER BY bc.id
+'''
+
+# Исправление порции категорий одним запросом: actual = actual + разница
+APPLY_SQL = '''
+    UPDATE budget_categories bc SET actual = bc.actual + v.delta
+    FROM unnest(%s::bigint[], %s::numeric[]) AS v(id, delta)
+    WHERE bc.id = v.id
+'''
+
+# Категории, по которым есть транзакции, но нет строки в budget_categories
+MISSING_SQL = '''
+    SELECT b.id, t.transaction_type, t.category, SUM(t.amount)
+    FROM budgets b
+    JOIN transactions t ON t.user_id = b.user_id
+        AND t.date_transaction BETWEEN b.start_date AND b.end_date
+    WHERE b.end_date >= %s
+        AND NOT EXISTS (SELECT 1 FROM budget_categories bc
+                        WHERE bc.budget_id = b.id
+                            AND bc.transaction_type = t.transaction_type
+                            AND bc.category = t.category)
+    GROUP BY b.id, t.transaction_type, t.category
+    ORDER BY b.id
+'''
+
+
+# pylint: disable-next=too-many-locals
+def reconcile_budgets(since: Optional[datetime] = None, dry_run: bool = False
+                      ) -> dict[str, Any]:
+    """
+    Пересчет фактических сумм категорий бюджетов, завершающихся не ранее since
+
+    :param since: нижняя граница даты завершения бюджета, по умолч. -
+                  сейчас минус BUDGET_RECONCILE_DAYS дней (текущие и недавно завершенные)
+    :param dry_run: только отчет о расхождениях, без исправления
+    :return: отчет: кол-во исправленных и созданных категорий, затронутых бюджетов,
+             суммарное абсолютное расхождение и примеры наибольших расхождений
+    """
+    if since is None:
+        since = timezone.now() - timedelta(days=settings.BUDGET_RECONCILE_DAYS)
+    batch_size = settings.BUDGET_RECONCILE_BATCH_SIZE
+    report: dict[str, Any] = {'since': since.isoformat(), 'fixed': 0, 'created': 0,
+                              'budgets': 0, 'drift': Decimal('0.00'), 'largest': []}
+    budget_ids: set[int] = set()
+
+    def add_drift(budget_id: int, transaction_type: str, category: str,
+                  drift: Decimal) -> None:
+        report['drift'] += abs(drift)
+        report['largest'].append({'budget_id': budget_id, 'transaction_type': transaction_type,
+                                  'category': category, 'drift': drift})
+        report['largest'] = sorted(report['largest'], key=lambda item: -abs(item['drift']))[:10]
+
+    def touch_budgets(batch_ids: set[int]) -> None:
+        budget_ids.update(batch_ids)
+        if not dry_run:
+            # Дата изменения бюджета участвует в ETag
+            Budget.objects.filter(id__in=batch_ids).update(date_modified=timezone.now())
+
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(DRIFT_SQL, [since])
+        while rows := cursor.fetchmany(batch_size):
+            deltas = []
+            for _, budget_id, transaction_type, category, actual, total in rows:
+                add_drift(budget_id, transaction_type, category, total - actual)
+                deltas.append(total - actual)
+            report['fixed'] += len(rows)
+            if not dry_run:
+                with connection.cursor() as update_cursor:
+                    update_cursor.execute(APPLY_SQL, [[row[0] for row in rows], deltas])
+            touch_budgets({row[1] for row in rows})
+
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(MISSING_SQL, [since])
+        while rows := cursor.fetchmany(batch_size):
+            for budget_id, transaction_type, category, total in rows:
+                add_drift(budget_id, transaction_type, category, total)
+            report['created'] += len(rows)
+            if not dry_run:
+                # Категорию мог создать параллельный запрос - ее исправит следующая сверка
+                BudgetCategory.objects.bulk_create(
+                    [BudgetCategory(budget_id=budget_id, transaction_type=transaction_type,
+                                    category=category, actual=total)
+                     for budget_id, transaction_type, category, total in rows],
+                    ignore_conflicts=True)
+            touch_budgets({row[0] for row in rows})
+
+    report['budgets'] = len(budget_ids)
+
+    logger.info('Сверка бюджетов: исправлено категорий %s, создано %s, бюджетов %s, '
+                'расхождение %s', report['fixed'], report['created'], report['budgets'],
+                report['drift'])
+    # Суммы строками: отчет возвращается Celery-задачей в JSON
+    report['drift'] = str(report['drift'])
+    for item in report['largest']:
+        item['drift'] = str(item['drift'])
+    return report
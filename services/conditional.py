@@ -0,0 +1,164 @@
+"""
+Модуль условных запросов (ETag, If-None-Match, If-Match) для представлений DRF.
+
+ETag объекта строится по id и дате изменения (date_modified) и читается одним запросом
+по первичному ключу без загрузки и сериализации объекта. ETag списка строится по id и дате
+изменения строк страницы и ссылкам на соседние страницы, поэтому учитывает изменение,
+добавление и удаление записей страницы и не требует запросов ко всей выборке.
+"""
+import hashlib
+from datetime import datetime
+from typing import (Any,
+                    Iterable,
+                    Optional)
+from django.db import transaction as db_transaction
+from django.db.models import QuerySet
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class PreconditionFailed(APIException):  # type: ignore
+    """
+    Ответ 412: ETag из If-Match не совпадает с текущим
+    """
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "Объект был изменен (ETag не совпадает)."
+    default_code = 'precondition_failed'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Проверка, что заголовок If-None-Match/If-Match содержит ETag (либо '*')
+    """
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    ETag из значений, определяющих представление ресурса
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8'),
+                          usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+class ConditionalDetailMixin:
+    """
+    Условные GET и PUT для представлений одного объекта с полем date_modified:
+        - GET с If-None-Match, совпадающим с текущим ETag, возвращает 304 без сериализации;
+        - PUT с If-Match, не совпадающим с текущим ETag, возвращает 412 (исключение
+          PreconditionFailed, поэтому транзакция БД представления откатывается).
+    Объект блокируется (SELECT ... FOR UPDATE) от проверки If-Match до сохранения.
+    """
+    modified_field = 'date_modified'
+
+    def get_etag(self, lock: bool = False) -> Optional[str]:
+        """
+        ETag объекта из URL либо None, если объекта нет
+        """
+        view: Any = self
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        queryset = view.get_queryset().filter(
+            **{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        if lock:
+            queryset = queryset.select_for_update()
+        row: Optional[tuple[Any, datetime]] = queryset.values_list(
+            'pk', self.modified_field).first()
+        if row is None:
+            return None
+        return make_etag(row[0], row[1].isoformat(), view.request.accepted_renderer.format)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Получение объекта с проверкой If-None-Match
+        """
+        etag = self.get_etag()
+        if etag and etag_matches(request.headers.get('If-None-Match'), etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response: Response = super().retrieve(request, *args, **kwargs)  # type: ignore[misc]
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    def put(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Редактирование объекта с проверкой If-Match
+        """
+        if_match = request.headers.get('If-Match')
+        with db_transaction.atomic():
+            if if_match is not None:
+                etag = self.get_etag(lock=True)
+                if etag and not etag_matches(if_match, etag):
+                    raise PreconditionFailed()
+            response: Response = super().put(request, *args, **kwargs)  # type: ignore[misc]
+
+        if response.status_code == status.HTTP_200_OK:
+            etag = self.get_etag()
+            if etag:
+                response['ETag'] = etag
+        return response
+
+
+class ConditionalListMixin:
+    """
+    Условный GET для списков с полем date_modified.
+    ETag строится по строкам страницы ответа (id и date_modified), ссылкам на соседние страницы,
+    параметрам запроса и формату ответа. Без If-None-Match строки берутся из выборки самого
+    ответа, дополнительных запросов нет; строки .values() должны содержать id и date_modified.
+    С If-None-Match строки страницы сначала читаются отдельным запросом только этих колонок
+    (и полей сортировки пагинации): при совпадении ETag возвращается 304 без сериализации.
+    """
+    modified_field = 'date_modified'
+    etag_rows: Optional[Iterable[Any]] = None
+
+    def paginate_queryset(self, queryset: QuerySet[Any]) -> Optional[list[Any]]:
+        """
+        Страница списка; строки страницы (либо всего списка без пагинации) запоминаются для ETag
+        """
+        page: Optional[list[Any]] = super().paginate_queryset(queryset)  # type: ignore[misc]
+        self.etag_rows = queryset if page is None else page
+        return page
+
+    def list_etag(self, request: Request, rows: Iterable[Any], paginator: Any) -> str:
+        """
+        ETag страницы списка
+        """
+        state = [f'{row["id"]}:{row[self.modified_field].isoformat()}' if isinstance(row, dict)
+                 else f'{row.pk}:{getattr(row, self.modified_field).isoformat()}'
+                 for row in rows]
+        links = (paginator.get_next_link(), paginator.get_previous_link()) if paginator else ()
+        return make_etag(*state, *links, request.get_full_path(), request.accepted_renderer.format)
+
+    def current_list_etag(self, request: Request) -> str:
+        """
+        ETag страницы списка по отдельному запросу только id, date_modified и полей сортировки
+        """
+        view: Any = self
+        paginator = view.pagination_class() if view.pagination_class else None
+        ordering = [field.lstrip('-') for field in getattr(paginator, 'ordering', None) or ()]
+        queryset = view.filter_queryset(view.get_queryset()).values(
+            *dict.fromkeys(['id', self.modified_field, *ordering]))
+        rows = paginator.paginate_queryset(queryset, request, view=view) if paginator else None
+        return self.list_etag(request, queryset if rows is None else rows, paginator)
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Получение списка с проверкой If-None-Match
+        """
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etag = self.current_list_etag(request)
+            if etag_matches(if_none_match, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response: Response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+        if response.status_code == status.HTTP_200_OK and self.etag_rows is not None:
+            view: Any = self
+            response['ETag'] = self.list_etag(request, self.etag_rows, view.paginator)
+        return response
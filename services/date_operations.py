@@ -2,7 +2,7 @@
 Модуль доя различных операция с датой
 """
 from typing import Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.db.models import Model
 from django.utils import timezone
 
@@ -40,3 +40,48 @@ def transform_date(start_date_str: str, end_date_str: str) -> Tuple[datetime, da
     start_date_time = timezone.make_aware(start_date)
     end_date_time = timezone.make_aware(transform_end_date)
     return start_date_time, end_date_time
+
+
+def parse_date_param(value: str, end_of_day: bool = False) -> datetime:
+    """
+    Преобразование даты из параметра запроса в объект datetime с учетом временной зоны.
+
+    Аргументы:
+        value(str): дата в формате 'YYYY-MM-DDTHH:MMZ' (UTC) либо 'YYYY-MM-DD'
+        end_of_day(bool): для формата 'YYYY-MM-DD' вернуть конец дня (23:59:59.999999),
+            иначе - начало дня
+    Возвращает:
+        datetime: дата с учетом временной зоны
+    Исключения:
+        ValueError: если дата передана в неверном формате
+    """
+    try:
+        return timezone.make_aware(datetime.strptime(value, '%Y-%m-%dT%H:%MZ'),
+                                   timezone=dt_timezone.utc)
+    except ValueError:
+        date_value = datetime.strptime(value, '%Y-%m-%d')
+    if end_of_day:
+        date_value += timedelta(days=1) - timedelta(microseconds=1)
+    return timezone.make_aware(date_value)
+
+
+def split_period(start: datetime, end: datetime,
+                 step: timedelta) -> list[tuple[datetime, datetime]]:
+    """
+    Разбиение периода [start, end] (включительно) на последовательные полуинтервалы
+    [начало, конец) длиной не больше step.
+
+    Аргументы:
+        start(datetime): начало периода
+        end(datetime): конец периода (включительно)
+        step(timedelta): длина полуинтервала
+    Возвращает:
+        list[tuple[datetime, datetime]]: полуинтервалы по возрастанию; последний
+        заканчивается на end + 1 мкс
+    """
+    stop = end + timedelta(microseconds=1)
+    slices = []
+    while start < stop:
+        slices.append((start, min(start + step, stop)))
+        start += step
+    return slices
@@ -47,10 +47,25 @@ def swagger_auto_schema_with_types(func: F) -> F:
                                                'send_email': openapi.Schema(
                                                    type=openapi.TYPE_BOOLEAN,
                                                    description='Отправить отчет на email'),
+                                               'format': openapi.Schema(
+                                                   type=openapi.TYPE_STRING,
+                                                   enum=['csv', 'parquet', 'arrow', 'json'],
+                                                   description=('Формат отчета '
+                                                                '(по умолч. csv; для '
+                                                                'mode=summary - csv либо '
+                                                                'json)')),
+                                               'mode': openapi.Schema(
+                                                   type=openapi.TYPE_STRING,
+                                                   enum=['rows', 'summary'],
+                                                   description=('Режим отчета: rows - '
+                                                                'транзакции, summary - итоги '
+                                                                '(по умолч. rows)')),
                                            },
                                            required=['user_id']
                                        ),
                                        responses={
+                                           200: openapi.Response(
+                                               'Итоговый отчет (mode=summary) в CSV либо JSON'),
                                            202: openapi.Response('Accepted', openapi.Schema(
                                                type=openapi.TYPE_OBJECT,
                                                properties={
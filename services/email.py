@@ -6,6 +6,7 @@ from typing import Optional
 from smtplib import SMTPException
 from django.core.mail import EmailMessage
 from django.core.mail import BadHeaderError
+from django.core.mail import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,18 @@ def send_email(subject: str, body: str, from_email: str, recipient_list: list[st
         logger.error('Ошибка отправки email: %s', e, exc_info=True)
 
 
+def send_emails(messages: list[EmailMessage]) -> int:
+    """
+    Функция для отправки нескольких email через одно SMTP-соединение.
+    Ошибки отправки не подавляются, чтобы вызывающая задача могла повторить отправку.
+
+    :param messages: список email
+    :return: кол-во отправленных email
+    """
+    with get_connection() as connection:
+        return int(connection.send_messages(messages) or 0)
+
+
 def add_file(file_content: list[list[str]]) -> bytes:
     """
     Функция для преобразования данных в строку из списка для добавления в CSV
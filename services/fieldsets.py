@@ -0,0 +1,89 @@
+"""
+Модуль выборочных полей (параметр fields=) и быстрого чтения списков.
+
+Списки читаются через .values() только с запрошенными колонками, строки преобразуются
+в ответ легким сериализатором строк без создания экземпляров модели и полей DRF
+на каждую запись. Ответ совпадает с ответом ModelSerializer для тех же полей.
+"""
+from typing import (Any,
+                    Callable,
+                    Iterable,
+                    Optional)
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+class RowSerializer:
+    """
+    Легкий сериализатор строк .values().
+
+    Атрибуты:
+        converters (dict[str, Converter]): доступные поля и функции преобразования значения
+            (None - значение отдается как есть)
+        default_fields (tuple[str, ...]): поля ответа, если параметр fields не передан
+        required_fields (tuple[str, ...]): поля, которые читаются всегда (например, для курсора
+            пагинации), но попадают в ответ, только если запрошены
+    """
+    converters: dict[str, Converter] = {}
+    default_fields: tuple[str, ...] = ()
+    required_fields: tuple[str, ...] = ()
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        self.fields = [(name, self.converters[name]) for name in fields]
+
+    @classmethod
+    def from_query_params(cls, query_params: Any) -> 'RowSerializer':
+        """
+        Сериализатор для полей из параметра fields=поле1,поле2
+
+        :raises ValidationError: передано неизвестное поле
+        """
+        value = query_params.get('fields')
+        if not value:
+            return cls(cls.default_fields)
+        fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in fields if name not in cls.converters]
+        if unknown or not fields:
+            raise ValidationError({'fields': (f"Допустимые поля: {', '.join(cls.converters)}.")})
+        return cls(fields)
+
+    @property
+    def query_fields(self) -> list[str]:
+        """
+        Колонки для .values(): запрошенные поля и обязательные поля
+        """
+        return list(dict.fromkeys([*(name for name, _ in self.fields), *self.required_fields]))
+
+    def to_representation(self, row: dict[str, Any]) -> dict[str, Any]:
+        """
+        Преобразование строки .values() в элемент ответа
+        """
+        return {name: row[name] if converter is None or row[name] is None else converter(row[name])
+                for name, converter in self.fields}
+
+
+class SparseFieldsListMixin:  # pylint: disable=too-few-public-methods
+    """
+    Быстрый GET списка: выборка .values() только запрошенных полей и сериализация
+    легким сериализатором строк row_serializer_class
+    """
+    row_serializer_class: type[RowSerializer]
+
+    def list(self, request: Request, *_args: Any, **_kwargs: Any) -> Response:
+        """
+        Получение списка с учетом параметра fields
+        """
+        view: Any = self
+        row_serializer = self.row_serializer_class.from_query_params(request.query_params)
+        queryset = view.filter_queryset(view.get_queryset()).values(*row_serializer.query_fields)
+
+        page = view.paginate_queryset(queryset)
+        rows = [row_serializer.to_representation(row)
+                for row in (page if page is not None else queryset)]
+        if page is not None:
+            response: Response = view.get_paginated_response(rows)
+            return response
+        return Response(rows)
@@ -0,0 +1,103 @@
+"""
+Модуль для обработки заголовка Idempotency-Key.
+
+Первый запрос с ключом сохраняет ключ в той же транзакции БД, что и создаваемые данные.
+Повторный запрос с тем же ключом и телом получает сохраненный ответ без повторной
+обработки; параллельный повтор ждет на уникальном индексе (user, key) завершения первого.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from typing import (Any,
+                    Optional)
+from django.conf import settings
+from django.db import (IntegrityError,
+                       transaction as db_transaction)
+from django.utils import timezone as django_timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from fin_transactions.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+KEY_MAX_LENGTH = 255
+
+
+def get_idempotency_key(request: Request) -> Optional[str]:
+    """
+    Значение заголовка Idempotency-Key либо None, если заголовок не передан
+
+    :raises ValidationError: ключ пустой или длиннее KEY_MAX_LENGTH символов
+    """
+    key: Optional[str] = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return None
+    if not key.strip() or len(key) > KEY_MAX_LENGTH:
+        raise ValidationError({'detail': (f"Заголовок {IDEMPOTENCY_HEADER} должен быть непустой "
+                                          f"строкой не длиннее {KEY_MAX_LENGTH} символов.")})
+    return key
+
+
+def request_hash(data: Any) -> str:
+    """
+    sha256 тела запроса, не зависящий от порядка полей
+    """
+    if hasattr(data, 'dict'):
+        data = data.dict()
+    payload = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def stored_response(record: IdempotencyKey, body_hash: str) -> Response:
+    """
+    Ответ на повторный запрос: сохраненный ответ либо 422, если тело запроса отличается
+    """
+    if record.request_hash != body_hash:
+        return Response({'detail': (f"{IDEMPOTENCY_HEADER} уже использован "
+                                    f"с другим телом запроса.")},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    response = Response(record.response, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def find_stored_response(user_id: int, key: str, body_hash: str) -> Optional[Response]:
+    """
+    Поиск действующего ключа пользователя (одно чтение по уникальному индексу)
+    """
+    expired = django_timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    record = IdempotencyKey.objects.filter(user_id=user_id, key=key,
+                                           created_at__gte=expired).first()
+    return stored_response(record, body_hash) if record else None
+
+
+def reserve_key(user_id: int, key: str, body_hash: str
+                ) -> tuple[Optional[IdempotencyKey], Optional[Response]]:
+    """
+    Сохранение ключа в текущей транзакции БД перед обработкой запроса.
+    Просроченные ключи пользователя удаляются. Если ключ уже сохранен параллельным запросом,
+    возвращается его ответ.
+
+    :return: (сохраненный ключ, None) либо (None, ответ на повторный запрос)
+    """
+    expired = django_timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    IdempotencyKey.objects.filter(user_id=user_id, created_at__lt=expired).delete()
+    try:
+        with db_transaction.atomic():
+            record = IdempotencyKey.objects.create(user_id=user_id, key=key,
+                                                   request_hash=body_hash)
+    except IntegrityError:
+        return None, stored_response(IdempotencyKey.objects.get(user_id=user_id, key=key),
+                                     body_hash)
+    return record, None
+
+
+def save_response(record: IdempotencyKey, response: Response) -> None:
+    """
+    Сохранение ответа на первый запрос с ключом
+    """
+    record.status_code = response.status_code
+    record.response = response.data
+    record.save(update_fields=['status_code', 'response'])
@@ -0,0 +1,146 @@
+"""
+Модуль обслуживания месячных секций таблицы transactions (см. миграцию
+fin_transactions.0012_partition_transactions).
+
+Секция месяца называется transactions_ГГГГ_ММ и содержит транзакции с date_transaction
+в [1-е число месяца, 1-е число следующего месяца) UTC; транзакции вне созданных секций
+попадают в секцию transactions_default.
+Новая секция создается отдельной таблицей и присоединяется (ATTACH PARTITION): это не
+блокирует запись в остальные секции, а транзакции месяца, уже попавшие в transactions_default,
+переносятся в новую секцию в той же транзакции БД.
+Старые месяцы отсоединяются (DETACH PARTITION) без перезаписи данных и остаются отдельными
+таблицами либо удаляются.
+"""
+import logging
+import re
+from datetime import date
+from typing import Optional
+from django.conf import settings
+from django.db import (connection,
+                       transaction as db_transaction)
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = 'transactions'
+DEFAULT_PARTITION = 'transactions_default'
+PARTITION_RE = re.compile(r'^transactions_(\d{4})_(\d{2})$')
+
+# Месячные секции, присоединенные к таблице transactions
+PARTITIONS_SQL = '''
+    SELECT c.relname FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'transactions'::regclass
+'''
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Первое число месяца, отстоящего от month на months месяцев
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    Имя секции месяца: transactions_ГГГГ_ММ
+    """
+    return f'{PARENT_TABLE}_{month:%Y_%m}'
+
+
+def get_partitions() -> list[date]:
+    """
+    Первые числа месяцев присоединенных месячных секций по возрастанию
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(PARTITIONS_SQL)
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(date(int(match[1]), int(match[2]), 1)
+                  for match in map(PARTITION_RE.match, names) if match)
+
+
+def create_partition(month: date) -> str:
+    """
+    Создание и присоединение секции месяца с переносом его транзакций из transactions_default
+
+    :param month: первое число месяца
+    :return: имя секции
+    """
+    name = partition_name(month)
+    start = f"'{month.isoformat()} 00:00:00+00'"
+    end = f"'{add_months(month, 1).isoformat()} 00:00:00+00'"
+    with db_transaction.atomic(), connection.cursor() as cursor:
+        # Новые транзакции месяца не должны попасть в transactions_default до присоединения
+        cursor.execute(f'LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(f'CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)')
+        cursor.execute(f'''
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE date_transaction >= {start} AND date_transaction < {end}
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        ''')
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} '
+                       f'FOR VALUES FROM ({start}) TO ({end})')
+    logger.info('Создана секция %s, перенесено транзакций: %s', name, moved)
+    return name
+
+
+def ensure_partitions(first: date, last: date) -> list[str]:
+    """
+    Создание недостающих секций месяцев с first по last включительно
+
+    :param first: дата в первом месяце
+    :param last: дата в последнем месяце
+    :return: имена созданных секций
+    """
+    existing = set(get_partitions())
+    month = first.replace(day=1)
+    created = []
+    while month <= last:
+        if month not in existing:
+            created.append(create_partition(month))
+        month = add_months(month, 1)
+    return created
+
+
+def create_future_partitions(months_ahead: Optional[int] = None) -> list[str]:
+    """
+    Создание секций текущего и следующих months_ahead месяцев
+    (по умолч. - TRANSACTIONS_PARTITIONS_AHEAD)
+
+    :return: имена созданных секций
+    """
+    if months_ahead is None:
+        months_ahead = settings.TRANSACTIONS_PARTITIONS_AHEAD
+    today = timezone.now().date()
+    return ensure_partitions(today, add_months(today.replace(day=1), months_ahead))
+
+
+def detach_partitions(before: date, drop: bool = False) -> list[str]:
+    """
+    Отсоединение секций месяцев, завершившихся до даты before.
+    Транзакции отсоединенных месяцев перестают участвовать в запросах и остаются
+    в отдельных таблицах (drop=False) либо удаляются; их дневные суммы удаляются.
+
+    :param before: секции месяцев, завершившихся не позже этой даты
+    :param drop: удалить отсоединенные таблицы
+    :return: имена отсоединенных секций
+    """
+    detached = []
+    for month in get_partitions():
+        if add_months(month, 1) > before:
+            break
+        name = partition_name(month)
+        with db_transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}')
+            cursor.execute('DELETE FROM transaction_daily_rollups WHERE day >= %s AND day < %s',
+                           [month, add_months(month, 1)])
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+        logger.info('Секция %s отсоединена%s', name, ' и удалена' if drop else '')
+        detached.append(name)
+    return detached
@@ -0,0 +1,89 @@
+"""
+Модуль рендереров и парсеров REST API: JSON на базе orjson и MessagePack.
+
+orjson сериализует dict/list (в т.ч. ReturnDict/ReturnList), str, int, float, UUID и datetime
+без Python-кода, остальные типы (Decimal, lazy-строки, QuerySet и т.д.) преобразуются так же,
+как в стандартном JSONRenderer DRF, поэтому ответ совпадает с прежним.
+MessagePack выбирается согласованием содержимого (Accept / Content-Type: application/msgpack).
+"""
+from typing import (Any,
+                    IO,
+                    Optional)
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import (BaseParser,
+                                    JSONParser)
+from rest_framework.renderers import (BaseRenderer,
+                                      JSONRenderer)
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def default(obj: Any) -> Any:
+    """
+    Преобразование типов, которые orjson и msgpack не сериализуют сами
+    """
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):  # type: ignore
+    """
+    JSON рендерер на базе orjson
+    """
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None,
+               renderer_context: Optional[dict[str, Any]] = None) -> bytes:
+        if data is None:
+            return b''
+
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=default, option=option)
+        # Как и JSONRenderer, экранируем разделители строк, недопустимые в JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):  # type: ignore  # pylint: disable=too-few-public-methods
+    """
+    JSON парсер на базе orjson
+    """
+
+    def parse(self, stream: IO[bytes], media_type: Optional[str] = None,
+              parser_context: Optional[dict[str, Any]] = None) -> Any:
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+
+class MessagePackRenderer(BaseRenderer):  # type: ignore  # pylint: disable=too-few-public-methods
+    """
+    MessagePack рендерер для межсервисных запросов
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None,
+               renderer_context: Optional[dict[str, Any]] = None) -> bytes:
+        if data is None:
+            return b''
+        return bytes(msgpack.packb(data, default=default, use_bin_type=True))
+
+
+class MessagePackParser(BaseParser):  # type: ignore  # pylint: disable=too-few-public-methods
+    """
+    MessagePack парсер для межсервисных запросов
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream: IO[bytes], media_type: Optional[str] = None,
+              parser_context: Optional[dict[str, Any]] = None) -> Any:
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f'MessagePack parse error - {exc}') from exc
@@ -3,50 +3,254 @@
 """
 import logging
 import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import (Any,
+                    BinaryIO,
+                    Iterable,
+                    Iterator,
+                    Optional)
 from django.conf import settings
+from django.db import connection
 from django.db.models import QuerySet
 from fin_transactions.models import Transaction
+from users.models import User
 from .email import send_email
+from .rollups import month_totals
 
 logger = logging.getLogger(__name__)
 
+# Колонки отчета: заголовок CSV и соответствующие ключи для NDJSON
+REPORT_HEADER = ['Имя', 'Фамилия', 'Email', 'Сумма', 'Тип транзакции', 'Категория', 'Дата']
+REPORT_FIELDS = ['first_name', 'last_name', 'email', 'amount',
+                 'transaction_type', 'category', 'date_transaction']
 
-def send_report_email(transactions: QuerySet[Transaction], email_to: str) -> None:
-    """Отправка CSV отчета на email"""
-    report_content = [['Имя', 'Фамилия', 'Email', 'Сумма',
-                       'Тип транзакции', 'Категория', 'Дата']]
-    for transaction in transactions:
-        user = transaction.user
-        report_content.append([
-            user.first_name,
-            user.last_name,
-            user.email,
-            str(transaction.amount),
-            transaction.get_transaction_type_display_custom(),
-            transaction.category,
-            transaction.date_transaction.strftime('%Y-%m-%d')
-        ])
+# Форматы файла отчета: csv, parquet и arrow (Arrow IPC) - последние два требуют pyarrow
+REPORT_FORMATS = ('csv', 'parquet', 'arrow')
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Режимы отчета: rows - все транзакции, summary - итоги по месяцам, типам и категориям
+REPORT_MODES = ('rows', 'summary')
+# Форматы итогового отчета (summary)
+SUMMARY_FORMATS = ('csv', 'json')
+SUMMARY_HEADER = ['Месяц', 'Тип транзакции', 'Категория', 'Кол-во', 'Сумма']
+
+TRANSACTION_TYPE_DISPLAY = dict(Transaction.TRANSACTION_TYPE_CHOICES)
+
+
+def send_report_email(user: User, transactions: QuerySet[Transaction], chunk_size: int) -> None:
+    """
+    Отправка CSV отчета на email пользователя.
+    Строки формирует тот же движок, что и для файла (iter_report_rows); вложение письма
+    собирается в памяти целиком.
+    """
+    report_content = [list(REPORT_HEADER)]
+    report_content.extend(
+        [first_name, last_name, email, str(amount), transaction_type, category,
+         date_transaction.strftime('%Y-%m-%d')]
+        for first_name, last_name, email, amount, transaction_type, category, date_transaction
+        in iter_report_rows(user, transactions, chunk_size)
+    )
     send_email('Ваш отчет по транзакциям',
                'Отчет по вашим транзакциям прикреплен к этому письму.',
-               settings.DEFAULT_FROM_EMAIL, [email_to],
+               settings.DEFAULT_FROM_EMAIL, [user.email],
                report_content)
 
 
-def save_csv(file_path: str, transactions: QuerySet[Transaction]) -> None:
-    """Сохранение отчета в CSV файл"""
+def save_csv(file_path: str, user: User, transactions: QuerySet[Transaction],
+             chunk_size: int, header: bool = True) -> None:
+    """
+    Сохранение отчета в CSV файл.
+    Строки читаются из БД и пишутся в файл порциями по chunk_size, поэтому память
+    не зависит от размера отчета. header=False - без заголовка (часть отчета).
+    """
+    rows = iter_report_rows(user, transactions, chunk_size)
+    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+        file.writelines(stream_csv(rows, chunk_size, header))
+
+
+class _CRLFFile:  # pylint: disable=too-few-public-methods
+    """
+    Файл для COPY ... TO STDOUT: окончания строк CSV (\\n) заменяются на \\r\\n, как у
+    csv.writer; переводы строк внутри значений в кавычках не изменяются
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.quoted = False
+
+    def write(self, data: bytes) -> int:
+        """
+        Запись порции COPY; признак "внутри кавычек" сохраняется между порциями
+        """
+        parts = data.split(b'"')
+        for index, part in enumerate(parts):
+            if index:
+                self.quoted = not self.quoted
+            if not self.quoted:
+                parts[index] = part.replace(b'\n', b'\r\n')
+        return self.file.write(b'"'.join(parts))
+
+
+def save_csv_copy(file_path: str, user: User, transactions: QuerySet[Transaction],
+                  header: bool = True) -> None:
+    """
+    Сохранение отчета в CSV файл командой PostgreSQL COPY ... TO STDOUT: строки формирует БД
+    и передает в файл потоком, без разбора значений в Python.
+    Файл побайтово совпадает с save_csv.
+    header=False - без заголовка (часть отчета).
+    """
+    rows_sql, rows_params = transactions.order_by().values_list(
+        'id', 'amount', 'transaction_type', 'category', 'date_transaction').query.sql_with_params()
+    type_cases = ' '.join('WHEN %s THEN %s' for _ in TRANSACTION_TYPE_DISPLAY)
+    # Дата - как str(datetime) в Python: микросекунды выводятся, только если они не нулевые
+    date_sql = ("to_char(t.date_transaction AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS') || "
+                "CASE WHEN to_char(t.date_transaction, 'US') = '000000' THEN '' "
+                "ELSE to_char(t.date_transaction, '.US') END || '+00:00'")
+    columns = [f'"{name}"' for name in REPORT_HEADER]
+    select_sql = f"""
+        SELECT %s AS {columns[0]}, %s AS {columns[1]}, %s AS {columns[2]}, t.amount AS {columns[3]},
+               CASE t.transaction_type {type_cases} ELSE t.transaction_type END AS {columns[4]},
+               t.category AS {columns[5]}, {date_sql} AS {columns[6]}
+        FROM ({rows_sql}) t
+        ORDER BY t.date_transaction, t.id
+    """
+    params = [user.first_name, user.last_name, user.email,
+              *(value for item in TRANSACTION_TYPE_DISPLAY.items() for value in item),
+              *rows_params]
+    with connection.cursor() as cursor, open(file_path, mode='wb') as file:
+        # COPY не принимает параметры запроса: значения подставляет драйвер (mogrify).
+        # NULL '\N' - чтобы пустые строки (например, пустая фамилия) не заключались в кавычки,
+        # как и в csv.writer
+        query = cursor.mogrify(select_sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER {header}, "
+                           f"NULL '\\N')", _CRLFFile(file))
+
+
+def iter_report_rows(user: User, transactions: QuerySet[Transaction],
+                     chunk_size: int, raw_values: bool = False) -> Iterator[list[Any]]:
+    """
+    Строки отчета в порядке колонок REPORT_HEADER.
+    Транзакции читаются серверным курсором порциями по chunk_size только с нужными
+    колонками, без создания экземпляров модели; данные пользователя читаются один раз.
+    Порядок строк - по дате транзакции, при совпадении даты - по id.
+    При raw_values=True тип транзакции отдается кодом (income/expense), а не названием.
+    """
+    rows = transactions.order_by('date_transaction', 'id').values_list(
+        'amount', 'transaction_type', 'category', 'date_transaction')
+    for amount, transaction_type, category, date_transaction in rows.iterator(
+            chunk_size=chunk_size):
+        if not raw_values:
+            transaction_type = TRANSACTION_TYPE_DISPLAY.get(transaction_type, transaction_type)
+        yield [user.first_name, user.last_name, user.email, amount,
+               transaction_type, category, date_transaction]
+
+
+def stream_csv(rows: Iterable[list[Any]], chunk_size: int,
+               header: bool = True) -> Iterator[str]:
+    """
+    Потоковое формирование CSV: заголовок отдается сразу (если header=True),
+    далее строки порциями по chunk_size
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(REPORT_HEADER)
+        yield buffer.getvalue()
+
+        buffer.seek(0)
+        buffer.truncate()
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows: Iterable[list[Any]], chunk_size: int) -> Iterator[str]:
+    """
+    Потоковое формирование NDJSON: по одному JSON-объекту на строку, порциями по chunk_size
+    """
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(REPORT_FIELDS, map(str, row))), ensure_ascii=False))
+        if len(lines) == chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def summarize_transactions(user_id: Any, start: Optional[datetime] = None,
+                           end: Optional[datetime] = None) -> dict[str, Any]:
+    """
+    Итоги по транзакциям пользователя за период (без start и end - за все время):
+    суммы и кол-во по месяцу (UTC), типу и категории считаются одним запросом по дневным
+    суммам (services.rollups.month_totals, неполные дни на границах - по транзакциям),
+    суммы доходов и расходов - по тем же строкам; баланс - доходы минус расходы.
+    """
+    months = month_totals(user_id, start, end)
+    totals = {Transaction.INCOME: Decimal('0.00'), Transaction.EXPENSE: Decimal('0.00')}
+    for _, transaction_type, _, _, total in months:
+        totals[transaction_type] += total
+    income = totals[Transaction.INCOME]
+    expense = totals[Transaction.EXPENSE]
+    return {
+        'months': [{'month': f'{month:%Y-%m}', 'transaction_type': transaction_type,
+                    'category': category, 'count': count, 'total': total}
+                   for month, transaction_type, category, count, total in months],
+        'income': income,
+        'expense': expense,
+        'balance': income - expense,
+    }
+
+
+def summary_to_json(summary: dict[str, Any]) -> dict[str, Any]:
+    """
+    Итоги для ответа API и JSON файла: суммы - строками, как в остальных ответах API
+    """
+    return {
+        'months': [{**row, 'total': str(row['total'])} for row in summary['months']],
+        'income': str(summary['income']),
+        'expense': str(summary['expense']),
+        'balance': str(summary['balance']),
+    }
+
+
+def summary_rows(summary: dict[str, Any]) -> list[list[str]]:
+    """
+    Строки итогового CSV: заголовок, строки по месяцам, итоги по типам и баланс за период
+    """
+    rows = [list(SUMMARY_HEADER)]
+    rows.extend([row['month'], TRANSACTION_TYPE_DISPLAY.get(row['transaction_type'],
+                                                            row['transaction_type']),
+                 row['category'], str(row['count']), str(row['total'])]
+                for row in summary['months'])
+    rows.append(['', TRANSACTION_TYPE_DISPLAY[Transaction.INCOME], 'Итого', '',
+                 str(summary['income'])])
+    rows.append(['', TRANSACTION_TYPE_DISPLAY[Transaction.EXPENSE], 'Итого', '',
+                 str(summary['expense'])])
+    rows.append(['', 'Баланс', '', '', str(summary['balance'])])
+    return rows
+
+
+def save_summary(file_path: str, report_format: str, summary: dict[str, Any]) -> None:
+    """Сохранение итогового отчета в CSV либо JSON файл"""
     with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Имя', 'Фамилия', 'Email', 'Сумма',
-                         'Тип транзакции', 'Категория', 'Дата'])
-
-        for transaction in transactions:
-            user = transaction.user
-            writer.writerow([
-                user.first_name,
-                user.last_name,
-                user.email,
-                transaction.amount,
-                transaction.get_transaction_type_display_custom(),
-                transaction.category,
-                transaction.date_transaction
-            ])
+        if report_format == 'json':
+            json.dump(summary_to_json(summary), file, ensure_ascii=False)
+        else:
+            csv.writer(file).writerows(summary_rows(summary))
+
+
+def send_summary_email(user: User, summary: dict[str, Any]) -> None:
+    """Отправка итогового CSV отчета на email пользователя"""
+    send_email('Ваш итоговый отчет по транзакциям',
+               'Итоговый отчет по вашим транзакциям прикреплен к этому письму.',
+               settings.DEFAULT_FROM_EMAIL, [user.email],
+               summary_rows(summary))
@@ -0,0 +1,77 @@
+"""
+Модуль кэша файлов отчетов.
+
+Ключ кэша - sha256 от параметров отчета (пользователь, период, формат, режим) и состояния
+транзакций периода: их кол-ва и последней даты изменения. Любое добавление, изменение
+или удаление транзакции периода меняет ключ, поэтому кэш не требует сброса.
+Готовый отчет с тем же ключом возвращается без повторного формирования. Задача резервируется
+записью ReportsResult до запуска: параллельный запрос с тем же ключом ждет на уникальном
+индексе (cache_key среди выполняющихся задач) и присоединяется к уже запущенной задаче.
+Задача, не завершившаяся за REPORT_TASK_STALE_MINUTES (например, потерянная воркером),
+считается завершившейся с ошибкой и не блокирует ключ.
+"""
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+from typing import (Any,
+                    Optional)
+from django.conf import settings
+from django.db import (IntegrityError,
+                       transaction as db_transaction)
+from django.db.models import (Count,
+                              Max,
+                              QuerySet)
+from django.utils import timezone
+from fin_transactions.models import (ReportsResult,
+                                     Transaction)
+
+
+def report_cache_key(transactions: QuerySet[Transaction], **params: Any) -> Optional[str]:
+    """
+    Ключ кэша отчета по транзакциям периода (один запрос с COUNT и MAX) либо None,
+    если транзакций нет
+
+    :param transactions: транзакции отчета
+    :param params: параметры отчета (user_id, start_date, end_date, report_format, mode)
+    """
+    state = transactions.order_by().aggregate(count=Count('id'), modified=Max('date_modified'))
+    if not state['count']:
+        return None
+    payload = json.dumps({**params, **state}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def find_cached_report(cache_key: str) -> Optional[ReportsResult]:
+    """
+    Последний готовый отчет с ключом cache_key, файл которого еще существует
+    """
+    report = ReportsResult.objects.filter(cache_key=cache_key, status='completed') \
+        .exclude(report=None).order_by('-id').first()
+    if report and os.path.exists(os.path.join(settings.MEDIA_ROOT, 'reports', report.report)):
+        return report
+    return None
+
+
+def reserve_report(user_id: int, cache_key: str) -> tuple[ReportsResult, bool]:
+    """
+    Резервирование задачи формирования отчета с ключом cache_key до ее запуска.
+    Если задача с тем же ключом уже выполняется, возвращается ее запись.
+
+    :return: запись ReportsResult и признак того, что задачу нужно запустить
+    """
+    stale_before = timezone.now() - timedelta(minutes=settings.REPORT_TASK_STALE_MINUTES)
+    ReportsResult.objects.filter(cache_key=cache_key, status='in_progress',
+                                 started_at__lt=stale_before) \
+        .update(status='error', error_message='Задача не завершилась за отведенное время')
+    try:
+        with db_transaction.atomic():
+            return ReportsResult.objects.create(user_id=user_id, task_id=str(uuid.uuid4()),
+                                                cache_key=cache_key), True
+    except IntegrityError:
+        report = ReportsResult.objects.filter(cache_key=cache_key, status='in_progress').first()
+        if report is None:
+            # Задача завершилась между попыткой вставки и чтением
+            return reserve_report(user_id, cache_key)
+        return report, False
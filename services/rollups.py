@@ -0,0 +1,198 @@
+"""
+Модуль дневных сумм транзакций (таблица transaction_daily_rollups).
+
+Суммы и кол-во транзакций по (пользователь, день UTC, тип, категория) изменяются
+одним INSERT ... ON CONFLICT DO UPDATE на пакет изменений в той же транзакции БД,
+что и создание, редактирование или удаление транзакций, поэтому всегда согласованы с ними.
+Суммы за период считаются по дневным строкам (не больше 366 на категорию в год);
+неполные дни на границах периода досчитываются по самим транзакциям.
+"""
+from collections import defaultdict
+from datetime import (date,
+                      datetime,
+                      time,
+                      timedelta,
+                      timezone)
+from decimal import Decimal
+from typing import (Any,
+                    Iterable,
+                    Optional)
+from django.db import (connection,
+                       transaction as db_transaction)
+from fin_transactions.models import Transaction
+
+RollupKey = tuple[int, date, str, str]
+
+# Применение изменений пакетом: массивы (пользователь, день, тип, категория, сумма, кол-во)
+UPSERT_SQL = '''
+    INSERT INTO transaction_daily_rollups AS r
+        (user_id, day, transaction_type, category, total, count)
+    SELECT * FROM unnest(%s::bigint[], %s::date[], %s::varchar[], %s::varchar[],
+                         %s::numeric[], %s::integer[])
+    ON CONFLICT (user_id, category, transaction_type, day) DO UPDATE
+    SET total = r.total + EXCLUDED.total, count = r.count + EXCLUDED.count
+'''
+
+# Суммы и кол-во по (месяц UTC, тип, категория) за период: полные дни - по дневным строкам,
+# неполные дни на границах - по транзакциям; условия по границам подставляет month_totals
+MONTHS_SQL = '''
+    SELECT month, transaction_type, category, SUM(count), SUM(total) FROM (
+        SELECT date_trunc('month', day::timestamp) AS month, transaction_type, category,
+               count, total
+        FROM transaction_daily_rollups
+        WHERE user_id = %(user_id)s{days}
+        UNION ALL
+        SELECT date_trunc('month', date_transaction AT TIME ZONE 'UTC'), transaction_type,
+               category, 1, amount
+        FROM transactions
+        WHERE user_id = %(user_id)s AND ({edges})
+    ) AS months
+    GROUP BY month, transaction_type, category
+    HAVING SUM(count) > 0
+    ORDER BY month, transaction_type, category
+'''
+
+# Пересчет дневных строк по транзакциям начиная с дня
+BACKFILL_DELETE_SQL = 'DELETE FROM transaction_daily_rollups WHERE day >= %s'
+BACKFILL_INSERT_SQL = '''
+    INSERT INTO transaction_daily_rollups
+        (user_id, day, transaction_type, category, total, count)
+    SELECT user_id, (date_transaction AT TIME ZONE 'UTC')::date, transaction_type, category,
+           SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE date_transaction >= %s
+    GROUP BY 1, 2, 3, 4
+'''
+
+
+def rollup_key(transaction: Transaction) -> RollupKey:
+    """
+    Ключ дневной строки транзакции: (id пользователя, день UTC, тип, категория)
+    """
+    return (transaction.user_id, transaction.date_transaction.astimezone(timezone.utc).date(),
+            transaction.transaction_type, transaction.category)
+
+
+def _upsert(deltas: dict[RollupKey, tuple[Decimal, int]]) -> None:
+    """
+    Применение изменений дневных строк одним запросом.
+    Строки изменяются в постоянном порядке - параллельные записи не блокируют друг друга
+    взаимно.
+    """
+    rows = sorted((key, delta) for key, delta in deltas.items() if delta[0] or delta[1])
+    if not rows:
+        return
+    columns: list[list[Any]] = [[], [], [], [], [], []]
+    for (user_id, day, transaction_type, category), (total, count) in rows:
+        for column, value in zip(columns, (user_id, day, transaction_type, category,
+                                           total, count)):
+            column.append(value)
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL, columns)
+
+
+def _collect(changes: Iterable[tuple[Transaction, int]]
+             ) -> dict[RollupKey, tuple[Decimal, int]]:
+    """
+    Изменения дневных строк по парам (транзакция, знак)
+    """
+    deltas: dict[RollupKey, tuple[Decimal, int]] = defaultdict(lambda: (Decimal('0'), 0))
+    for transaction, sign in changes:
+        key = rollup_key(transaction)
+        total, count = deltas[key]
+        deltas[key] = (total + sign * Decimal(transaction.amount), count + sign)
+    return deltas
+
+
+def add_to_rollups(transactions: Iterable[Transaction], sign: int = 1) -> None:
+    """
+    Добавление транзакций в дневные суммы (sign=-1 - вычитание удаленных транзакций).
+    Вызывается в транзакции БД вместе с записью транзакций.
+
+    :param transactions: созданные или удаленные транзакции
+    :param sign: 1 - добавление, -1 - вычитание
+    """
+    _upsert(_collect((transaction, sign) for transaction in transactions))
+
+
+def update_rollups(old: Transaction, new: Transaction) -> None:
+    """
+    Перенос транзакции в дневных суммах при редактировании: прежняя версия вычитается,
+    новая - прибавляется (при том же дне и категории применяется только разница сумм)
+
+    :param old: транзакция до изменения
+    :param new: транзакция после изменения
+    """
+    _upsert(_collect(((old, -1), (new, 1))))
+
+
+def _first_full_day(start: datetime) -> datetime:
+    """
+    Начало первого полного дня (UTC) периода, начинающегося в start
+    """
+    start = start.astimezone(timezone.utc)
+    first = datetime.combine(start.date(), time.min, tzinfo=timezone.utc)
+    if first < start:
+        first += timedelta(days=1)
+    return first
+
+
+def _after_last_full_day(end: datetime) -> datetime:
+    """
+    Начало дня (UTC), следующего за последним полным днем периода, заканчивающегося в end
+    """
+    # Период включает end: день полный, если end не раньше его последней микросекунды
+    after_end = (end + timedelta(microseconds=1)).astimezone(timezone.utc)
+    return datetime.combine(after_end.date(), time.min, tzinfo=timezone.utc)
+
+
+def month_totals(user_id: Any, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None) -> list[tuple[datetime, str, str, int, Decimal]]:
+    """
+    Суммы и кол-во транзакций пользователя по (месяц UTC, тип, категория) одним запросом
+    по дневным суммам, в порядке месяца, типа и категории. Без start либо end период
+    не ограничен с этой стороны.
+
+    :param user_id: id пользователя
+    :param start: начало периода
+    :param end: конец периода (включительно)
+    :return: строки (начало месяца, тип, категория, кол-во, сумма)
+    """
+    params: dict[str, Any] = {'user_id': user_id, 'start': start, 'end': end}
+    days, edges = '', []
+    if start:
+        params['first'] = _first_full_day(start)
+        days += ' AND day >= %(first_day)s'
+        edges.append('date_transaction >= %(start)s AND date_transaction < %(first)s'
+                     + (' AND date_transaction <= %(end)s' if end else ''))
+    if end:
+        params['last'] = _after_last_full_day(end)
+        if start:
+            params['last'] = max(params['first'], params['last'])
+        days += ' AND day < %(last_day)s'
+        edges.append('date_transaction >= %(last)s AND date_transaction <= %(end)s')
+    params.update({f'{name}_day': params[name].date() for name in ('first', 'last')
+                   if name in params})
+    with connection.cursor() as cursor:
+        cursor.execute(MONTHS_SQL.format(days=days, edges=' OR '.join(edges) or 'FALSE'),
+                       params)
+        return cursor.fetchall()
+
+
+def backfill_rollups(since: Optional[date] = None) -> int:
+    """
+    Пересчет дневных сумм по транзакциям начиная с дня since (по умолч. - за все время).
+    Таблица транзакций блокируется от записи до конца пересчета (SHARE), чтобы транзакции,
+    записанные во время пересчета, не были учтены дважды либо потеряны.
+
+    :param since: первый пересчитываемый день
+    :return: кол-во дневных строк
+    """
+    since = since or date.min
+    start = datetime.combine(since, time.min, tzinfo=timezone.utc)
+    with db_transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE transactions IN SHARE MODE')
+        cursor.execute(BACKFILL_DELETE_SQL, [since])
+        cursor.execute(BACKFILL_INSERT_SQL, [start])
+        rows: int = cursor.rowcount
+    return rows
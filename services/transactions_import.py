@@ -0,0 +1,80 @@
+"""
+Модуль для импорта транзакций из CSV файла.
+
+Файл читается построчно и разбивается на порции по chunk_size строк,
+поэтому память не зависит от размера файла. Каждая строка проверяется теми же правилами,
+что и при создании транзакции через API.
+"""
+import csv
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import (Any,
+                    Iterator,
+                    TextIO)
+from rest_framework.exceptions import ValidationError
+from fin_transactions.models import Transaction
+from fin_transactions.serializers import TransactionsSerializer
+from fin_transactions.validators import validate_amount
+
+IMPORT_REQUIRED_COLUMNS = ('amount', 'transaction_type', 'category')
+
+# Максимальная сумма, помещающаяся в Transaction.amount (max_digits=10, decimal_places=2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+CATEGORY_MAX_LENGTH = 100
+
+
+def read_rows(file: TextIO) -> Iterator[dict[str, str]]:
+    """
+    Построчное чтение CSV файла с заголовком.
+
+    :param file: открытый текстовый файл
+    :raises ValueError: в файле нет заголовка либо обязательных колонок
+    """
+    reader = csv.DictReader(file)
+    columns = reader.fieldnames or []
+    missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"В файле нет обязательных колонок: {', '.join(missing)}.")
+    return reader
+
+
+def iter_chunks(rows: Iterator[dict[str, str]], chunk_size: int
+                ) -> Iterator[list[dict[str, str]]]:
+    """
+    Разбиение строк файла на порции по chunk_size строк
+    """
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def validate_row(row: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """
+    Проверка строки файла. Возвращает поля транзакции (без пользователя).
+
+    :param row: строка файла
+    :param now: дата транзакции, если в строке она не указана
+    :raises ValidationError: строка не прошла проверку
+    """
+    amount = validate_amount(row)
+    if amount > MAX_AMOUNT:
+        raise ValidationError({"amount": f"Сумма транзакции не должна превышать {MAX_AMOUNT}."})
+
+    transaction_type = row.get('transaction_type')
+    if transaction_type not in dict(Transaction.TRANSACTION_TYPE_CHOICES):
+        raise ValidationError({"transaction_type": "Неверный тип транзакции."})
+
+    category = (row.get('category') or '').strip()
+    if not category or len(category) > CATEGORY_MAX_LENGTH:
+        raise ValidationError({"category": (f"Категория должна быть непустой строкой не длиннее "
+                                            f"{CATEGORY_MAX_LENGTH} символов.")})
+
+    date_transaction = row.get('date_transaction')
+    return {
+        'amount': amount,
+        'transaction_type': transaction_type,
+        'category': category,
+        'date_transaction': (TransactionsSerializer.validate_date_transaction(date_transaction)
+                             if date_transaction else now),
+    }
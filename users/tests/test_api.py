@@ -68,6 +68,26 @@ class TestUserAPI:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['data']['first_name'] == "Johnny"
 
+    def test_get_user_not_modified(self, api_client: APIClient,
+                                   created_user: dict[str, User]) -> None:
+        """
+        Тестирование ответа 304 на If-None-Match и If-Match при редактировании пользователя
+        """
+        url = reverse('user-detail-update-delete', args=[created_user['user_1'].id])
+        api_client.force_authenticate(user=created_user['user_1'])
+
+        etag = api_client.get(url)['ETag']
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == \
+            status.HTTP_304_NOT_MODIFIED
+
+        response = api_client.put(url, {"first_name": "Johnny"}, format='json',
+                                  HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.put(url, {"first_name": "John"}, format='json',
+                                  HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
     def test_delete_user(self, api_client: APIClient, created_user: dict[str, User]) -> None:
         """
         Тестирование удаления пользователя
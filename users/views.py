@@ -14,13 +14,15 @@ from rest_framework.permissions import (AllowAny,
 from rest_framework.serializers import Serializer
 from rest_framework.exceptions import ValidationError
 from django.db.models import QuerySet
+from services.conditional import (ConditionalDetailMixin,
+                                  ConditionalListMixin)
 from services.decorators import add_bearer_security
 from .serializers import (UserSerializer,
                           UserDetailSerializer)
 from .models import User
 
 
-class UserListView(generics.ListCreateAPIView):  # type: ignore
+class UserListView(ConditionalListMixin, generics.ListCreateAPIView):  # type: ignore
     """
     Получение списка пользователей и создание пользователя
     """
@@ -52,7 +54,9 @@ class UserListView(generics.ListCreateAPIView):  # type: ignore
         return super().post(request, *args, **kwargs)
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):  # type: ignore
+# pylint: disable-next=too-many-ancestors
+class UserDetailView(ConditionalDetailMixin,
+                     generics.RetrieveUpdateDestroyAPIView):  # type: ignore
     """
     Получение данных по опр. пользователю, редактирование пользователя и его удаления
     """